@@ -1,13 +1,13 @@
-from fastapi import FastAPI
-from starlette.staticfiles import StaticFiles
-from starlette.responses import FileResponse
+from fastapi import FastAPI, Request
+from common.static_assets import PrecompressedStaticFiles
 from pathlib import Path
 
 app = FastAPI()
 static_dir = Path(__file__).parent / "static"
 
-app.mount("/static", StaticFiles(directory=static_dir), name="app1-static")
+static_files = PrecompressedStaticFiles(static_dir)
+app.mount("/static", static_files, name="app1-static")
 
 @app.get("/")
-async def index():
-    return FileResponse(static_dir / "index.html")
+async def index(request: Request):
+    return static_files.page(request)
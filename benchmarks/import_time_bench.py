@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+서버 시작(import) 시간 벤치마크
+새 프로세스에서 `python -X importtime`으로 모듈을 import해 전체 시간과 모듈별 비용(자기 시간, 하위 포함 누적 시간)을
+측정한다. 워커 콜드 스타트는 루트 앱(main) import 시간이 대부분이므로, 어떤 모듈이 시작 시간을 늘렸는지 바로 볼 수 있다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.import_time_bench
+    python -m benchmarks.import_time_bench --module elementary_school.elementary_school --top 30
+    python -m benchmarks.import_time_bench --repeat 5 --budget 1.0
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `import time:   self [us] | cumulative | imported package` 형식의 한 줄
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """-X importtime 출력 파싱 (import 순서대로, depth는 0이 측정 대상 모듈)"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            "module": module,
+            "depth": (len(indent) - 1) // 2,
+            "self_s": int(self_us) / 1e6,
+            "cumulative_s": int(cumulative_us) / 1e6,
+        })
+    return entries
+
+
+def measure_import(module: str) -> Dict:
+    """새 프로세스에서 module을 import하고 전체 시간, 직접 import한 모듈별 비용, 자기 시간이 큰 모듈 반환"""
+    env = dict(os.environ)
+    # 하위 모듈이 import 시 API 키를 확인하는 경우를 위한 더미 키 (측정 중 API 호출 없음)
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    entries = parse_importtime(result.stderr)
+    root = next(entry for entry in reversed(entries) if entry["module"] == module and entry["depth"] == 0)
+    # 측정 대상보다 먼저 끝난 depth 0 항목은 인터프리터 시작 시 불러온 모듈 (site, encodings 등)
+    index = entries.index(root)
+    start = max((i + 1 for i in range(index) if entries[i]["depth"] == 0), default=0)
+    children = [entry for entry in entries[start:index] if entry["depth"] == 1]
+    return {
+        "module": module,
+        "total_s": root["cumulative_s"],
+        "modules": {entry["module"] for entry in entries},
+        "direct": sorted(children, key=lambda entry: entry["cumulative_s"], reverse=True),
+        "slowest": sorted(entries[start:index], key=lambda entry: entry["self_s"], reverse=True),
+    }
+
+
+def run_benchmark(module: str, repeat: int = 3) -> Dict:
+    """repeat번 측정해 전체 시간 중앙값/최소값과 가장 빠른 측정의 모듈별 비용 반환"""
+    runs = [measure_import(module) for _ in range(repeat)]
+    best = min(runs, key=lambda run: run["total_s"])
+    totals = [run["total_s"] for run in runs]
+    return {
+        "module": module,
+        "median_s": statistics.median(totals),
+        "min_s": min(totals),
+        "direct": best["direct"],
+        "slowest": best["slowest"],
+        "modules": best["modules"],
+    }
+
+
+def format_report(result: Dict, top: int = 20) -> List[str]:
+    lines = [f"📦 {result['module']} import: 중앙값 {result['median_s'] * 1000:.0f}ms, 최소 {result['min_s'] * 1000:.0f}ms"]
+    lines.append("  직접 import한 모듈 (하위 포함 누적)")
+    for entry in result["direct"][:top]:
+        lines.append(f"    {entry['cumulative_s'] * 1000:>8.1f}ms  {entry['module']}")
+    lines.append("  자기 시간이 큰 모듈")
+    for entry in result["slowest"][:top]:
+        lines.append(f"    {entry['self_s'] * 1000:>8.1f}ms  {entry['module']}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="서버 시작(import) 시간 벤치마크")
+    parser.add_argument("--module", default="main", help="측정할 모듈 (기본: 루트 앱 main)")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--top", type=int, default=20, help="표시할 모듈 수")
+    parser.add_argument("--budget", type=float, help="최소 import 시간 상한 (초, 넘으면 종료 코드 1)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.module, repeat=args.repeat)
+    if args.json:
+        print(json.dumps({key: value for key, value in result.items() if key != "modules"}, ensure_ascii=False, indent=2))
+    else:
+        print('\n'.join(format_report(result, args.top)))
+
+    if args.budget is not None and result["min_s"] > args.budget:
+        print(f"❌ import 시간 {result['min_s'] * 1000:.0f}ms 가 상한 {args.budget * 1000:.0f}ms 를 넘었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
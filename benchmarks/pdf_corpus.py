@@ -0,0 +1,100 @@
+"""
+PDF 렌더링 벤치마크용 입력 코퍼스
+실제 LLM 출력 형식(초등/중등 드림로직, 고등 최종 요약)을 짧은 / 긴 / 이모지 많은 경우로 나눠 둔다.
+"""
+
+from typing import Dict, List
+
+# 고등학교 _clean_text_for_pdf 의 이모지 변환 대상과 동일한 문자들
+EMOJI_SET = ['🎯', '📚', '🎨', '🤝', '🔬', '✨', '🏠', '💼', '📝', '🌟',
+             '📅', '🎓', '💡', '🚀', '❤️', '👍', '🔥', '💪']
+
+
+def _elementary_dream_logic(name: str, career: str, goals: int, activities: int, items: int,
+                            emoji: str = "") -> str:
+    """초등학교 드림로직 형식 텍스트 생성"""
+    lines = [f"[{name}의 드림 로직]", f"최종꿈: {career}", ""]
+    for g in range(1, goals + 1):
+        lines.append(f"{emoji}[중간목표{g}] 핵심 역량 {g} 키우기 (꿈과 연결되는 이유 설명)")
+        for a in range(1, activities + 1):
+            kind = "학교생활" if a % 2 else "개인 성장"
+            lines.append(f"• 실천활동{a}: {kind}")
+            for i in range(1, items + 1):
+                lines.append(f"{i}. {emoji}{career}와 관련된 {g}-{a}-{i}번 활동을 친구들과 함께 해 보기")
+        lines.append("")
+    lines.append(f"응원 메모: {name}님의 열정이라면 분명 멋진 {career}가 될 수 있어요! {emoji}💪")
+    return '\n'.join(lines)
+
+
+def _middle_dream_logic(name: str, career: str, goals: int, emoji: str = "") -> str:
+    """중학교 드림로직 형식 텍스트 생성"""
+    lines = [f"[{name}의 드림 로직]", f"최종꿈: {career}", ""]
+    for g in range(1, goals + 1):
+        lines += [
+            f"[중간목표 {g}] {emoji}핵심 역량 {g} (왜 필요한가)",
+            f"설명: {career}가 되기 위해 {g}번째로 필요한 역량입니다.",
+            "",
+            f"실천활동(학교): {emoji}과학 시간 탐구 보고서 작성 / 동아리 발표 / 모둠 과제 역할 맡기",
+            "",
+            f"실천활동(일상): {emoji}관련 뉴스 요약하기 / 가족과 토론하기",
+            "",
+            f"추천 활동: {emoji}진로 체험 캠프, 또래 멘토링",
+            "",
+        ]
+    lines += ["💬 응원 메모", f'"{name}의 꾸준함은 진짜 강점이에요. {emoji}작은 실천이 {career}의 꿈으로 이어질 거예요!"']
+    return '\n'.join(lines)
+
+
+def _high_school_summary(career: str, goals: int, activities: int, emoji_heavy: bool = False) -> str:
+    """고등학교 7단계 최종 요약 형식 텍스트 생성"""
+    goal_emoji = ['📚', '🎨', '🤝', '💼', '🚀']
+    extra = ' '.join(EMOJI_SET) if emoji_heavy else ''
+    lines = [f"🎯 [최종 목표(꿈)] 지속가능한 미래를 설계하는 {career} {extra}", ""]
+    for g in range(1, goals + 1):
+        lines.append(f"{goal_emoji[(g - 1) % len(goal_emoji)]} [중간목표{g}] {career} 핵심 역량 {g} {extra}")
+        for a in range(1, activities + 1):
+            lines += [
+                f"🔬 실천활동{a}:",
+                f"    탐구보고서: \"{career} 분야의 {g}-{a} 사례 분석\" 등 {extra}",
+                f"    교과 활동: 통합과학 - '에너지 전환' 단원 [심화] {extra}",
+                f"    비교과: 교내 탐구 동아리 발표 - [문제 해결력 성장과 관련] {extra}",
+            ]
+        lines.append("")
+    lines.append("이 계획은 고등학생이 학교 안에서 실천할 수 있도록 다각도로 구성했습니다.")
+    return '\n'.join(lines)
+
+
+def build_corpus() -> List[Dict]:
+    """벤치마크 케이스 목록 (short / long / emoji)"""
+    return [
+        {
+            "case": "short",
+            "student_name": "김민수",
+            "career": "로봇 엔지니어",
+            "dream_logic": _elementary_dream_logic("김민수", "로봇 엔지니어", goals=1, activities=2, items=1),
+            "middle_dream_logic": _middle_dream_logic("김민수", "로봇 엔지니어", goals=1),
+            "final_summary": _high_school_summary("로봇 엔지니어", goals=1, activities=1),
+        },
+        {
+            "case": "long",
+            "student_name": "이서연",
+            "career": "친환경 건축가",
+            "dream_logic": _elementary_dream_logic("이서연", "친환경 건축가", goals=5, activities=4, items=5),
+            "middle_dream_logic": _middle_dream_logic("이서연", "친환경 건축가", goals=6),
+            "final_summary": _high_school_summary("친환경 건축가", goals=5, activities=3),
+        },
+        {
+            "case": "emoji",
+            "student_name": "박지우",
+            "career": "응급구조사",
+            "dream_logic": _elementary_dream_logic("박지우", "응급구조사", goals=3, activities=2, items=3,
+                                                   emoji=''.join(EMOJI_SET[:6])),
+            "middle_dream_logic": _middle_dream_logic("박지우", "응급구조사", goals=3, emoji=''.join(EMOJI_SET)),
+            "final_summary": _high_school_summary("응급구조사", goals=3, activities=3, emoji_heavy=True),
+        },
+    ]
+
+
+def corpus_by_case() -> Dict[str, Dict]:
+    """케이스 이름 → 입력 데이터"""
+    return {entry["case"]: entry for entry in build_corpus()}
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+PDF 생성기 렌더링 벤치마크
+각 PDF 생성기별로 콜드 스타트(새 프로세스에서 import + 초기화 + 첫 렌더링), 웜 렌더링 시간,
+최대 메모리(tracemalloc 기준), 출력 크기를 측정하고 저장된 기준 결과와의 차이를 보여준다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.pdf_render_bench --save benchmarks/baseline.json
+    python -m benchmarks.pdf_render_bench --compare benchmarks/baseline.json
+    python -m benchmarks.pdf_render_bench --generators elementary,high_school --cases long --repeat 10
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# 고등학교 PDF 생성기는 첫 번역 때 OpenAI 클라이언트를 만들므로 더미 키 설정 (벤치마크 중 API 호출 없음)
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from benchmarks.pdf_corpus import build_corpus, corpus_by_case
+
+
+def _read_and_remove(path: Optional[str]) -> bytes:
+    """파일 경로를 반환하는 생성기의 결과를 bytes로 읽고 임시 파일 삭제"""
+    if not path:
+        raise RuntimeError("PDF 파일이 생성되지 않았습니다.")
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _load_elementary():
+    from elementary_school.pdf_generator import ElementaryCareerPDFGenerator
+    return ElementaryCareerPDFGenerator()
+
+
+def _render_elementary(generator, entry: Dict) -> bytes:
+    return generator.generate_career_report(
+        student_name=entry["student_name"],
+        responses={},
+        final_recommendation=entry["career"],
+        dream_logic_result=entry["dream_logic"]
+    )
+
+
+def _load_middle_elementary_style():
+    from middle_school.pdf_generator_elementary_style import MiddleSchoolCareerPDFGenerator
+    return MiddleSchoolCareerPDFGenerator()
+
+
+def _render_middle_elementary_style(generator, entry: Dict) -> bytes:
+    return generator.generate_career_report(
+        student_name=entry["student_name"],
+        responses={},
+        final_recommendation=entry["career"],
+        dream_logic_result=entry["middle_dream_logic"]
+    )
+
+
+def _middle_session_data(entry: Dict) -> Dict:
+    return {
+        "student_name": entry["student_name"],
+        "student_info": {"name": entry["student_name"], "grade": 2, "school": "중학교"},
+        "responses_summary": {},
+        "final_career_goal": entry["career"],
+        "dream_logic_result": entry["middle_dream_logic"],
+        "encouragement_message": "",
+    }
+
+
+def _load_middle():
+    from middle_school.pdf_generator import MiddleSchoolCareerPDFGenerator
+    return MiddleSchoolCareerPDFGenerator()
+
+
+def _render_middle(generator, entry: Dict) -> bytes:
+    return _read_and_remove(generator.generate_career_report(_middle_session_data(entry)))
+
+
+def _load_middle_simple():
+    # pdf_generator_simple 은 "from models import ..." 형태라 middle_school 폴더를 경로에 추가해야 함
+    middle_dir = os.path.join(ROOT_DIR, "middle_school")
+    if middle_dir not in sys.path:
+        sys.path.append(middle_dir)
+    module = importlib.import_module("pdf_generator_simple")
+    return module.MiddleSchoolCareerPDFGenerator()
+
+
+def _high_school_career_data(entry: Dict) -> Dict:
+    return {
+        "career": entry["career"],
+        "reasons": ["사람들에게 도움이 되는 일", "새로운 것을 만드는 일"],
+        "issues_selected": ["기후 위기"],
+        "topic": f"{entry['career']}와 지속가능성",
+        "goal": f"지속가능한 미래를 설계하는 {entry['career']}",
+        "midgoals": ["핵심 역량 1", "핵심 역량 2", "핵심 역량 3"],
+        "final_summary": entry["final_summary"],
+    }
+
+
+def _load_high_school():
+    from high_school.pdf_generator import HighSchoolCareerPDFGenerator
+    return HighSchoolCareerPDFGenerator()
+
+
+def _render_high_school(generator, entry: Dict) -> bytes:
+    return _read_and_remove(generator.generate_career_report(_high_school_career_data(entry)))
+
+
+def _load_pdf_download():
+    from elementary_school.pdf_download import KoreanPDFGenerator
+    return KoreanPDFGenerator()
+
+
+def _render_pdf_download(generator, entry: Dict) -> bytes:
+    return _read_and_remove(generator.create_career_report(_high_school_career_data(entry)))
+
+
+# 생성기 이름 → (생성기 로더, 렌더링 함수)
+GENERATORS: Dict[str, Tuple[Callable, Callable]] = {
+    "elementary": (_load_elementary, _render_elementary),
+    "middle_elementary_style": (_load_middle_elementary_style, _render_middle_elementary_style),
+    "middle": (_load_middle, _render_middle),
+    "middle_simple": (_load_middle_simple, _render_middle),
+    "high_school": (_load_high_school, _render_high_school),
+    "pdf_download": (_load_pdf_download, _render_pdf_download),
+}
+
+# 비교 시 표시할 지표 (지표 키, 표시 이름, 단위 배율, 단위)
+METRICS = [
+    ("cold_start_s", "콜드 스타트", 1000, "ms"),
+    ("warm_median_s", "웜 렌더링(중앙값)", 1000, "ms"),
+    ("warm_min_s", "웜 렌더링(최소)", 1000, "ms"),
+    ("peak_memory_bytes", "최대 메모리", 1 / 1024, "KiB"),
+    ("output_bytes", "출력 크기", 1 / 1024, "KiB"),
+]
+
+
+@contextlib.contextmanager
+def _quiet():
+    """생성기의 진행 로그(print) 숨기기"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def measure_cold_start(name: str, case: str) -> float:
+    """새 프로세스에서 import + 초기화 + 첫 렌더링까지 걸린 시간 (초)"""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.pdf_render_bench", "--child-cold", name, case],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])["cold_start_s"]
+
+
+def _child_cold_start(name: str, case: str) -> None:
+    """콜드 스타트 측정용 자식 프로세스 진입점"""
+    entry = corpus_by_case()[case]
+    loader, render = GENERATORS[name]
+    started = time.perf_counter()
+    with _quiet():
+        generator = loader()
+        render(generator, entry)
+    print(json.dumps({"cold_start_s": time.perf_counter() - started}))
+
+
+def measure_warm(generator, render: Callable, entry: Dict, repeat: int) -> Dict:
+    """웜 렌더링 시간, 최대 메모리, 출력 크기 측정"""
+    with _quiet():
+        output = render(generator, entry)  # 워밍업
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render(generator, entry)
+            timings.append(time.perf_counter() - started)
+
+        # 메모리 측정은 시간 측정과 분리 (tracemalloc 자체 오버헤드 때문)
+        tracemalloc.start()
+        try:
+            render(generator, entry)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "warm_median_s": statistics.median(timings),
+        "warm_min_s": min(timings),
+        "peak_memory_bytes": peak,
+        "output_bytes": len(output),
+    }
+
+
+def run_benchmarks(generators: List[str], cases: List[str], repeat: int = 5, cold: bool = True) -> Dict:
+    """선택한 생성기 × 케이스 조합 벤치마크 실행"""
+    corpus = corpus_by_case()
+    results: Dict[str, Dict] = {}
+
+    for name in generators:
+        loader, render = GENERATORS[name]
+        try:
+            with _quiet():
+                generator = loader()
+        except Exception as e:
+            print(f"⚠️ {name}: 생성기 로드 실패 - {e}")
+            for case in cases:
+                results[f"{name}/{case}"] = {"error": str(e)}
+            continue
+
+        for case in cases:
+            key = f"{name}/{case}"
+            try:
+                result = measure_warm(generator, render, corpus[case], repeat)
+                if cold:
+                    result["cold_start_s"] = measure_cold_start(name, case)
+                results[key] = result
+                print(f"✅ {key}: {_format_result(result)}")
+            except Exception as e:
+                results[key] = {"error": str(e)}
+                print(f"❌ {key}: {e}")
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _format_result(result: Dict) -> str:
+    parts = []
+    for key, label, scale, unit in METRICS:
+        if key in result:
+            parts.append(f"{label} {result[key] * scale:.1f}{unit}")
+    return ', '.join(parts)
+
+
+def compare_results(baseline: Dict, current: Dict) -> List[str]:
+    """기준 결과 대비 변화량 표 (지표별 기준 → 현재, 변화율)"""
+    lines = []
+    base_results = baseline.get("results", {})
+    for key, result in current.get("results", {}).items():
+        base = base_results.get(key)
+        if not base or "error" in base or "error" in result:
+            continue
+        lines.append(key)
+        for metric, label, scale, unit in METRICS:
+            if metric not in result or metric not in base:
+                continue
+            before, after = base[metric] * scale, result[metric] * scale
+            delta = ((after - before) / before * 100) if before else 0.0
+            lines.append(f"  {label:<16} {before:>10.1f}{unit} → {after:>10.1f}{unit}  ({delta:+.1f}%)")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="PDF 생성기 렌더링 벤치마크")
+    parser.add_argument("--generators", default=','.join(GENERATORS),
+                        help=f"측정할 생성기 (쉼표 구분): {', '.join(GENERATORS)}")
+    parser.add_argument("--cases", default=','.join(entry["case"] for entry in build_corpus()),
+                        help="측정할 코퍼스 케이스 (쉼표 구분): short, long, emoji")
+    parser.add_argument("--repeat", type=int, default=5, help="웜 렌더링 반복 횟수")
+    parser.add_argument("--no-cold", action="store_true", help="콜드 스타트 측정 생략")
+    parser.add_argument("--save", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 파일 경로")
+    parser.add_argument("--child-cold", nargs=2, metavar=("GENERATOR", "CASE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child_cold:
+        _child_cold_start(*args.child_cold)
+        return
+
+    generators = [name.strip() for name in args.generators.split(',') if name.strip()]
+    unknown = [name for name in generators if name not in GENERATORS]
+    if unknown:
+        parser.error(f"알 수 없는 생성기: {', '.join(unknown)}")
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+
+    current = run_benchmarks(generators, cases, repeat=args.repeat, cold=not args.no_cold)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n📊 기준 결과 대비 변화 ({args.compare})")
+        print('\n'.join(compare_results(baseline, current)))
+
+
+if __name__ == "__main__":
+    main()
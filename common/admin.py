@@ -0,0 +1,27 @@
+"""
+운영자 전용 기능 인증 (프로파일링, 진단 엔드포인트 공용)
+ADMIN_TOKEN 환경변수가 설정되어 있고 요청의 X-Admin-Token 헤더가 같을 때만 허용한다.
+설정이 없으면 운영자 기능은 모두 꺼진다.
+"""
+
+import hmac
+import os
+
+from fastapi import HTTPException, Request
+
+# 운영자 토큰 (비어 있으면 운영자 기능 비활성화)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+ADMIN_HEADER = "x-admin-token"
+
+
+def is_admin(request: Request) -> bool:
+    """운영자 토큰이 맞는 요청인지 확인"""
+    if not ADMIN_TOKEN:
+        return False
+    return hmac.compare_digest(request.headers.get(ADMIN_HEADER, ""), ADMIN_TOKEN)
+
+
+async def require_admin(request: Request) -> None:
+    """운영자 전용 엔드포인트 의존성"""
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="운영자 인증이 필요합니다.")
@@ -0,0 +1,296 @@
+"""
+드림로직 텍스트 파서 (초등/중등/고등 공용)
+LLM이 생성한 드림로직 텍스트를 한 번만 파싱해 트리 구조(최종꿈 → 중간목표 → 실천활동 → 항목)로 만든다.
+PDF 생성기와 JSON API는 이 트리를 그대로 사용하므로 매 렌더링마다 다시 파싱하지 않는다.
+"""
+
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+# 중간목표 라인: "[중간목표 1] ...", "📚 [중간목표1] ...", "중간목표2: ..."
+_GOAL_PATTERN = re.compile(r'^(?:\[\s*중간목표\s*(\d*)\s*\]|중간목표\s*(\d+))\s*[:：]?\s*')
+# 최종꿈 라인: "최종꿈: ...", "꿈: ...", "🎯 [최종 목표(꿈)] ..."
+_FINAL_DREAM_PATTERN = re.compile(r'^(?:\[최종\s*목표\(꿈\)\]|최종꿈|꿈\s*[:：])\s*[:：]?\s*')
+# 실천활동 라인: "• 실천활동1: ...", "실천활동(학교): ...", "🔬 실천활동2:", "추천 활동: ..."
+_ACTIVITY_PATTERN = re.compile(r'^(실천활동\s*(?:\d+|\([^)]*\))?|추천\s*활동)\s*[:：]?\s*')
+# 응원 메모 머리말: "💬 응원 메모", "응원 메모: ...", "응원메시지: ..."
+_ENCOURAGEMENT_PATTERN = re.compile(r'^응원\s*(?:메모|메시지)\s*[:：]?\s*')
+# 줄 앞의 이모지·글머리표 (•, -, *, ・ 등)
+_LEADING_MARKS = re.compile(r'^[^\w\[\(]+')
+
+
+class DreamLogicActivity(BaseModel):
+    """실천활동 (머리 라인 + 하위 항목)"""
+    line: str
+    label: str
+    kind: str = "practice"  # practice | school | daily | recommended
+    content: str = ""
+    items: List[str] = []
+
+
+class DreamLogicGoal(BaseModel):
+    """중간목표 (설명 라인 + 실천활동 목록)"""
+    line: str
+    number: Optional[int] = None
+    title: str = ""
+    notes: List[str] = []
+    activities: List[DreamLogicActivity] = []
+
+
+class DreamLogicTree(BaseModel):
+    """파싱된 드림로직 전체 구조"""
+    title: Optional[str] = None
+    final_dream_line: Optional[str] = None
+    final_dream: str = ""
+    preamble: List[str] = []
+    goals: List[DreamLogicGoal] = []
+    encouragement_lines: List[str] = []
+    encouragement: str = ""
+    trailing: List[str] = []  # 응원 메모 뒤에 이어지는 라인 ([...] 머리글로 시작, 문서 순서 유지)
+    epilogue: List[str] = []
+
+    def iter_lines(self, include_epilogue: bool = True) -> Iterator[Tuple[str, str]]:
+        """(종류, 원본 라인)을 문서 순서대로 반환
+
+        종류: title, final_dream, text, goal, note, activity, item, encouragement, section, epilogue
+        (section은 응원 메모 뒤의 [...] 머리글, 그 뒤 라인은 text)
+        """
+        if self.title:
+            yield "title", self.title
+        if self.final_dream_line:
+            yield "final_dream", self.final_dream_line
+        for line in self.preamble:
+            yield "text", line
+        for goal in self.goals:
+            yield "goal", goal.line
+            for note in goal.notes:
+                yield "note", note
+            for activity in goal.activities:
+                yield "activity", activity.line
+                for item in activity.items:
+                    yield "item", item
+        for line in self.encouragement_lines:
+            yield "encouragement", line
+        for line in self.trailing:
+            yield ("section" if _is_bracket_header(line) else "text"), line
+        if include_epilogue:
+            for line in self.epilogue:
+                yield "epilogue", line
+
+
+def _strip_marks(line: str) -> str:
+    """줄 앞의 이모지·글머리표 제거"""
+    return _LEADING_MARKS.sub('', line)
+
+
+def _is_bracket_header(line: str) -> bool:
+    """[...]로 된 한 줄 머리글 여부"""
+    return line.startswith('[') and line.endswith(']')
+
+
+def _is_encouragement_header(line: str) -> bool:
+    """응원 메모 시작 라인 여부"""
+    return ('💬' in line and '응원' in line) or ('응원' in line and ('메모' in line or '메시지' in line))
+
+
+# 고등학교 최종 요약 끝의 설명 문단 표시 (고등학교만 사용, 초등/중등 실천활동에도 나올 수 있는 표현이라 기본값 아님)
+HIGH_SCHOOL_EPILOGUE_MARKERS = ("이 계획은 고등학생", "다각도로", "창의적이고 실천적인")
+
+
+def _is_epilogue(line: str, markers: Sequence[str]) -> bool:
+    """설명 문단 시작 라인 여부 (PDF에서는 이 라인부터 생략)"""
+    return any(marker in line for marker in markers)
+
+
+def _activity_kind(label: str) -> str:
+    """실천활동 라벨로 종류 구분"""
+    if '학교' in label:
+        return "school"
+    if '일상' in label:
+        return "daily"
+    if '추천' in label:
+        return "recommended"
+    return "practice"
+
+
+def parse_dream_logic(text: Optional[str], epilogue_markers: Sequence[str] = ()) -> DreamLogicTree:
+    """드림로직 텍스트를 트리 구조로 파싱
+
+    각 노드에는 원본 라인을 그대로 보관해 렌더러가 기존 표시 형식을 유지할 수 있다.
+    epilogue_markers가 들어간 라인부터는 설명 문단(epilogue)으로 분리한다 (고등학교만 전달).
+    """
+    tree = DreamLogicTree()
+    if not text:
+        return tree
+
+    goal: Optional[DreamLogicGoal] = None
+    activity: Optional[DreamLogicActivity] = None
+    section = "head"  # head | goals | encouragement | trailing | epilogue
+    encouragement_parts: List[str] = []
+
+    for raw_line in str(text).split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        if section == "epilogue" or _is_epilogue(line, epilogue_markers):
+            section = "epilogue"
+            tree.epilogue.append(line)
+            continue
+
+        bare = _strip_marks(line)
+
+        if _is_encouragement_header(line):
+            section = "encouragement"
+            tree.encouragement_lines.append(line)
+            content = _ENCOURAGEMENT_PATTERN.sub('', bare, count=1).strip()
+            if content:
+                encouragement_parts.append(content)
+            continue
+
+        goal_match = _GOAL_PATTERN.match(bare)
+
+        if section == "encouragement":
+            # 새 섹션([...] 또는 중간목표)이 시작되면 응원 메모 수집 종료
+            if goal_match:
+                section = "goals" if tree.goals else "head"
+            elif _is_bracket_header(line):
+                # 응원 메모 뒤 머리글부터는 마지막 실천활동에 붙이지 않고 문서 순서대로 따로 보관
+                section = "trailing"
+            else:
+                tree.encouragement_lines.append(line)
+                encouragement_parts.append(line)
+                continue
+
+        if section == "trailing" and not goal_match:
+            tree.trailing.append(line)
+            continue
+
+        if goal_match:
+            number = goal_match.group(1) or goal_match.group(2)
+            goal = DreamLogicGoal(
+                line=line,
+                number=int(number) if number else None,
+                title=bare[goal_match.end():].strip()
+            )
+            tree.goals.append(goal)
+            activity = None
+            section = "goals"
+            continue
+
+        if section == "head":
+            final_match = _FINAL_DREAM_PATTERN.match(bare)
+            if final_match and tree.final_dream_line is None:
+                tree.final_dream_line = line
+                tree.final_dream = bare[final_match.end():].strip()
+            elif _is_bracket_header(line) and tree.title is None:
+                tree.title = line
+            else:
+                tree.preamble.append(line)
+            continue
+
+        activity_match = _ACTIVITY_PATTERN.match(bare)
+        if activity_match:
+            label = re.sub(r'\s+', ' ', activity_match.group(1)).strip()
+            activity = DreamLogicActivity(
+                line=line,
+                label=label,
+                kind=_activity_kind(label),
+                content=bare[activity_match.end():].strip()
+            )
+            goal.activities.append(activity)
+        elif activity is not None:
+            activity.items.append(line)
+        else:
+            goal.notes.append(line)
+
+    tree.encouragement = ' '.join(encouragement_parts).strip().strip('"').strip()
+    return tree
+
+
+def ensure_dream_logic_tree(dream_logic: Optional[str], tree=None,
+                            epilogue_markers: Sequence[str] = ()) -> DreamLogicTree:
+    """저장된 트리(모델 또는 dict)가 있으면 그대로 쓰고, 없으면 텍스트를 파싱"""
+    if isinstance(tree, DreamLogicTree):
+        return tree
+    if isinstance(tree, dict):
+        return DreamLogicTree(**tree)
+    return parse_dream_logic(dream_logic, epilogue_markers)
+
+
+def _goal_section_bounds(lines: List[str], goal_number: int,
+                         epilogue_markers: Sequence[str] = ()) -> Optional[Tuple[int, int]]:
+    """원본 줄 목록에서 지정한 중간목표 섹션의 (시작, 끝) 줄 번호 (끝은 포함하지 않음)
+
+    중간목표 번호가 없는 형식이면 등장 순서(1부터)로 찾는다.
+    """
+    start = None
+    order = 0
+    for index, raw_line in enumerate(lines):
+        line = raw_line.strip()
+        if not line:
+            continue
+        bare = _strip_marks(line)
+        goal_match = _GOAL_PATTERN.match(bare)
+        if start is not None:
+            # 다음 중간목표, 응원 메모, 설명 문단, [...] 머리말이 나오면 섹션 끝
+            if (goal_match or _is_encouragement_header(line) or _is_epilogue(line, epilogue_markers)
+                    or _is_bracket_header(line)):
+                end = index
+                while end > start and not lines[end - 1].strip():
+                    end -= 1
+                return start, end
+            continue
+        if goal_match:
+            order += 1
+            number = goal_match.group(1) or goal_match.group(2)
+            if (int(number) if number else order) == goal_number:
+                start = index
+    if start is None:
+        return None
+    end = len(lines)
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return start, end
+
+
+def get_goal_section(text: Optional[str], goal_number: int, epilogue_markers: Sequence[str] = ()) -> Optional[str]:
+    """드림로직 텍스트에서 중간목표 하나의 원문 섹션 추출 (없으면 None)"""
+    lines = str(text or '').split('\n')
+    bounds = _goal_section_bounds(lines, goal_number, epilogue_markers)
+    if bounds is None:
+        return None
+    return '\n'.join(lines[bounds[0]:bounds[1]])
+
+
+def replace_goal_section(text: str, goal_number: int, section: str, epilogue_markers: Sequence[str] = ()) -> str:
+    """드림로직 텍스트의 중간목표 하나를 새 섹션으로 교체 (나머지 내용과 줄 배치는 그대로 유지)
+
+    Raises:
+        ValueError: 해당 중간목표가 없을 때
+    """
+    lines = str(text).split('\n')
+    bounds = _goal_section_bounds(lines, goal_number, epilogue_markers)
+    if bounds is None:
+        raise ValueError(f"중간목표{goal_number}을(를) 찾을 수 없습니다.")
+    new_lines = section.strip('\n').split('\n')
+    return '\n'.join(lines[:bounds[0]] + new_lines + lines[bounds[1]:])
+
+
+def extract_regenerated_section(content: Optional[str], goal_number: int) -> Optional[str]:
+    """LLM이 새로 작성한 중간목표 섹션만 추출
+
+    번호가 다르게 붙어 있으면 첫 번째 중간목표 섹션을 쓰되 머리 라인의 번호를 goal_number로 고친다
+    (그대로 끼워 넣으면 같은 번호의 중간목표가 두 개가 되고 원래 번호의 중간목표가 사라짐).
+    """
+    section = get_goal_section(content, goal_number)
+    if section is not None:
+        return section
+    section = get_goal_section(content, 1)
+    if section is None:
+        return None
+    heading, _, body = section.partition('\n')
+    heading = re.sub(r'(중간목표\s*)\d*', lambda match: f"{match.group(1)}{goal_number}", heading, count=1)
+    return f"{heading}\n{body}" if body else heading
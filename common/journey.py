@@ -0,0 +1,136 @@
+"""
+학생 진행 단계별 시간 기록 (초등/중등/고등 공용)
+단계 요청을 처리하는 엔드포인트가 mark_stage()로 (학교, 세션, 단계)를 표시하면, 루트 앱 미들웨어가 요청이 끝날 때
+학생 생각 시간(이전 응답 후 다음 요청까지), 서버 처리 시간, 그중 LLM 대기 시간을 세션별로 짧게 남기고
+단계별 분포(히스토그램 및 최근 분위수)에 더한다.
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .memory_report import register_structure
+from .metrics import JOURNEY_STAGE_SECONDS
+
+# 세션별 기록을 보관할 최대 세션 수 (오래 안 쓴 세션부터 제거)
+JOURNEY_MAX_SESSIONS = int(os.getenv("JOURNEY_MAX_SESSIONS", "5000"))
+# 세션 하나에 남기는 최대 단계 기록 수
+JOURNEY_MAX_STAGES = int(os.getenv("JOURNEY_MAX_STAGES", "100"))
+# 이보다 긴 생각 시간은 이탈 후 복귀로 보고 분포에서 제외 (초)
+JOURNEY_MAX_THINK_SECONDS = int(os.getenv("JOURNEY_MAX_THINK_SECONDS", "1800"))
+# 분위수 계산에 쓰는 단계별 최근 표본 수
+JOURNEY_WINDOW_SAMPLES = int(os.getenv("JOURNEY_WINDOW_SAMPLES", "500"))
+
+KINDS = ("think", "server", "llm")
+
+_current: ContextVar[Optional[Dict[str, str]]] = ContextVar("journey_stage", default=None)
+
+
+def begin_request() -> Dict[str, str]:
+    """현재 요청의 단계 표시 공간 생성 (루트 앱 미들웨어에서 호출)"""
+    holder: Dict[str, str] = {}
+    _current.set(holder)
+    return holder
+
+
+def mark_stage(school: str, session_id: str, stage: str) -> None:
+    """현재 요청이 처리하는 학생 단계 표시 (루트 앱 밖에서 실행 중이면 무시)"""
+    holder = _current.get()
+    if holder is not None:
+        holder.update(school=school, session_id=session_id, stage=stage)
+
+
+class _SessionJourney:
+    """세션 하나의 단계 기록 (단계, 시작 후 경과 초, 생각/서버/LLM 밀리초)"""
+    __slots__ = ("started_at", "last_response_at", "stages")
+
+    def __init__(self, now: float):
+        self.started_at = now
+        self.last_response_at: Optional[float] = None
+        self.stages: List[Tuple[str, int, Optional[int], int, int]] = []
+
+
+class JourneyTelemetry:
+    """세션별 단계 기록 + 단계별 시간 분포"""
+
+    def __init__(self, max_sessions: int = JOURNEY_MAX_SESSIONS, max_stages: int = JOURNEY_MAX_STAGES,
+                 max_think_seconds: int = JOURNEY_MAX_THINK_SECONDS, window_samples: int = JOURNEY_WINDOW_SAMPLES):
+        self.max_sessions = max_sessions
+        self.max_stages = max_stages
+        self.max_think_seconds = max_think_seconds
+        self.window_samples = window_samples
+        self._sessions: "OrderedDict[str, _SessionJourney]" = OrderedDict()
+        self._samples: Dict[Tuple[str, str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, school: str, session_id: str, stage: str, arrived_at: float,
+               server_seconds: float, llm_seconds: float = 0.0) -> Optional[float]:
+        """단계 요청 한 건 기록 후 생각 시간 반환 (첫 요청이거나 너무 오래 비웠으면 None)"""
+        finished_at = arrived_at + server_seconds
+        key = f"{school}:{session_id}"
+        with self._lock:
+            journey = self._sessions.get(key)
+            if journey is None:
+                journey = self._sessions[key] = _SessionJourney(arrived_at)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(key)
+
+            think = None
+            if journey.last_response_at is not None:
+                think = max(0.0, arrived_at - journey.last_response_at)
+                if think > self.max_think_seconds:
+                    think = None
+            journey.last_response_at = finished_at
+            journey.stages.append((
+                stage, int(arrived_at - journey.started_at),
+                None if think is None else int(think * 1000), int(server_seconds * 1000), int(llm_seconds * 1000),
+            ))
+            del journey.stages[:-self.max_stages]
+
+            for kind, seconds in (("think", think), ("server", server_seconds), ("llm", llm_seconds)):
+                if seconds is None:
+                    continue
+                self._samples.setdefault((school, stage, kind), deque(maxlen=self.window_samples)).append(seconds)
+        for kind, seconds in (("think", think), ("server", server_seconds), ("llm", llm_seconds)):
+            if seconds is not None:
+                JOURNEY_STAGE_SECONDS.observe(seconds, school=school, stage=stage, kind=kind)
+        return think
+
+    def session(self, school: str, session_id: str) -> Optional[Dict[str, Any]]:
+        """세션 하나의 단계별 기록 (없으면 None)"""
+        with self._lock:
+            journey = self._sessions.get(f"{school}:{session_id}")
+            if journey is None:
+                return None
+            stages = list(journey.stages)
+        return {
+            "started_at": journey.started_at,
+            "stages": [{"stage": stage, "offset_s": offset, "think_ms": think, "server_ms": server, "llm_ms": llm}
+                       for stage, offset, think, server, llm in stages],
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """학교 → 단계 → 종류별 최근 표본 수와 p50/p90/p99 (초)"""
+        with self._lock:
+            samples = {key: sorted(values) for key, values in self._samples.items()}
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (school, stage, kind), values in sorted(samples.items()):
+            summary = {"count": len(values)}
+            for q in (0.5, 0.9, 0.99):
+                index = min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))
+                summary[f"p{int(q * 100)}"] = round(values[index], 3)
+            result.setdefault(school, {}).setdefault(stage, {})[kind] = summary
+        return result
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+# 전역 단계 시간 기록 인스턴스
+journey_telemetry = JourneyTelemetry()
+register_structure("journey.sessions", lambda: journey_telemetry._sessions)
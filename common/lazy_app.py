@@ -0,0 +1,63 @@
+"""
+하위 앱 지연 로딩 (루트 앱 공용)
+하위 앱 모듈은 OpenAI SDK, ReportLab, Jinja 템플릿, PDF 생성기 등을 함께 불러와 import에 수백 ms~수 초가 걸린다.
+루트 앱은 서버 시작 시 이를 import하지 않고 LazyApp을 마운트해 두며, 해당 경로로 첫 요청이 들어오면
+이벤트 루프를 막지 않도록 별도 스레드에서 import한 뒤 이후 요청은 그대로 전달한다.
+"""
+
+import asyncio
+import importlib
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class LazyApp:
+    """'모듈:속성' 경로의 ASGI 앱을 첫 요청 때 불러와 전달"""
+
+    def __init__(self, target: str):
+        self.target = target
+        self.app: Optional[Any] = None
+        self.load_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.app is not None
+
+    @property
+    def routes(self) -> List[Any]:
+        """이미 불러온 하위 앱의 라우트 (url_for 경로 계산용, 불러오기 전에는 빈 목록)"""
+        return getattr(self.app, "routes", [])
+
+    def load(self) -> Any:
+        """하위 앱 import (이미 불러왔으면 그대로 반환, 여러 스레드에서 동시에 불러도 한 번만 import)"""
+        if self.app is None:
+            with self._lock:
+                if self.app is None:
+                    module_name, _, attribute = self.target.partition(":")
+                    started = time.perf_counter()
+                    app = getattr(importlib.import_module(module_name), attribute or "app")
+                    self.load_seconds = time.perf_counter() - started
+                    self.app = app
+                    print(f"📦 하위 앱 로드: {self.target} ({self.load_seconds * 1000:.0f}ms)")
+        return self.app
+
+    def warm_up(self) -> Dict[str, Any]:
+        """하위 앱을 불러오고 모듈에 warm_up()이 있으면 실행 (단계별 결과 반환)"""
+        self.load()
+        hook = getattr(sys.modules[self.target.partition(":")[0]], "warm_up", None)
+        return hook() if hook is not None else {}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "target": self.target, "loaded": self.loaded,
+            "load_ms": None if self.load_seconds is None else round(self.load_seconds * 1000, 1),
+        }
+
+    async def __call__(self, scope, receive, send) -> None:
+        app = self.app
+        if app is None:
+            app = await asyncio.to_thread(self.load)
+        await app(scope, receive, send)
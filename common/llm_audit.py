@@ -0,0 +1,154 @@
+"""
+LLM 호출 감사 로그 (초등/중등/고등 공용)
+호출 위치별 비율로 표본을 골라 프롬프트와 응답을 큐에 넣기만 하고, 백그라운드 스레드가 학생 이름을 가린 뒤
+gzip으로 압축한 JSONL 파일에 묶어서 기록한다. 표본에 들지 않은 호출은 난수 하나만 뽑고 끝난다.
+"""
+
+import gzip
+import json
+import os
+import queue
+import random
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .metrics import LLM_AUDIT_RECORDS
+
+# 감사 로그 사용 여부
+LLM_AUDIT_ENABLED = os.getenv("LLM_AUDIT", "1") == "1"
+# 감사 로그 파일 위치 (날짜별 llm-audit-YYYYMMDD.jsonl.gz)
+LLM_AUDIT_DIR = os.getenv("LLM_AUDIT_DIR", os.path.join(tempfile.gettempdir(), "eduvil_llm_audit"))
+# 기본 표본 비율과 호출 위치별 비율 (예: {"high_school.final_summary": 1.0})
+LLM_AUDIT_SAMPLE_RATE = float(os.getenv("LLM_AUDIT_SAMPLE_RATE", "0.05"))
+LLM_AUDIT_SAMPLE_RATES: Dict[str, float] = json.loads(os.getenv("LLM_AUDIT_SAMPLE_RATES", "{}"))
+# 한 번에 기록하는 최대 건수와 최대 대기 시간 (초)
+LLM_AUDIT_BATCH_SIZE = int(os.getenv("LLM_AUDIT_BATCH_SIZE", "200"))
+LLM_AUDIT_FLUSH_SECONDS = float(os.getenv("LLM_AUDIT_FLUSH_SECONDS", "5"))
+# 기록 대기 큐 크기 (가득 차면 새 기록은 버림)
+LLM_AUDIT_QUEUE_SIZE = int(os.getenv("LLM_AUDIT_QUEUE_SIZE", "2000"))
+
+REDACTED_NAME = "[이름]"
+# 프롬프트의 "이름: 홍길동", "학생 이름: 홍길동" 형식
+_NAME_FIELD = re.compile(r"((?:학생\s*)?이름\s*[:：]\s*)([^\s,\n]+)")
+
+
+def redact(text: Optional[str], names: Sequence[str] = ()) -> Optional[str]:
+    """알려진 학생 이름과 이름 항목 값을 가림"""
+    if not text:
+        return text
+    for name in sorted({name.strip() for name in names if name and name.strip()}, key=len, reverse=True):
+        text = text.replace(name, REDACTED_NAME)
+    return _NAME_FIELD.sub(lambda match: match.group(1) + REDACTED_NAME, text)
+
+
+class _Flush:
+    """큐에 넣는 기록 요청 표시 (쓰기 스레드가 모아 둔 기록을 쓰고 done을 알림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class AuditSink:
+    """표본 선택 + 백그라운드 묶음 기록"""
+
+    def __init__(self, directory: str = LLM_AUDIT_DIR, sample_rate: float = LLM_AUDIT_SAMPLE_RATE,
+                 sample_rates: Optional[Dict[str, float]] = None, batch_size: int = LLM_AUDIT_BATCH_SIZE,
+                 flush_seconds: float = LLM_AUDIT_FLUSH_SECONDS, queue_size: int = LLM_AUDIT_QUEUE_SIZE,
+                 enabled: bool = LLM_AUDIT_ENABLED):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.sample_rates = LLM_AUDIT_SAMPLE_RATES if sample_rates is None else sample_rates
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.enabled = enabled
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def should_sample(self, call_site: str) -> bool:
+        return self.enabled and random.random() < self.sample_rates.get(call_site, self.sample_rate)
+
+    def submit(self, call_site: str, model: Optional[str], messages: List[Dict[str, str]],
+               response_text: Optional[str], seconds: float, usage: Optional[Dict[str, int]] = None,
+               redact_names: Sequence[str] = (), error: Optional[str] = None) -> bool:
+        """표본이면 기록 대기 큐에 넣음 (직렬화와 이름 가리기는 쓰기 스레드에서 처리)"""
+        if not self.should_sample(call_site):
+            return False
+        self._ensure_writer()
+        record = {
+            "ts": time.time(), "call_site": call_site, "model": model, "seconds": round(seconds, 3),
+            "usage": usage, "error": error, "messages": messages, "response": response_text,
+            "_redact": tuple(redact_names),
+        }
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            LLM_AUDIT_RECORDS.inc(result="dropped")
+            return False
+        return True
+
+    def flush(self, timeout: float = 10) -> bool:
+        """큐에 쌓인 기록을 모두 파일에 쓸 때까지 대기 (종료 시, 테스트용)"""
+        if self._thread is None:
+            return True
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="llm-audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            markers: List[_Flush] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                if isinstance(item, _Flush):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for marker in markers:
+                marker.done.set()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        lines = []
+        for record in batch:
+            names = record.pop("_redact")
+            record["messages"] = [{**message, "content": redact(message.get("content"), names)}
+                                  for message in record["messages"]]
+            record["response"] = redact(record["response"], names)
+            record["error"] = redact(record["error"], names)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"llm-audit-{time.strftime('%Y%m%d')}.jsonl.gz"
+            # gzip 멤버를 이어 붙이는 방식이라 한 파일에 여러 번 추가해도 그대로 읽힘
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            LLM_AUDIT_RECORDS.inc(len(lines), result="written")
+        except OSError as e:
+            print(f"⚠️ LLM 감사 로그 기록 실패: {e}")
+            LLM_AUDIT_RECORDS.inc(len(lines), result="dropped")
+
+
+# 전역 LLM 감사 로그 인스턴스
+llm_audit = AuditSink()
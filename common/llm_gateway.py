@@ -0,0 +1,520 @@
+"""
+LLM 호출 게이트웨이 (초등/중등/고등 공용)
+호출 위치(call site)별 모델 라우팅 표를 한곳에 두고, 모델별 파라미터 형식(dialect) 차이를 흡수한다.
+최근 응답 시간의 p95가 호출 위치의 목표 지연(latency SLO)을 넘으면 더 빠른 대체 모델로 자동 전환한다.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from .llm_audit import llm_audit
+from .memory_report import register_structure
+from .metrics import LLM_ERRORS, LLM_FALLBACKS, LLM_HEDGES, LLM_REQUEST_SECONDS, LLM_TOKENS
+from .server_timing import span
+
+# 지연 통계에 사용하는 최근 구간 (초) - 이 시간이 지나면 느렸던 기록이 사라져 기본 모델로 돌아감
+LATENCY_WINDOW_SECONDS = int(os.getenv("LLM_LATENCY_WINDOW_SECONDS", "300"))
+# p95 판단에 필요한 최소 표본 수
+LATENCY_MIN_SAMPLES = int(os.getenv("LLM_LATENCY_MIN_SAMPLES", "5"))
+# 라우팅 표를 덮어쓸 JSON 파일 경로 (호출 위치 → ModelRoute 필드)
+ROUTING_FILE = os.getenv("LLM_ROUTING_FILE")
+# 헤지 요청(느린 첫 요청의 중복 요청) 사용 여부
+LLM_HEDGING = os.getenv("LLM_HEDGING", "1") == "1"
+# 전체 헤지 예산: 일반 호출 대비 추가로 보낼 수 있는 헤지 요청 비율
+LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.1"))
+# 호출이 없던 상태에서도 바로 쓸 수 있는 헤지 요청 수 (예산 상한)
+LLM_HEDGE_BUDGET_BURST = int(os.getenv("LLM_HEDGE_BUDGET_BURST", "5"))
+# 동시에 진행할 수 있는 헤지 요청 수 (모두 사용 중이면 헤지 없이 첫 요청을 기다림)
+LLM_HEDGE_WORKERS = int(os.getenv("LLM_HEDGE_WORKERS", "16"))
+# 회로 차단기: 연속 실패(타임아웃 포함) 몇 번이면 차단할지
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+# 회로 차단 후 복구 확인 호출을 보내기까지 기다리는 시간 (초)
+LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+# 복구 확인 중 동시에 허용하는 시험 호출 수
+LLM_BREAKER_PROBES = int(os.getenv("LLM_BREAKER_PROBES", "2"))
+# 회로 차단 중 대신 돌려줄 최근 성공 응답 보관 개수
+LLM_RESPONSE_CACHE_SIZE = int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "256"))
+
+
+class ModelRoute(BaseModel):
+    """호출 위치 하나의 모델 라우팅 설정"""
+    primary: str
+    fallbacks: List[str] = []
+    latency_slo: float = 10.0  # 목표 p95 응답 시간 (초)
+    dialect: Optional[str] = None  # chat | reasoning (None이면 모델 이름으로 판단)
+    # 첫 요청이 최근 응답 시간의 이 분위수까지 답하지 않으면 중복 요청 (None이면 헤지 안 함)
+    hedge_percentile: Optional[float] = None
+    hedge_model: Optional[str] = None  # 중복 요청에 쓸 모델 (None이면 같은 모델)
+    timeout: float = 30.0  # 요청 타임아웃 (초) - 타임아웃도 회로 차단기 실패로 집계
+
+
+# 파라미터 형식: 토큰 제한 파라미터 이름, temperature 지원 여부
+DIALECTS: Dict[str, Dict[str, Any]] = {
+    "chat": {"tokens_param": "max_tokens", "temperature": True},
+    # gpt-5, o 시리즈 추론 모델: max_completion_tokens만 받고 temperature는 기본값(1)만 허용
+    "reasoning": {"tokens_param": "max_completion_tokens", "temperature": False},
+}
+
+# 호출 위치별 라우팅 표
+MODEL_ROUTES: Dict[str, ModelRoute] = {
+    # 초등학교
+    "elementary.recommendation": ModelRoute(primary="gpt-4o-mini", fallbacks=["gpt-4.1-nano"], latency_slo=8,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-nano"),
+    "elementary.modify_recommendation": ModelRoute(primary="gpt-4o-mini", fallbacks=["gpt-4.1-nano"], latency_slo=8,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-nano"),
+    "elementary.step4_issues": ModelRoute(primary="gpt-4o-mini", fallbacks=["gpt-4.1-nano"], latency_slo=10,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-nano"),
+    "elementary.dream_logic": ModelRoute(primary="gpt-4o-mini", fallbacks=["gpt-4.1-mini"], latency_slo=25, timeout=60),
+    "elementary.dream_logic_section": ModelRoute(primary="gpt-4o-mini", fallbacks=["gpt-4.1-nano"], latency_slo=10),
+    "elementary.encouragement": ModelRoute(primary="gpt-4o-mini", fallbacks=["gpt-4.1-nano"], latency_slo=5),
+    # 중학교
+    "middle.recommendation": ModelRoute(primary="gpt-4.1-2025-04-14", fallbacks=["gpt-4.1-mini"], latency_slo=8,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-mini"),
+    "middle.step4_issues": ModelRoute(primary="gpt-4.1-2025-04-14", fallbacks=["gpt-4.1-mini"], latency_slo=10,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-mini"),
+    "middle.dream_logic": ModelRoute(primary="gpt-4.1-2025-04-14", fallbacks=["gpt-4.1-mini"], latency_slo=30, timeout=60),
+    "middle.dream_logic_section": ModelRoute(primary="gpt-4.1-2025-04-14", fallbacks=["gpt-4.1-mini"], latency_slo=12),
+    # 고등학교 7단계 흐름
+    "high_school.default": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=10),
+    "high_school.issues": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=10,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-nano"),
+    "high_school.topics": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=10,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-nano"),
+    "high_school.suggested_goal": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=6,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-nano"),
+    "high_school.midgoals": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=10),
+    "high_school.final_summary": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=40, timeout=90),
+    "high_school.summary_section": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=15),
+    "high_school.translation": ModelRoute(primary="gpt-4.1-mini", fallbacks=["gpt-4.1-nano"], latency_slo=5,
+        hedge_percentile=0.9, hedge_model="gpt-4.1-nano"),
+}
+
+
+def _load_route_overrides(path: Optional[str]) -> None:
+    """JSON 파일의 라우팅 설정으로 기본 표 덮어쓰기"""
+    if not path:
+        return
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        for call_site, fields in overrides.items():
+            base = MODEL_ROUTES[call_site].dict() if call_site in MODEL_ROUTES else {}
+            MODEL_ROUTES[call_site] = ModelRoute(**{**base, **fields})
+        print(f"✅ LLM 라우팅 설정 적용: {path} ({len(overrides)}개)")
+    except Exception as e:
+        print(f"⚠️ LLM 라우팅 설정 파일 로드 실패: {e}")
+
+
+_load_route_overrides(ROUTING_FILE)
+
+
+def model_dialect(model: str, route: Optional[ModelRoute] = None) -> str:
+    """모델의 파라미터 형식 (라우팅 표에 지정이 없으면 모델 이름으로 판단)"""
+    if route is not None and route.dialect and model == route.primary:
+        return route.dialect
+    name = model.lower()
+    if name.startswith("gpt-5") or name.startswith(("o1", "o3", "o4")):
+        return "reasoning"
+    return "chat"
+
+
+def build_params(model: str, messages: List[Dict[str, str]], max_tokens: Optional[int] = None,
+                 temperature: Optional[float] = None, route: Optional[ModelRoute] = None,
+                 **extra) -> Dict[str, Any]:
+    """모델 형식에 맞는 chat.completions.create 파라미터 구성"""
+    dialect = DIALECTS[model_dialect(model, route)]
+    params: Dict[str, Any] = {"model": model, "messages": messages, **extra}
+    if max_tokens is not None:
+        params[dialect["tokens_param"]] = max_tokens
+    if temperature is not None and dialect["temperature"]:
+        params["temperature"] = temperature
+    return params
+
+
+class LatencyTracker:
+    """(호출 위치, 모델)별 최근 응답 시간 기록"""
+
+    def __init__(self, window_seconds: int = LATENCY_WINDOW_SECONDS, max_samples: int = 200):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, model: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault((call_site, model), deque(maxlen=self.max_samples))
+            samples.append((time.time(), seconds))
+
+    def recent(self, call_site: str, model: str) -> List[float]:
+        """구간 안의 응답 시간 목록"""
+        cutoff = time.time() - self.window_seconds
+        with self._lock:
+            samples = self._samples.get((call_site, model))
+            if not samples:
+                return []
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+            return [seconds for _, seconds in samples]
+
+    def percentile(self, call_site: str, model: str, q: float,
+                   min_samples: int = LATENCY_MIN_SAMPLES) -> Optional[float]:
+        """최근 응답 시간의 q 분위수 (표본이 부족하면 None)"""
+        values = sorted(self.recent(call_site, model))
+        if len(values) < min_samples:
+            return None
+        index = min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))
+        return values[index]
+
+
+class HedgeBudget:
+    """전체 헤지 요청 예산 (일반 호출마다 ratio만큼 쌓이고 헤지 요청마다 1씩 사용)"""
+
+    def __init__(self, ratio: float = LLM_HEDGE_BUDGET_RATIO, burst: int = LLM_HEDGE_BUDGET_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class CircuitOpenError(Exception):
+    """호출 위치의 모든 모델 회로가 차단되어 호출하지 않음 (호출부는 즉시 기본값으로 대체)"""
+
+
+def record_fallback(call_site: str, exc: Exception) -> None:
+    """호출부가 LLM 실패로 기본값을 돌려줄 때 사유별로 집계"""
+    if isinstance(exc, CircuitOpenError):
+        reason = "circuit_open"
+    elif "timeout" in type(exc).__name__.lower():
+        reason = "timeout"
+    else:
+        reason = "error"
+    LLM_FALLBACKS.inc(call_site=call_site, reason=reason)
+
+
+def is_service_failure(exc: Exception) -> bool:
+    """
+    회로 차단기 실패로 셀 오류인지 (타임아웃, 연결 오류, 5xx/429 응답)
+    잘못된 요청·인증 오류 같은 4xx는 같은 요청을 다시 보내도 실패하므로 모델 장애로 보지 않음
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__.lower()
+    if "timeout" in name or "connection" in name:
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status >= 500 or status == 429)
+
+
+class CircuitBreaker:
+    """(호출 위치, 모델) 하나의 회로 차단기 (closed → open → half_open → closed)"""
+
+    def __init__(self, failure_threshold: int = LLM_BREAKER_FAILURES,
+                 open_seconds: float = LLM_BREAKER_OPEN_SECONDS, max_probes: int = LLM_BREAKER_PROBES):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_probes = max_probes
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """호출해도 되는지 확인 (차단 시간이 지나면 시험 호출을 max_probes개까지 허용)"""
+        with self._lock:
+            if self.state == "open" and time.time() - self.opened_at >= self.open_seconds:
+                self.state = "half_open"
+                self.probes = 0
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and self.probes < self.max_probes:
+                self.probes += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                print("✅ LLM 회로 복구")
+            self.state = "closed"
+            self.failures = 0
+            self.probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.time()
+                self.probes = 0
+
+    def release(self) -> None:
+        """허용받았지만 실행되지 않은 시험 호출 반납"""
+        with self._lock:
+            if self.state == "half_open" and self.probes > 0:
+                self.probes -= 1
+
+
+class ResponseCache:
+    """호출 위치와 메시지별 최근 성공 응답 (회로 차단 중 대체 응답으로 사용)"""
+
+    def __init__(self, max_entries: int = LLM_RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(call_site: str, messages: List[Dict[str, str]]) -> str:
+        payload = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+        return call_site + ":" + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, response: Any) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _response_text(response) -> Optional[str]:
+    try:
+        return response.choices[0].message.content
+    except (AttributeError, IndexError):
+        return None
+
+
+def _usage(response) -> Optional[Dict[str, int]]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {"prompt": getattr(usage, "prompt_tokens", 0) or 0, "completion": getattr(usage, "completion_tokens", 0) or 0}
+
+
+class LLMGateway:
+    """라우팅 표에 따라 모델을 고르고, 응답 시간을 기록하는 LLM 호출 창구"""
+
+    def __init__(self, routes: Dict[str, ModelRoute] = MODEL_ROUTES, hedging: bool = LLM_HEDGING):
+        self.routes = routes
+        self.latency = LatencyTracker()
+        self.hedging = hedging
+        self.hedge_budget = HedgeBudget()
+        self.hedge_counts: Dict[str, Dict[str, int]] = {}
+        self.breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self.cache = ResponseCache()
+        self._hedge_slots = threading.BoundedSemaphore(LLM_HEDGE_WORKERS)
+        self._lock = threading.Lock()
+
+    def route(self, call_site: str) -> ModelRoute:
+        if call_site not in self.routes:
+            raise KeyError(f"라우팅 표에 없는 호출 위치입니다: {call_site}")
+        return self.routes[call_site]
+
+    def select_model(self, call_site: str) -> str:
+        """호출할 모델 선택 (기본 모델의 p95가 목표를 넘으면 목표를 지키는 대체 모델로 전환)"""
+        route = self.route(call_site)
+        for model in [route.primary] + route.fallbacks:
+            p95 = self.latency.percentile(call_site, model, 0.95)
+            if p95 is None or p95 <= route.latency_slo:
+                if model != route.primary:
+                    print(f"⚡ {call_site}: {route.primary} p95 지연이 목표({route.latency_slo}s)를 넘어 {model}로 전환")
+                return model
+        # 모든 모델이 목표를 넘으면 p95가 가장 낮은 모델 사용
+        candidates = [route.primary] + route.fallbacks
+        return min(candidates, key=lambda m: self.latency.percentile(call_site, m, 0.95) or 0.0)
+
+    def breaker(self, call_site: str, model: str) -> CircuitBreaker:
+        with self._lock:
+            return self.breakers.setdefault((call_site, model), CircuitBreaker())
+
+    def chat(self, client, call_site: str, messages: List[Dict[str, str]],
+             max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+             redact: Sequence[str] = (), **extra):
+        """
+        라우팅된 모델로 chat.completions.create 호출 후 응답 시간 기록 (설정된 호출 위치는 헤지 요청)
+        선택한 모델의 회로가 차단되어 있으면 다른 모델을 쓰고, 모두 차단되어 있으면 최근 성공 응답을
+        돌려주거나 CircuitOpenError를 바로 발생시킴
+        redact: 감사 로그에서 가릴 학생 이름
+        """
+        route = self.route(call_site)
+        selected = self.select_model(call_site)
+        cache_key = ResponseCache.key(call_site, messages)
+        model = next((m for m in self._candidates(route, selected) if self.breaker(call_site, m).allow()), None)
+        if model is None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"🚧 {call_site}: 회로 차단 중 - 최근 응답 재사용")
+                LLM_FALLBACKS.inc(call_site=call_site, reason="cached")
+                return cached
+            raise CircuitOpenError(f"{call_site}: 모든 모델의 회로가 차단되어 있습니다.")
+
+        extra.setdefault("timeout", route.timeout)
+        request = dict(messages=messages, max_tokens=max_tokens, temperature=temperature, route=route, **extra)
+        self.hedge_budget.deposit()
+        started = time.perf_counter()
+        try:
+            with span("llm"):
+                if not self.hedging or route.hedge_percentile is None:
+                    response = self._call(client, call_site, model, request)
+                else:
+                    response = self._hedged_call(client, call_site, route, model, request)
+        except Exception as e:
+            llm_audit.submit(call_site, model, messages, None, time.perf_counter() - started,
+                             redact_names=redact, error=f"{type(e).__name__}: {e}")
+            raise
+        self.cache.put(cache_key, response)
+        llm_audit.submit(call_site, getattr(response, "model", None) or model, messages, _response_text(response),
+                         time.perf_counter() - started, _usage(response), redact)
+        return response
+
+    @staticmethod
+    def _candidates(route: ModelRoute, selected: str) -> List[str]:
+        return [selected] + [m for m in [route.primary] + route.fallbacks if m != selected]
+
+    def _call(self, client, call_site: str, model: str, request: Dict[str, Any]):
+        started = time.perf_counter()
+        breaker = self.breaker(call_site, model)
+        try:
+            response = client.chat.completions.create(**build_params(model, **request))
+        except Exception as e:
+            kind = "timeout" if "timeout" in type(e).__name__.lower() else "error"
+            LLM_ERRORS.inc(call_site=call_site, model=model, kind=kind)
+            if not is_service_failure(e):
+                # 요청 자체의 문제는 차단기에 반영하지 않음 (시험 호출 자리는 반납)
+                breaker.release()
+                raise
+            breaker.record_failure()
+            if breaker.state == "open":
+                print(f"🚧 {call_site}: {model} 회로 차단 ({breaker.failures}회 연속 실패)")
+            raise
+        finally:
+            # 실패한 호출도 걸린 시간만큼 사용자를 기다리게 했으므로 함께 기록
+            elapsed = time.perf_counter() - started
+            self.latency.record(call_site, model, elapsed)
+            LLM_REQUEST_SECONDS.observe(elapsed, call_site=call_site, model=model)
+        breaker.record_success()
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            LLM_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, call_site=call_site, model=model, kind="prompt")
+            LLM_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, call_site=call_site, model=model, kind="completion")
+        return response
+
+    def hedge_delay(self, call_site: str, route: ModelRoute, model: str) -> float:
+        """중복 요청을 보내기 전 기다리는 시간 (표본이 부족하면 지연 목표만큼 기다림)"""
+        delay = self.latency.percentile(call_site, model, route.hedge_percentile)
+        return delay if delay is not None else route.latency_slo
+
+    def _hedged_call(self, client, call_site: str, route: ModelRoute, model: str, request: Dict[str, Any]):
+        """
+        첫 요청이 늦으면 중복 요청을 보내고 먼저 성공한 응답 사용
+        요청마다 전용 스레드에서 바로 시작하므로 공용 스레드 풀에서 줄 서는 시간이 헤지 대기나 지연 기록에 섞이지 않음
+        """
+        primary = self._start_request(client, call_site, model, request)
+        done, _ = wait([primary], timeout=self.hedge_delay(call_site, route, model))
+        if done:
+            return primary.result()
+
+        # 헤지 모델 회로 → 동시 헤지 수 → 헤지 예산 순으로 확인 (앞 단계에서 막히면 예산을 쓰지 않음)
+        hedge_model = route.hedge_model or model
+        hedge_breaker = self.breaker(call_site, hedge_model)
+        if not hedge_breaker.allow():
+            return primary.result()
+        if not self._hedge_slots.acquire(blocking=False):
+            hedge_breaker.release()
+            return primary.result()
+        if not self.hedge_budget.try_spend():
+            self._hedge_slots.release()
+            hedge_breaker.release()
+            return primary.result()
+
+        print(f"🔀 {call_site}: {model} 응답 지연으로 {hedge_model} 헤지 요청")
+        self._count_hedge(call_site, "fired")
+        hedge = self._start_request(client, call_site, hedge_model, request, on_done=self._hedge_slots.release)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # 늦은 쪽 요청은 끝난 뒤 결과를 버림 (진행 중인 동기 HTTP 요청은 중단할 수 없음)
+                    if future is hedge:
+                        self._count_hedge(call_site, "won")
+                    return future.result()
+        # 둘 다 실패하면 첫 요청의 오류 전달
+        return primary.result()
+
+    def _start_request(self, client, call_site: str, model: str, request: Dict[str, Any],
+                       on_done=None) -> Future:
+        """요청을 전용 스레드에서 바로 시작하고 결과를 Future로 반환"""
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run():
+            try:
+                future.set_result(self._call(client, call_site, model, request))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                if on_done is not None:
+                    on_done()
+
+        threading.Thread(target=run, name=f"llm-{call_site}", daemon=True).start()
+        return future
+
+    def _count_hedge(self, call_site: str, key: str) -> None:
+        LLM_HEDGES.inc(call_site=call_site, outcome=key)
+        with self._lock:
+            counts = self.hedge_counts.setdefault(call_site, {"fired": 0, "won": 0})
+            counts[key] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """호출 위치별 모델 지연 요약 (운영 확인용)"""
+        result: Dict[str, Dict[str, Any]] = {}
+        for call_site, route in self.routes.items():
+            models = {}
+            for model in [route.primary] + route.fallbacks:
+                values = self.latency.recent(call_site, model)
+                if values:
+                    models[model] = {
+                        "count": len(values),
+                        "p95": self.latency.percentile(call_site, model, 0.95, min_samples=1),
+                    }
+            if models:
+                result[call_site] = {"latency_slo": route.latency_slo, "models": models}
+                if call_site in self.hedge_counts:
+                    result[call_site]["hedges"] = dict(self.hedge_counts[call_site])
+                breakers = {m: self.breakers[(call_site, m)].state for m in models
+                            if (call_site, m) in self.breakers}
+                result[call_site]["circuits"] = breakers
+        return result
+
+
+# 전역 LLM 게이트웨이 인스턴스
+llm_gateway = LLMGateway()
+register_structure("llm.response_cache", lambda: llm_gateway.cache._entries)
+register_structure("llm.latency_samples", lambda: llm_gateway.latency._samples)
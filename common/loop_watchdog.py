@@ -0,0 +1,154 @@
+"""
+이벤트 루프 차단 감시 (루트 앱 공용)
+루프 안의 박동 코루틴이 짧은 간격으로 깨어나며 지연을 기록하고, 별도 감시 스레드가 박동이 임계값 이상
+멈추면 그 순간 루프 스레드의 스택과 요청 경로를 잡아 로그로 남긴다 (같은 위치는 일정 시간에 한 번만).
+"""
+
+import asyncio
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG_QUANTILE, EVENT_LOOP_LAG_SECONDS
+
+# 감시 사용 여부
+LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG", "1") == "1"
+# 박동 간격 (초)
+LOOP_WATCHDOG_INTERVAL = float(os.getenv("LOOP_WATCHDOG_INTERVAL", "0.1"))
+# 이 시간 이상 루프가 멈추면 차단으로 보고 스택 수집 (초)
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.25"))
+# 같은 위치의 차단 스택을 다시 남기기까지의 최소 간격 (초)
+LOOP_BLOCK_REPORT_INTERVAL = int(os.getenv("LOOP_BLOCK_REPORT_INTERVAL", "60"))
+# 지연 분위수를 계산하는 최근 구간 (초)
+LOOP_LAG_WINDOW_SECONDS = int(os.getenv("LOOP_LAG_WINDOW_SECONDS", "300"))
+
+# 차단 위치로 보지 않는 모듈 (스택 맨 안쪽에서 건너뜀)
+_SKIPPED_FILES = (os.sep + "asyncio" + os.sep, os.sep + "threading.py", os.sep + "selectors.py")
+
+logger = logging.getLogger(__name__)
+
+
+def _request_path(frame) -> Optional[str]:
+    """스택을 바깥쪽으로 따라가며 처리 중인 ASGI 요청 경로 찾기"""
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and scope.get("type") in ("http", "websocket"):
+            return scope.get("path")
+        frame = frame.f_back
+    return None
+
+
+class LoopWatchdog:
+    """이벤트 루프 지연 측정 + 차단 스택 수집"""
+
+    def __init__(self, interval: float = LOOP_WATCHDOG_INTERVAL, threshold: float = LOOP_BLOCK_THRESHOLD,
+                 report_interval: int = LOOP_BLOCK_REPORT_INTERVAL, window_seconds: int = LOOP_LAG_WINDOW_SECONDS):
+        self.interval = interval
+        self.threshold = threshold
+        self.report_interval = report_interval
+        self.window_seconds = window_seconds
+        self.recent_blocks: Deque[Dict[str, Any]] = deque(maxlen=20)
+        self._lags: Deque[tuple] = deque(maxlen=max(1, int(window_seconds / interval)))
+        self._beat = time.monotonic()
+        self._reported_beat: Optional[float] = None
+        self._last_report: Dict[str, float] = {}
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """박동 코루틴과 감시 스레드 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._stop.clear()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self._beat = time.monotonic()
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            with self._lock:
+                self._lags.append((time.time(), lag))
+                if lag >= self.threshold:
+                    EVENT_LOOP_BLOCKS.inc()
+                    # 감시 스레드가 잡은 차단이면 실제 멈춘 시간을 채움
+                    if self.recent_blocks and self.recent_blocks[-1].get("seconds") is None:
+                        self.recent_blocks[-1]["seconds"] = round(lag, 3)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._beat
+            stalled = time.monotonic() - beat
+            if stalled >= self.threshold and self._reported_beat != beat:
+                self._reported_beat = beat
+                self._capture(stalled)
+
+    def _capture(self, stalled: float) -> None:
+        """멈춰 있는 루프 스레드의 스택과 요청 경로 기록 (같은 위치는 report_interval에 한 번)"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame, limit=25)
+        culprit = next((entry for entry in reversed(stack)
+                        if not any(skipped in entry.filename for skipped in _SKIPPED_FILES)), stack[-1])
+        location = f"{culprit.filename}:{culprit.lineno} ({culprit.name})"
+        now = time.time()
+        with self._lock:
+            if now - self._last_report.get(location, 0) < self.report_interval:
+                return
+            self._last_report[location] = now
+            report = {"at": now, "location": location, "path": _request_path(frame), "seconds": None,
+                      "stack": traceback.format_list(stack)}
+            self.recent_blocks.append(report)
+        logger.warning(
+            "🐢 이벤트 루프 차단 %.2f초 이상: %s (요청: %s)\n%s",
+            stalled, location, report["path"] or "-", "".join(report["stack"]),
+        )
+
+    def lag_percentile(self, q: float) -> float:
+        """최근 구간 지연의 q 분위수 (초, 기록이 없으면 0)"""
+        cutoff = time.time() - self.window_seconds
+        with self._lock:
+            values = sorted(lag for at, lag in self._lags if at >= cutoff)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+    def stats(self) -> Dict[str, Any]:
+        """지연 분위수와 최근 차단 목록 (스택 제외)"""
+        with self._lock:
+            blocks = [{key: value for key, value in report.items() if key != "stack"}
+                      for report in self.recent_blocks]
+        return {
+            "lag_seconds": {f"p{int(q * 100)}": round(self.lag_percentile(q), 4) for q in (0.5, 0.95, 0.99)},
+            "recent_blocks": blocks,
+        }
+
+
+# 전역 이벤트 루프 감시 인스턴스
+loop_watchdog = LoopWatchdog()
+
+for _q in ("0.5", "0.95", "0.99"):
+    EVENT_LOOP_LAG_QUANTILE.set_function(lambda q=float(_q): loop_watchdog.lag_percentile(q), quantile=_q)
@@ -0,0 +1,195 @@
+"""
+프로세스 메모리 진단 (루트 앱 운영자 엔드포인트용)
+각 모듈이 메모리에 보관하는 구조(세션 저장소, 캐시, 폰트 등)와 임시 파일 패턴을 등록해 두면
+항목 수와 대략적인 전체 크기(참조를 따라간 합)를 보고하고, tracemalloc 스냅샷과 스냅샷 간 차이를 제공한다.
+"""
+
+import glob
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+# 크기 계산 시 따라가는 최대 객체 수 (넘으면 중단하고 truncated 표시)
+MEMORY_SIZE_MAX_OBJECTS = int(os.getenv("MEMORY_SIZE_MAX_OBJECTS", "500000"))
+# 보관할 tracemalloc 스냅샷 수
+MEMORY_MAX_SNAPSHOTS = int(os.getenv("MEMORY_MAX_SNAPSHOTS", "5"))
+
+# 크기 계산에서 따라가지 않는 객체 (모듈 전역, 코드, 클래스 등 공유 객체)
+_OPAQUE_TYPES = (types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+                 type, types.CodeType, types.FrameType)
+
+_structures: Dict[str, Callable[[], Any]] = {}
+_temp_files: Dict[str, str] = {}
+
+
+def register_structure(name: str, getter: Callable[[], Any]) -> None:
+    """보고할 메모리 구조 등록 (getter는 보고할 때마다 현재 객체를 반환)"""
+    _structures[name] = getter
+
+
+def register_temp_files(name: str, pattern: str) -> None:
+    """보고할 임시 파일 glob 패턴 등록 (디스크에 쌓이는 파일 확인용)"""
+    _temp_files[name] = pattern
+
+
+def deep_sizeof(obj: Any, max_objects: int = MEMORY_SIZE_MAX_OBJECTS) -> Dict[str, Any]:
+    """obj에서 참조를 따라가며 sys.getsizeof 합산 (같은 객체는 한 번만)"""
+    seen = set()
+    pending = [obj]
+    total = 0
+    truncated = False
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        if len(seen) >= max_objects:
+            truncated = True
+            break
+        seen.add(id(current))
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+        if isinstance(current, _OPAQUE_TYPES) or isinstance(current, (str, bytes, bytearray, int, float)):
+            continue
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            pending.extend(current)
+        else:
+            attributes = getattr(current, "__dict__", None)
+            if isinstance(attributes, dict):
+                pending.append(attributes)
+            for slot in getattr(type(current), "__slots__", ()):
+                if isinstance(slot, str) and hasattr(current, slot):
+                    pending.append(getattr(current, slot))
+    return {"bytes": total, "objects": len(seen), "truncated": truncated}
+
+
+def structures_report() -> List[Dict[str, Any]]:
+    """등록된 구조별 항목 수와 대략적인 크기 (큰 순서)"""
+    report = []
+    for name, getter in list(_structures.items()):
+        try:
+            obj = getter()
+            entries = len(obj) if hasattr(obj, "__len__") else None
+            report.append({"name": name, "entries": entries, **deep_sizeof(obj)})
+        except Exception as e:
+            report.append({"name": name, "error": str(e)})
+    return sorted(report, key=lambda item: item.get("bytes", 0), reverse=True)
+
+
+def temp_files_report() -> List[Dict[str, Any]]:
+    """등록된 임시 파일 패턴별 개수와 전체 크기"""
+    report = []
+    for name, pattern in list(_temp_files.items()):
+        files = glob.glob(pattern)
+        total = 0
+        for path in files:
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        report.append({"name": name, "pattern": pattern, "files": len(files), "bytes": total})
+    return report
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """프로세스 RSS와 최대 RSS (바이트, /proc이 없으면 최대 RSS만)"""
+    usage = {"rss": None, "peak_rss": None}
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    usage["rss"] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    usage["peak_rss"] = int(line.split()[1]) * 1024
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["peak_rss"] = peak if sys.platform == "darwin" else peak * 1024
+    return usage
+
+
+def _format_stats(stats, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        row = {"location": f"{frame.filename}:{frame.lineno}", "size": stat.size, "count": stat.count}
+        if hasattr(stat, "size_diff"):
+            row.update(size_diff=stat.size_diff, count_diff=stat.count_diff)
+        rows.append(row)
+    return rows
+
+
+class SnapshotStore:
+    """tracemalloc 시작/중지와 최근 스냅샷 보관 (ID로 상위 할당 위치 및 두 스냅샷 차이 조회)"""
+
+    def __init__(self, max_snapshots: int = MEMORY_MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshot_ids = list(self._snapshots)
+        return {"tracing": tracing, "traced_bytes": current, "traced_peak_bytes": peak, "snapshots": snapshot_ids}
+
+    def take(self, limit: int = 20) -> Dict[str, Any]:
+        """스냅샷을 찍어 보관하고 상위 할당 위치 반환 (추적 중이 아니면 ValueError)"""
+        if not tracemalloc.is_tracing():
+            raise ValueError("tracemalloc이 시작되지 않았습니다.")
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        snapshot_id = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+        with self._lock:
+            self._snapshots[snapshot_id] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return {"snapshot_id": snapshot_id, "top": _format_stats(snapshot.statistics("lineno"), limit)}
+
+    def diff(self, base_id: str, target_id: str, limit: int = 20) -> Optional[Dict[str, Any]]:
+        """두 스냅샷 사이 증가가 큰 할당 위치 (없는 ID면 None)"""
+        with self._lock:
+            base = self._snapshots.get(base_id)
+            target = self._snapshots.get(target_id)
+        if base is None or target is None:
+            return None
+        stats = target.compare_to(base, "lineno")
+        return {"base_id": base_id, "target_id": target_id,
+                "size_diff": sum(stat.size_diff for stat in stats), "top": _format_stats(stats, limit)}
+
+
+def memory_report() -> Dict[str, Any]:
+    """운영자용 전체 메모리 보고 (느릴 수 있으므로 스레드에서 호출)"""
+    return {
+        "process": process_memory(),
+        "structures": structures_report(),
+        "temp_files": temp_files_report(),
+        "tracemalloc": snapshot_store.status(),
+    }
+
+
+# 전역 스냅샷 저장소 인스턴스
+snapshot_store = SnapshotStore()
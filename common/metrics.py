@@ -0,0 +1,271 @@
+"""
+운영 지표 수집 (초등/중등/고등 및 루트 앱 공용)
+각 하위 앱이 전역 레지스트리에 지표를 기록하고, 루트 앱의 /metrics가 Prometheus 텍스트 형식으로 내보낸다.
+외부 라이브러리 없이 카운터, 게이지, 히스토그램만 구현한다.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 지연 시간용 기본 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+# LLM 호출용 구간 (초) - 짧은 목록 생성부터 긴 드림로직까지
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90)
+# PDF 크기용 구간 (바이트)
+SIZE_BUCKETS = (16_384, 65_536, 131_072, 262_144, 524_288, 1_048_576, 2_097_152, 5_242_880)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """라벨별 값을 보관하는 지표 공통 부분"""
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} 지표의 라벨은 {self.label_names}이어야 합니다: {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """증가만 하는 누적 값"""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """현재 값 (직접 설정하거나 수집 시점에 함수로 계산)"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, func: Callable[[], float], **labels) -> None:
+        """수집할 때마다 func()로 값을 계산 (세션 수처럼 이미 다른 곳에서 관리하는 값)"""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = func
+
+    def value(self, **labels) -> Optional[float]:
+        key = self._key(labels)
+        with self._lock:
+            func = self._functions.get(key)
+            value = self._values.get(key)
+        return float(func()) if func else value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, func in functions.items():
+            try:
+                values[key] = float(func())
+            except Exception as e:
+                print(f"⚠️ 지표 계산 실패 ({self.name}): {e}")
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """구간별 누적 개수와 합계 (Prometheus histogram)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), []))
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """이름 → 지표 저장소 (같은 이름으로 다시 등록하면 기존 지표 반환)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labels, buckets)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 지표 레지스트리 인스턴스
+metrics = MetricsRegistry()
+
+# LLM 호출
+LLM_REQUEST_SECONDS = metrics.histogram(
+    "llm_request_seconds", "LLM 호출 소요 시간", ("call_site", "model"), LLM_BUCKETS)
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total", "LLM 사용 토큰 수", ("call_site", "model", "kind"))
+LLM_ERRORS = metrics.counter(
+    "llm_errors_total", "LLM 호출 실패 수 (kind: timeout, error)", ("call_site", "model", "kind"))
+LLM_RETRIES = metrics.counter(
+    "llm_retries_total", "LLM 호출 재시도 수", ("call_site",))
+LLM_FALLBACKS = metrics.counter(
+    "llm_fallbacks_total", "LLM 대신 기본값으로 응답한 수 (reason: error, timeout, circuit_open, cached)", ("call_site", "reason"))
+LLM_AUDIT_RECORDS = metrics.counter(
+    "llm_audit_records_total", "LLM 감사 로그 기록 수 (result: written, dropped)", ("result",))
+LLM_HEDGES = metrics.counter(
+    "llm_hedges_total", "LLM 헤지 요청 수 (outcome: fired, won)", ("call_site", "outcome"))
+
+# 세션
+SESSIONS_LIVE = metrics.gauge(
+    "sessions_live", "메모리에 보관 중인 세션 수", ("school",))
+SESSIONS_EVICTED = metrics.counter(
+    "sessions_evicted_total", "만료 또는 개수 제한으로 제거된 세션 수", ("school",))
+
+# PDF
+PDF_RENDER_SECONDS = metrics.histogram(
+    "pdf_render_seconds", "PDF 렌더링 소요 시간", ("school",))
+PDF_SIZE_BYTES = metrics.histogram(
+    "pdf_size_bytes", "생성된 PDF 크기", ("school",), SIZE_BUCKETS)
+
+# 학생 진행 단계
+JOURNEY_STAGE_SECONDS = metrics.histogram(
+    "journey_stage_seconds", "단계별 시간 (kind: think 학생 생각, server 서버 처리, llm 그중 LLM 대기)",
+    ("school", "stage", "kind"), (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1800))
+
+# 캐시
+CACHE_REQUESTS = metrics.counter(
+    "cache_requests_total", "캐시 조회 수 (result: hit, miss)", ("cache", "result"))
+
+# HTTP 요청 및 이벤트 루프
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_seconds", "HTTP 요청 처리 시간 (app: 하위 앱 경로)", ("app", "method", "status"))
+EVENT_LOOP_LAG_SECONDS = metrics.histogram(
+    "event_loop_lag_seconds", "이벤트 루프 지연 (예정 시각보다 늦게 깨어난 시간)", (),
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+EVENT_LOOP_LAG_QUANTILE = metrics.gauge(
+    "event_loop_lag_recent_seconds", "최근 구간 이벤트 루프 지연 분위수", ("quantile",))
+EVENT_LOOP_BLOCKS = metrics.counter(
+    "event_loop_blocks_total", "임계값 이상 이벤트 루프가 멈춘 횟수")
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """캐시 조회 결과 기록"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+class timed:
+    """with 블록 소요 시간을 히스토그램에 기록"""
+
+    def __init__(self, histogram: Histogram, **labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
+        self.histogram.observe(self.elapsed, **self.labels)
+        return False
@@ -0,0 +1,41 @@
+"""
+OpenAI 클라이언트 지연 생성
+openai 패키지 import와 클라이언트 생성은 수백 ms가 걸리므로 모듈 import 시가 아니라
+클라이언트를 처음 실제로 사용할 때(첫 LLM 호출) 한 번만 수행한다.
+"""
+
+import threading
+from typing import Any, Optional
+
+
+class LazyOpenAIClient:
+    """첫 속성 접근 때 실제 OpenAI 클라이언트를 만드는 대리 객체 (OpenAI(...)와 같은 인자)"""
+
+    def __init__(self, **kwargs: Any):
+        self._kwargs = kwargs
+        self._client: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(**self._kwargs)
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+
+def warm_up_connection(client: Any, timeout: float = 5.0) -> bool:
+    """
+    LLM API 서버와 TLS 연결을 미리 맺어 클라이언트 연결 풀에 넣어 둠 (모델 목록 조회 1회, 재시도 없음)
+    인증 오류 등 HTTP 응답을 받았으면 연결은 이미 열렸으므로 성공으로 보고, 연결 자체가 실패하면 예외를 그대로 올림
+    """
+    try:
+        client.with_options(timeout=timeout, max_retries=0).models.list()
+    except Exception as e:
+        if getattr(e, "status_code", None) is None:
+            raise
+    return True
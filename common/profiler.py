@@ -0,0 +1,151 @@
+"""
+요청 단위 샘플링 프로파일러 (루트 앱 공용)
+운영자가 X-Profile 헤더(또는 profile=1 쿼리)로 요청하거나 경로별 비율로 무작위 선택된 요청에 대해,
+처리되는 동안 모든 스레드의 스택을 주기적으로 수집해 flame graph용 folded 형식 파일로 저장한다.
+대기 중인 스택도 함께 수집되므로 CPU 시간과 대기 시간(LLM 응답, 스레드 풀)이 같이 보인다.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 프로파일 저장 위치
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "eduvil_profiles"))
+# 스택 수집 간격 (초)
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+# 보관할 최대 프로파일 수 (오래된 것부터 삭제)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+# 경로 접두어별 무작위 프로파일 비율 (예: {"/high_school/career/flow": 0.01})
+PROFILE_SAMPLE_RATES: Dict[str, float] = json.loads(os.getenv("PROFILE_SAMPLE_RATES", "{}"))
+
+PROFILE_HEADER = "x-profile"
+# 이 디렉터리 아래 코드가 한 번도 나오지 않는 스택(유휴 스레드 등)은 버림
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+# 진단용 스레드는 수집하지 않음
+IGNORED_THREADS = ("request-profiler", "loop-watchdog")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(PROJECT_ROOT):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def fold_stack(frame) -> Optional[str]:
+    """바깥쪽 → 안쪽 순서의 folded 스택 문자열 (프로젝트 코드가 없으면 None)"""
+    labels: List[str] = []
+    in_project = False
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(PROJECT_ROOT):
+            in_project = True
+        labels.append(_frame_label(frame).replace(";", ","))
+        frame = frame.f_back
+    if not in_project:
+        return None
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """별도 스레드에서 interval마다 다른 모든 스레드의 스택을 수집"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if names.get(thread_id) in IGNORED_THREADS:
+                    continue
+                stack = fold_stack(frame)
+                if stack:
+                    self.samples[f"{names.get(thread_id, thread_id)};{stack}"] += 1
+
+
+class RequestProfiler:
+    """프로파일 대상 요청 선택, 수집기 실행, 결과 파일 관리 (동시에 한 요청만 프로파일)"""
+
+    def __init__(self, directory: str = PROFILE_DIR, sample_rates: Optional[Dict[str, float]] = None,
+                 interval: float = PROFILE_INTERVAL, max_files: int = PROFILE_MAX_FILES):
+        self.directory = Path(directory)
+        self.sample_rates = PROFILE_SAMPLE_RATES if sample_rates is None else sample_rates
+        self.interval = interval
+        self.max_files = max_files
+        self._busy = threading.Lock()
+
+    def reason(self, path: str, requested: bool, admin: bool) -> Optional[str]:
+        """이 요청을 프로파일할 이유 (운영자 요청 → requested, 무작위 선택 → sampled, 아니면 None)"""
+        if requested and admin:
+            return "requested"
+        prefixes = [prefix for prefix in self.sample_rates if path.startswith(prefix)]
+        if prefixes and random.random() < self.sample_rates[max(prefixes, key=len)]:
+            return "sampled"
+        return None
+
+    def start(self) -> Optional[StackSampler]:
+        """수집 시작 (다른 요청을 프로파일 중이면 None)"""
+        if not self._busy.acquire(blocking=False):
+            return None
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: StackSampler, reason: str, method: str, path: str) -> str:
+        """수집 종료 후 folded 형식 파일로 저장하고 프로파일 ID 반환"""
+        try:
+            samples = sampler.stop()
+        finally:
+            self._busy.release()
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:80] or "root"
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{reason}-{method}-{slug}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}" for stack, count in samples.most_common()]
+        (self.directory / f"{profile_id}.folded").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self._prune()
+        return profile_id
+
+    def list(self) -> List[Dict]:
+        """저장된 프로파일 목록 (최신순)"""
+        if not self.directory.exists():
+            return []
+        files = sorted(self.directory.glob("*.folded"), reverse=True)
+        return [{"profile_id": file.stem, "size": file.stat().st_size} for file in files]
+
+    def path_for(self, profile_id: str) -> Optional[Path]:
+        """프로파일 ID → 파일 경로 (없거나 잘못된 ID면 None)"""
+        if not re.fullmatch(r"[A-Za-z0-9_\-]+", profile_id):
+            return None
+        file = self.directory / f"{profile_id}.folded"
+        return file if file.exists() else None
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("*.folded"))
+        for file in files[:max(0, len(files) - self.max_files)]:
+            file.unlink(missing_ok=True)
+
+
+# 전역 요청 프로파일러 인스턴스
+request_profiler = RequestProfiler()
@@ -0,0 +1,117 @@
+"""
+점진적 응답 작업 관리 (초등/중등 공용)
+느린 AI 생성 결과를 기다리는 대신 기본 선택지를 먼저 돌려주고, 생성이 끝나면 폴링 또는 SSE로 전달한다.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .memory_report import register_structure
+
+# 완료된 결과를 보관하는 시간 (초)
+PROGRESSIVE_RESULT_TTL = int(os.getenv("PROGRESSIVE_RESULT_TTL", "600"))
+# SSE 연결에서 결과를 기다리는 최대 시간 (초)
+PROGRESSIVE_STREAM_TIMEOUT = float(os.getenv("PROGRESSIVE_STREAM_TIMEOUT", "60"))
+# SSE 연결 유지용 주석 전송 간격 (초)
+PROGRESSIVE_HEARTBEAT = float(os.getenv("PROGRESSIVE_HEARTBEAT", "10"))
+
+
+class PendingJob:
+    """백그라운드에서 생성 중인 결과 하나"""
+
+    def __init__(self, key: str, task: "asyncio.Task"):
+        self.token = uuid.uuid4().hex
+        self.key = key
+        self.task = task
+        self.created_at = time.time()
+
+    def status(self) -> Dict[str, Any]:
+        if not self.task.done():
+            return {"status": "pending"}
+        if self.task.cancelled() or self.task.exception() is not None:
+            return {"status": "failed"}
+        return {"status": "ready", "result": self.task.result()}
+
+
+class ProgressiveJobs:
+    """대기 토큰 → 생성 작업 저장소 (같은 키의 작업이 진행 중이면 재사용)"""
+
+    def __init__(self, ttl: int = PROGRESSIVE_RESULT_TTL):
+        self.ttl = ttl
+        self._jobs: Dict[str, PendingJob] = {}
+        self._lock = threading.Lock()
+
+    def start(self, key: str, func: Callable, *args, **kwargs) -> str:
+        """동기 생성 함수를 스레드에서 실행하고 대기 토큰 반환 (이벤트 루프 안에서 호출)"""
+        with self._lock:
+            self._prune()
+            for job in self._jobs.values():
+                if job.key == key and not job.task.done():
+                    return job.token
+            task = asyncio.get_running_loop().create_task(asyncio.to_thread(func, *args, **kwargs))
+            job = PendingJob(key, task)
+            self._jobs[job.token] = job
+            return job.token
+
+    def get(self, token: str) -> Optional[PendingJob]:
+        with self._lock:
+            return self._jobs.get(token)
+
+    async def wait(self, token: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """결과가 나올 때까지 최대 timeout초 대기 후 상태 반환 (없는 토큰이면 None)"""
+        job = self.get(token)
+        if job is None:
+            return None
+        try:
+            await asyncio.wait_for(asyncio.shield(job.task), timeout)
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            pass  # 실패 여부는 status()에서 확인
+        return job.status()
+
+    async def events(self, token: str, deliver: Callable[[Dict[str, Any]], Dict[str, Any]],
+                     timeout: float = PROGRESSIVE_STREAM_TIMEOUT,
+                     heartbeat: float = PROGRESSIVE_HEARTBEAT) -> AsyncIterator[str]:
+        """
+        SSE 이벤트 스트림: 기다리는 동안 연결 유지용 주석을 보내고, 결과가 나오면 deliver로 변환해 한 번 전송
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            status = await self.wait(token, min(heartbeat, max(0.0, deadline - time.monotonic())))
+            if status is None:
+                yield sse_event("failed", {"status": "unknown"})
+                return
+            if status["status"] != "pending":
+                data = deliver(status)
+                yield sse_event(data.get("status", status["status"]), data)
+                return
+            if time.monotonic() >= deadline:
+                yield sse_event("timeout", {"status": "pending"})
+                return
+            yield ": keep-alive\n\n"
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [token for token, job in self._jobs.items()
+                   if job.task.done() and now - job.created_at > self.ttl]
+        for token in expired:
+            del self._jobs[token]
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """SSE 이벤트 한 건 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# 전역 점진적 응답 작업 인스턴스
+progressive_jobs = ProgressiveJobs()
+register_structure("progressive.jobs", lambda: progressive_jobs._jobs)
@@ -0,0 +1,149 @@
+"""
+반 단위 진로 보고서 일괄 내보내기
+여러 세션의 PDF를 프로세스 풀에서 병렬로 렌더링하고, 완료되는 순서대로 ZIP으로 스트리밍한다.
+동시에 진행 중인 렌더링 수를 제한해 메모리 사용량이 학생 수에 비례해 늘어나지 않도록 한다.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 프로세스 풀 워커 수 (기본값: CPU 코어 수)
+EXPORT_WORKERS = int(os.getenv("REPORT_EXPORT_WORKERS", "0")) or (os.cpu_count() or 2)
+# 한 번에 내보낼 수 있는 최대 세션 수
+MAX_EXPORT_SESSIONS = int(os.getenv("REPORT_EXPORT_MAX_SESSIONS", "200"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_report_pool() -> ProcessPoolExecutor:
+    """보고서 렌더링용 프로세스 풀 (최초 사용 시 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 서버 프로세스의 스레드/이벤트 루프 상태를 복제하지 않도록 spawn 방식 사용
+            _pool = ProcessPoolExecutor(
+                max_workers=EXPORT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def reset_report_pool() -> None:
+    """워커가 비정상 종료되어 사용할 수 없게 된 풀 폐기 (다음 요청에서 새로 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def safe_entry_name(name: str) -> str:
+    """ZIP 항목 이름에 쓸 수 없는 문자 제거"""
+    name = re.sub(r'[\\/:*?"<>|\s]+', '_', name.strip())
+    return name.strip('_') or "student"
+
+
+class _ZipChunkWriter:
+    """ZipFile이 쓰는 바이트를 모아 두었다가 스트리밍 청크로 넘겨주는 쓰기 전용 버퍼"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportJob:
+    """내보내기 대상 한 건 (ZIP 항목 이름 + 렌더링 인자)"""
+
+    def __init__(self, entry_name: str, render_args: Dict, cached_pdf: Optional[bytes] = None):
+        self.entry_name = entry_name
+        self.render_args = render_args
+        self.cached_pdf = cached_pdf
+
+
+async def stream_reports_zip(jobs: Iterable[ExportJob], render_fn: Callable[[Dict], bytes],
+                             skipped: Optional[List[Tuple[str, str]]] = None,
+                             max_in_flight: Optional[int] = None) -> AsyncIterator[bytes]:
+    """PDF를 병렬 렌더링하면서 완료되는 대로 ZIP 청크를 반환
+
+    Args:
+        jobs: 내보낼 보고서 목록
+        render_fn: 프로세스 풀에서 실행할 모듈 수준 렌더링 함수 (render_args → PDF bytes)
+        skipped: 내보내지 못한 (세션 ID, 사유) 목록 - ZIP에 안내 파일로 포함
+        max_in_flight: 동시에 진행할 최대 렌더링 수 (기본: 워커 수 × 2)
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_report_pool()
+    max_in_flight = max_in_flight or EXPORT_WORKERS * 2
+
+    writer = _ZipChunkWriter()
+    # PDF는 이미 압축되어 있으므로 다시 압축하지 않음
+    archive = zipfile.ZipFile(writer, mode='w', compression=zipfile.ZIP_STORED)
+    failures: List[Tuple[str, str]] = list(skipped or [])
+    pending: Dict[asyncio.Future, ExportJob] = {}
+
+    def write_entry(job: ExportJob, pdf_content: bytes) -> None:
+        archive.writestr(job.entry_name, pdf_content)
+
+    async def collect(return_when) -> bytes:
+        done, _ = await asyncio.wait(list(pending), return_when=return_when)
+        for future in done:
+            job = pending.pop(future)
+            try:
+                write_entry(job, future.result())
+            except BrokenProcessPool:
+                reset_report_pool()
+                raise
+            except Exception as e:
+                failures.append((job.entry_name, str(e)))
+        return writer.drain()
+
+    try:
+        for job in jobs:
+            # 캐시에 이미 렌더링된 PDF가 있으면 바로 기록
+            if job.cached_pdf is not None:
+                write_entry(job, job.cached_pdf)
+                yield writer.drain()
+                continue
+
+            while len(pending) >= max_in_flight:
+                yield await collect(asyncio.FIRST_COMPLETED)
+
+            try:
+                future = asyncio.wrap_future(pool.submit(render_fn, job.render_args), loop=loop)
+            except BrokenProcessPool:
+                reset_report_pool()
+                raise
+            pending[future] = job
+
+        while pending:
+            yield await collect(asyncio.FIRST_COMPLETED)
+
+        if failures:
+            report = '\n'.join(f"{name}: {reason}" for name, reason in failures)
+            archive.writestr("내보내기_제외_목록.txt", report.encode('utf-8'))
+    finally:
+        # 클라이언트가 연결을 끊으면 남은 렌더링 취소
+        for future in pending:
+            future.cancel()
+        archive.close()
+
+    yield writer.drain()
@@ -0,0 +1,96 @@
+"""
+요청별 처리 단계 시간 측정 (Server-Timing 헤더 및 구조화 로그)
+루트 앱 미들웨어가 요청마다 기록 공간을 열고, 각 하위 앱은 span()으로 단계(llm, pdf_build,
+template_render, session_io, serialize) 시간을 더한다. 요청 밖(백그라운드 작업 등)에서는 아무 일도 하지 않는다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+
+# Server-Timing 헤더 및 요청별 로그 사용 여부
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "1") == "1"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """요청 하나의 단계별 누적 시간 (스레드에서 실행되는 단계도 같은 객체에 기록)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.phases.setdefault(phase, {"ms": 0.0, "count": 0})
+            entry["ms"] += seconds * 1000
+            entry["count"] += 1
+
+    def phase_seconds(self, phase: str) -> float:
+        """지금까지 phase 단계에 쓴 시간 (초)"""
+        with self._lock:
+            return self.phases.get(phase, {}).get("ms", 0.0) / 1000
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def header_value(self) -> str:
+        """Server-Timing 헤더 값 (단계별 합계 + 전체 시간)"""
+        with self._lock:
+            phases = sorted(self.phases.items())
+        parts = [f'{phase};desc="x{entry["count"]}";dur={entry["ms"]:.1f}' for phase, entry in phases]
+        parts.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(parts)
+
+    def log(self, method: str, path: str, status: int) -> None:
+        """요청 한 건의 구조화 로그 (JSON 한 줄)"""
+        with self._lock:
+            phases = {phase: {"ms": round(entry["ms"], 1), "count": entry["count"]}
+                      for phase, entry in self.phases.items()}
+        logger.info(json.dumps({
+            "event": "server_timing", "method": method, "path": path, "status": status,
+            "total_ms": round(self.elapsed_ms(), 1), "phases": phases,
+        }, ensure_ascii=False))
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("server_timing", default=None)
+
+
+def start_request() -> RequestTimings:
+    """현재 요청의 기록 공간 생성 (루트 앱 미들웨어에서 호출)"""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+class span:
+    """with 블록 시간을 현재 요청의 phase 단계에 더함"""
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def __enter__(self):
+        self.timings = _current.get()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timings is not None:
+            self.timings.add(self.phase, time.perf_counter() - self.started)
+        return False
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON 직렬화 시간을 serialize 단계로 기록하는 응답 (하위 앱 기본 응답 클래스)"""
+
+    def render(self, content) -> bytes:
+        with span("serialize"):
+            return super().render(content)
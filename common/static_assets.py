@@ -0,0 +1,280 @@
+"""
+정적 파일 빌드 및 서빙 (루트 앱, 하위 앱 공용)
+배포 시 `python -m common.static_assets`로 각 static 폴더를 빌드하면 옆의 static_build 폴더에
+공백을 줄인 파일, 내용 해시가 붙은 파일(style.1a2b3c4d.css), gzip/brotli로 미리 압축한 파일과 manifest.json을 만든다.
+HTML 안의 CSS/JS 경로는 해시가 붙은 경로로 바꾸며, 백업 파일(*_backup.*, *_broken.* 등)은 빌드에서 제외한다.
+
+PrecompressedStaticFiles는 빌드 결과가 있으면 그 폴더를, 없거나 원본보다 오래됐으면 원본 폴더를 서빙한다.
+요청의 Accept-Encoding에 맞춰 미리 압축한 파일을 보내고, 해시가 붙은 파일은 1년 immutable, 나머지는 no-cache(ETag 재검증)로 캐시한다.
+brotli 패키지가 없으면 gzip만 만든다.
+"""
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# 프로젝트의 static 폴더와 서빙 경로 (빌드 대상)
+STATIC_SITES = (
+    ("static", "/static"),
+    ("elementary_school/static", "/elementary_school/static"),
+    ("middle_school/static", "/middle_school/static"),
+    ("high_school/static", "/high_school/static"),
+    ("app1/static", "/app1/static"),
+    ("app2/static", "/app2/static"),
+)
+
+MANIFEST_NAME = "manifest.json"
+# 빌드에서 제외할 파일 (백업, 임시 파일)
+EXCLUDED_PATTERNS = ("*_backup.*", "*_broken.*", "*.bak", "*.orig", "*~", ".*")
+# 미리 압축할 파일 형식과 최소 크기 (바이트, 이보다 작으면 압축 이득이 거의 없음)
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".json", ".svg", ".txt", ".xml", ".map"}
+COMPRESS_MIN_BYTES = 512
+# Accept-Encoding 선호 순서 (확장자)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_AROUND = re.compile(r"\s*([{};,>])\s*")
+_CSS_AFTER_COLON = re.compile(r":\s+")
+_BACKTICK = re.compile(r"(?<!\\)`")
+_PRESERVE_OPEN = re.compile(r"<(pre|textarea)\b", re.I)
+_PRESERVE_CLOSE = re.compile(r"</(pre|textarea)>", re.I)
+
+
+def minify_css(text: str) -> str:
+    """주석 제거, 괄호·구분자 주변 공백 제거"""
+    text = _CSS_COMMENT.sub("", text)
+    text = _CSS_AROUND.sub(r"\1", text)
+    text = _CSS_AFTER_COLON.sub(":", text)
+    return re.sub(r"\s+", " ", text).replace(";}", "}").strip()
+
+
+def minify_lines(text: str) -> str:
+    """
+    JS/HTML 들여쓰기와 빈 줄 제거 (줄바꿈은 유지해 세미콜론 자동 삽입이 그대로 동작)
+    템플릿 문자열(`...`)과 <pre>/<textarea> 안의 줄은 공백이 내용이므로 그대로 둠
+    """
+    lines: List[str] = []
+    in_template = in_preserved = False
+    for line in text.splitlines():
+        opens_template = len(_BACKTICK.findall(line)) % 2 == 1
+        if in_template or in_preserved:
+            lines.append(line)
+        else:
+            # 템플릿 문자열이 이 줄에서 시작하면 뒤쪽 공백은 내용일 수 있음
+            stripped = line.lstrip() if opens_template else line.strip()
+            if stripped:
+                lines.append(stripped)
+        if opens_template:
+            in_template = not in_template
+        if _PRESERVE_OPEN.search(line) and not _PRESERVE_CLOSE.search(line):
+            in_preserved = True
+        elif in_preserved and _PRESERVE_CLOSE.search(line):
+            in_preserved = False
+    return "\n".join(lines) + "\n"
+
+
+def _is_excluded(name: str) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in EXCLUDED_PATTERNS)
+
+
+def _fingerprinted(relative: str, data: bytes) -> str:
+    """내용 해시를 붙인 파일 경로 (style.css → style.1a2b3c4d.css)"""
+    path = Path(relative)
+    digest = hashlib.sha256(data).hexdigest()[:8]
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}")).replace(os.sep, "/")
+
+
+def _rewrite_references(text: str, url_prefix: str, assets: Dict[str, str]) -> str:
+    """'{url_prefix}/style.css'(?v=... 포함) 참조를 해시가 붙은 경로로 변경"""
+    for original, fingerprinted in assets.items():
+        pattern = re.compile(re.escape(f"{url_prefix}/{original}") + r"(\?v=[^\"'()\s]*)?(?=[\"'()\s])")
+        text = pattern.sub(f"{url_prefix}/{fingerprinted}", text)
+    return text
+
+
+def _compressed(data: bytes) -> Dict[str, bytes]:
+    """압축해서 더 작아지는 형식만 반환 (gzip은 항상, brotli는 패키지가 있을 때)"""
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+def build_site(source_dir: Path, url_prefix: str, build_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """static 폴더 하나를 빌드하고 크기 요약 반환 (임시 폴더에 만든 뒤 교체)"""
+    source_dir = Path(source_dir)
+    build_dir = Path(build_dir) if build_dir else default_build_dir(source_dir)
+    sources: Dict[str, bytes] = {}
+    for path in sorted(source_dir.rglob("*")):
+        relative = path.relative_to(source_dir)
+        if path.is_file() and not any(_is_excluded(part) for part in relative.parts):
+            sources[str(relative).replace(os.sep, "/")] = path.read_bytes()
+
+    # CSS → JS → HTML 순서로 처리해 앞에서 만든 해시 경로로 참조를 바꿈
+    order = {".css": 1, ".js": 2, ".html": 3}
+    outputs: Dict[str, bytes] = {}
+    assets: Dict[str, str] = {}
+    for relative in sorted(sources, key=lambda name: (order.get(Path(name).suffix, 0), name)):
+        data = sources[relative]
+        suffix = Path(relative).suffix
+        if suffix in (".css", ".js", ".html"):
+            text = _rewrite_references(data.decode("utf-8"), url_prefix, assets)
+            text = minify_css(text) if suffix == ".css" else minify_lines(text)
+            data = text.encode("utf-8")
+        outputs[relative] = data
+        # HTML은 고정 주소로 접근하는 페이지라 해시를 붙이지 않음
+        if suffix != ".html":
+            assets[relative] = _fingerprinted(relative, data)
+            outputs[assets[relative]] = data
+
+    temp_dir = build_dir.with_name(build_dir.name + ".tmp")
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    encodings: Dict[str, List[str]] = {}
+    summary = {"files": len(sources), "source_bytes": sum(map(len, sources.values())),
+               "minified_bytes": 0, "gzip_bytes": 0, "br_bytes": 0}
+    for relative, data in outputs.items():
+        target = temp_dir / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        variants = _compressed(data) if Path(relative).suffix in COMPRESSIBLE_SUFFIXES and len(data) >= COMPRESS_MIN_BYTES else {}
+        for encoding, extension in ENCODINGS:
+            if encoding in variants:
+                target.with_name(target.name + extension).write_bytes(variants[encoding])
+        if variants:
+            encodings[relative] = sorted(variants)
+        # 요약은 원본 이름 기준 (해시 복사본은 같은 내용이라 제외)
+        if relative in sources:
+            summary["minified_bytes"] += len(data)
+            summary["gzip_bytes"] += len(variants.get("gzip", data))
+            summary["br_bytes"] += len(variants.get("br", variants.get("gzip", data)))
+
+    manifest = {"built_at": time.time(), "url_prefix": url_prefix, "assets": assets, "encodings": encodings}
+    (temp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    if build_dir.exists():
+        if not (build_dir / MANIFEST_NAME).exists():
+            raise RuntimeError(f"빌드 폴더가 아닌 폴더를 덮어쓸 수 없습니다: {build_dir}")
+        shutil.rmtree(build_dir)
+    temp_dir.rename(build_dir)
+    return summary
+
+
+def default_build_dir(source_dir: Path) -> Path:
+    """static → static_build (같은 상위 폴더)"""
+    source_dir = Path(source_dir)
+    return source_dir.with_name(source_dir.name + "_build")
+
+
+def _newest_source_mtime(source_dir: Path) -> float:
+    newest = 0.0
+    for root, _, files in os.walk(source_dir):
+        for name in files:
+            if not _is_excluded(name):
+                newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+    return newest
+
+
+def _accepted_encodings(header: str) -> Set[str]:
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 목록"""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = params.strip()
+        if name and not (quality.startswith("q=") and float(quality[2:] or 0) == 0):
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """빌드 결과(static_build)를 미리 압축한 파일과 캐시 헤더로 서빙 (빌드 전에는 원본 폴더 서빙)"""
+
+    def __init__(self, directory, build_dir=None, check_dir: bool = True, **kwargs):
+        source_dir = Path(directory)
+        build_dir = Path(build_dir) if build_dir else default_build_dir(source_dir)
+        manifest_path = build_dir / MANIFEST_NAME
+        self.manifest: Dict[str, Any] = {}
+        if manifest_path.exists():
+            if source_dir.exists() and _newest_source_mtime(source_dir) > manifest_path.stat().st_mtime:
+                print(f"⚠️ 정적 파일 빌드가 원본보다 오래되어 원본을 서빙합니다: {build_dir} (python -m common.static_assets)")
+            else:
+                self.manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        self.built = bool(self.manifest)
+        self.immutable: Set[str] = set(self.manifest.get("assets", {}).values())
+        self.encodings: Dict[str, List[str]] = self.manifest.get("encodings", {})
+        super().__init__(directory=build_dir if self.built else source_dir, check_dir=check_dir, **kwargs)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        response = self._negotiated_response(full_path, stat_result, relative, request_headers, status_code)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE if relative in self.immutable else REVALIDATE_CACHE
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _negotiated_response(self, full_path, stat_result: os.stat_result, relative: str,
+                             request_headers: Headers, status_code: int) -> Response:
+        available = self.encodings.get(relative)
+        if not available:
+            return FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        for encoding, extension in ENCODINGS:
+            if encoding in available and encoding in accepted:
+                variant = f"{full_path}{extension}"
+                return FileResponse(variant, status_code=status_code, stat_result=os.stat(variant), media_type=media_type,
+                                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+        return FileResponse(full_path, status_code=status_code, stat_result=stat_result,
+                            headers={"Vary": "Accept-Encoding"})
+
+    def page(self, request: Request, name: str = "index.html") -> Response:
+        """고정 주소 페이지(index.html 등) 응답 (앱 라우트에서 사용)"""
+        full_path, stat_result = self.lookup_path(name)
+        if stat_result is None:
+            raise HTTPException(status_code=404)
+        return self.file_response(full_path, stat_result, request.scope)
+
+
+def build_all(sites: Tuple[Tuple[str, str], ...] = STATIC_SITES) -> Dict[str, Dict[str, Any]]:
+    """프로젝트의 모든 static 폴더 빌드"""
+    return {source: build_site(ROOT_DIR / source, url_prefix) for source, url_prefix in sites
+            if (ROOT_DIR / source).is_dir()}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="정적 파일 빌드 (공백 제거, 해시 경로, gzip/brotli 미리 압축)")
+    parser.parse_args(argv)
+    if brotli is None:
+        print("⚠️ brotli 패키지가 없어 gzip만 만듭니다. (pip install brotli)")
+    for source, summary in build_all().items():
+        print(f"📦 {source}: 파일 {summary['files']}개, 원본 {summary['source_bytes'] / 1024:.1f}KiB → "
+              f"공백 제거 {summary['minified_bytes'] / 1024:.1f}KiB, gzip {summary['gzip_bytes'] / 1024:.1f}KiB, "
+              f"brotli {summary['br_bytes'] / 1024:.1f}KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+서버 시작 시 하위 앱 예열 및 준비 상태 (루트 앱 lifespan 공용)
+마운트한 하위 앱은 자체 startup 이벤트가 실행되지 않으므로, 루트 앱 lifespan이 백그라운드 스레드에서 하위 앱을
+차례로 불러오고 각 모듈의 warm_up()(폰트 등록, 템플릿 컴파일, LLM 연결 등)을 실행한다.
+예열이 끝날 때까지 준비 상태(/ready)는 503을 반환해 로드밸런서가 예열된 워커로만 요청을 보내게 한다.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+# 서버 시작 시 하위 앱 예열 여부 (끄면 첫 요청 때 불러오고 바로 준비 상태로 보고)
+WARMUP_ENABLED = os.getenv("WARMUP", "1") == "1"
+# 예열 시 LLM API 연결을 미리 맺을지 여부와 연결 제한 시간 (초)
+LLM_WARMUP_ENABLED = os.getenv("LLM_WARMUP", "1") == "1"
+LLM_WARMUP_TIMEOUT = float(os.getenv("LLM_WARMUP_TIMEOUT", "5"))
+
+
+def run_steps(steps: Dict[str, Callable[[], Any]]) -> Dict[str, Dict[str, Any]]:
+    """예열 단계를 순서대로 실행하고 단계별 소요 시간과 오류 반환 (한 단계가 실패해도 나머지는 계속)"""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, step in steps.items():
+        started = time.perf_counter()
+        try:
+            step()
+            results[name] = {"ms": round((time.perf_counter() - started) * 1000, 1)}
+        except Exception as e:
+            print(f"⚠️ 예열 실패 ({name}): {e}")
+            results[name] = {"ms": round((time.perf_counter() - started) * 1000, 1), "error": type(e).__name__}
+    return results
+
+
+class WarmUp:
+    """하위 앱 예열 진행 상태"""
+
+    def __init__(self, sub_apps: Dict[str, Any], enabled: bool = WARMUP_ENABLED):
+        self.sub_apps = sub_apps
+        self.enabled = enabled
+        self.ready = not enabled
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    async def run(self) -> None:
+        """모든 하위 앱 예열 (이벤트 루프를 막지 않도록 별도 스레드에서 실행)"""
+        if self.ready:
+            return
+        await asyncio.to_thread(self._run)
+
+    def _run(self) -> None:
+        self.started_at = time.time()
+        started = time.perf_counter()
+        for name, sub_app in self.sub_apps.items():
+            load_started = time.perf_counter()
+            try:
+                steps = sub_app.warm_up()
+                self.results[name] = {"load_ms": round(sub_app.load_seconds * 1000, 1), "steps": steps}
+            except Exception as e:
+                print(f"❌ 하위 앱 예열 실패 ({name}): {e}")
+                self.results[name] = {"load_ms": round((time.perf_counter() - load_started) * 1000, 1),
+                                      "error": type(e).__name__}
+        self.seconds = time.perf_counter() - started
+        self.ready = True
+        print(f"🔥 하위 앱 예열 완료 ({self.seconds * 1000:.0f}ms)")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming",
+            "warmup_enabled": self.enabled,
+            "warmup_ms": None if self.seconds is None else round(self.seconds * 1000, 1),
+            "sub_apps": self.results,
+        }
@@ -5,7 +5,13 @@
 import uuid
 import random
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, List
+
+from common.dream_logic import parse_dream_logic
+from common.memory_report import register_structure
+from common.metrics import SESSIONS_LIVE
+from common.server_timing import span
+
 from .models import (
     CareerStage, CareerExplorationSession, StudentInfo, StepResponse,
     StageQuestionResponse, STAGE_QUESTIONS, ENCOURAGEMENT_MESSAGES,
@@ -33,12 +39,14 @@ class CareerExplorationService:
             updated_at=now
         )
         
-        self.sessions[session_id] = session
+        with span("session_io"):
+            self.sessions[session_id] = session
         return session_id
     
     def get_session(self, session_id: str) -> Optional[CareerExplorationSession]:
         """세션 조회"""
-        return self.sessions.get(session_id)
+        with span("session_io"):
+            return self.sessions.get(session_id)
     
     def get_current_question(self, session_id: str) -> Optional[StageQuestionResponse]:
         """현재 단계의 질문 조회"""
@@ -289,6 +297,15 @@ class CareerExplorationService:
             return False
         return session.career_confirmed
     
+    def find_sessions_by_class_tag(self, class_tag: str) -> List[CareerExplorationSession]:
+        """반 태그로 세션 목록 조회 (생성 순)"""
+        class_tag = class_tag.strip()
+        sessions = [
+            session for session in self.sessions.values()
+            if session.student_info and (session.student_info.class_tag or '').strip() == class_tag
+        ]
+        return sorted(sessions, key=lambda session: session.created_at)
+    
     def set_dream_logic(self, session_id: str, dream_logic: str) -> bool:
         """드림로직 저장"""
         session = self.get_session(session_id)
@@ -296,9 +313,12 @@ class CareerExplorationService:
             return False
         
         session.dream_logic = dream_logic
+        session.dream_logic_tree = parse_dream_logic(dream_logic)
         session.updated_at = datetime.now().isoformat()
         self.sessions[session_id] = session
         return True
 
 # 전역 서비스 인스턴스
-career_service = CareerExplorationService()
\ No newline at end of file
+career_service = CareerExplorationService()
+SESSIONS_LIVE.set_function(lambda: len(career_service.sessions), school="elementary")
+register_structure("elementary.sessions", lambda: career_service.sessions)
\ No newline at end of file
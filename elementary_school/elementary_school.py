@@ -11,11 +11,10 @@ app.add_middleware(
 
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse, FileResponse, Response
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 import uvicorn
@@ -25,11 +24,20 @@ import logging
 # 진로 탐색 관련 imports
 from .models import (
     StudentInfo, StepResponse, NextStageRequest, ApiResponse,
-    CareerStage, StageQuestionResponse, CareerRecommendationResponse
+    CareerStage, StageQuestionResponse, CareerRecommendationResponse, BatchReportRequest
 )
 from .career_service import career_service
 from .openai_service import ai_service
-from .pdf_generator import ElementaryCareerPDFGenerator
+from .pdf_generator import pdf_generator, render_report_in_worker
+from common.dream_logic import ensure_dream_logic_tree, get_goal_section, replace_goal_section
+from common.report_export import ExportJob, MAX_EXPORT_SESSIONS, safe_entry_name, stream_reports_zip
+from common.journey import mark_stage
+from common.progressive import progressive_jobs
+from common.memory_report import register_structure
+from common.openai_client import warm_up_connection
+from common.server_timing import TimedJSONResponse
+from common.static_assets import PrecompressedStaticFiles
+from common.warmup import LLM_WARMUP_ENABLED, LLM_WARMUP_TIMEOUT, run_steps
 
 # 추가 요청 모델
 class RecommendationRequest(BaseModel):
@@ -47,6 +55,7 @@ class Step4IssueRequest(BaseModel):
     """Step 4 이슈 생성 요청"""
     session_id: str
     regenerate: Optional[bool] = False
+    progressive: Optional[bool] = False  # AI 생성을 기다리지 않고 기본/기존 이슈를 먼저 반환
 
 class Step4IssueResponse(BaseModel):
     """Step 4 이슈 응답"""
@@ -63,7 +72,8 @@ app = FastAPI(
     description="초등학교 관련 서비스를 위한 백엔드 API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=TimedJSONResponse
 )
 
 # CORS 설정
@@ -82,8 +92,10 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 static_dir = current_dir / "static"
 
+# 빌드된 정적 파일 (미리 압축 + 캐시 헤더, 빌드 전에는 원본 폴더)
+static_files = PrecompressedStaticFiles(static_dir, check_dir=False)
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    app.mount("/static", static_files, name="static")
     logger.info(f"Static files mounted from: {static_dir}")
 else:
     logger.warning(f"Static directory not found: {static_dir}")
@@ -110,6 +122,7 @@ class ResponseModel(BaseModel):
 
 # 임시 데이터베이스 (실제 프로젝트에서는 실제 DB 사용)
 fake_students_db = []
+register_structure("elementary.fake_students_db", lambda: fake_students_db)
 student_id_counter = 1
 
 # 의존성 함수들
@@ -130,9 +143,9 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 # 라우터들
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """메인 페이지"""
-    return FileResponse(static_dir / "index.html")
+    return static_files.page(request)
 
 @app.get("/api", response_model=ResponseModel)
 async def api_root():
@@ -223,6 +236,7 @@ async def start_career_exploration():
     """진로 탐색 세션 시작"""
     try:
         session_id = career_service.create_session()
+        mark_stage("elementary", session_id, "start")
         
         return ApiResponse(
             success=True,
@@ -268,6 +282,7 @@ async def submit_response(session_id: str, request: NextStageRequest):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, getattr(session.current_stage, "value", "done"))
         
         # 응답 제출
         success, message, next_stage = career_service.submit_response(
@@ -376,7 +391,8 @@ async def get_session_data(session_id: str):
                 "student_info": session.student_info.model_dump() if session.student_info else None,
                 "responses": session.responses,
                 "final_recommendation": session.ai_career_recommendation,
-                "dream_logic": session.dream_logic
+                "dream_logic": session.dream_logic,
+                "dream_logic_tree": session.dream_logic_tree.dict() if session.dream_logic_tree else None
             }
         )
     except HTTPException:
@@ -419,6 +435,7 @@ async def get_career_recommendation(session_id: str, request: RecommendationRequ
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "recommend")
         
         # 4단계까지 완료 확인
         if not career_service.is_ready_for_step5(session_id):
@@ -458,6 +475,7 @@ async def accept_career_recommendation(session_id: str):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "recommend_accept")
         
         if session.current_stage != CareerStage.STEP_5:
             raise HTTPException(status_code=400, detail="5단계 상태가 아닙니다.")
@@ -499,6 +517,7 @@ async def create_dream_logic(session_id: str):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "dream_logic")
         
         if not session.career_confirmed or not session.final_career_goal:
             raise HTTPException(status_code=400, detail="진로가 확정되지 않았습니다.")
@@ -513,12 +532,14 @@ async def create_dream_logic(session_id: str):
         
         # 세션에 드림로직 저장
         career_service.set_dream_logic(session_id, dream_logic)
+        dream_logic_tree = career_service.get_session(session_id).dream_logic_tree
         
         return ApiResponse(
             success=True,
             message="드림로직이 성공적으로 생성되었습니다!",
             data={
                 "dream_logic": dream_logic,
+                "dream_logic_tree": dream_logic_tree.dict() if dream_logic_tree else None,
                 "student_name": student_name,
                 "final_career": session.final_career_goal
             }
@@ -530,6 +551,53 @@ async def create_dream_logic(session_id: str):
         logger.error(f"드림로직 생성 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="드림로직 생성에 실패했습니다.")
 
+@app.post("/career/{session_id}/dream-logic/goals/{goal_number}/regenerate", response_model=ApiResponse)
+async def regenerate_dream_logic_goal(session_id: str, goal_number: int):
+    """드림로직 중간목표 하나만 다시 생성 (나머지 계획은 그대로 유지)"""
+    try:
+        if not ai_service:
+            raise HTTPException(status_code=503, detail="AI 서비스를 사용할 수 없습니다.")
+        
+        session = career_service.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "dream_logic_goal")
+        
+        if not session.dream_logic:
+            raise HTTPException(status_code=400, detail="드림로직이 아직 생성되지 않았습니다.")
+        
+        if get_goal_section(session.dream_logic, goal_number) is None:
+            raise HTTPException(status_code=404, detail=f"중간목표{goal_number}을(를) 찾을 수 없습니다.")
+        
+        student_name = session.student_info.name if session.student_info else "친구"
+        section = ai_service.regenerate_dream_logic_section(
+            student_name, session.final_career_goal or "", session.dream_logic, goal_number
+        )
+        if not section:
+            raise HTTPException(status_code=500, detail="중간목표 재생성에 실패했습니다.")
+        
+        # 새 섹션을 저장된 드림로직에 끼워 넣고 트리도 다시 파싱
+        dream_logic = replace_goal_section(session.dream_logic, goal_number, section)
+        career_service.set_dream_logic(session_id, dream_logic)
+        dream_logic_tree = career_service.get_session(session_id).dream_logic_tree
+        
+        return ApiResponse(
+            success=True,
+            message=f"중간목표{goal_number}을(를) 새로 만들었습니다!",
+            data={
+                "goal_number": goal_number,
+                "section": section,
+                "dream_logic": dream_logic,
+                "dream_logic_tree": dream_logic_tree.dict() if dream_logic_tree else None
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"드림로직 부분 재생성 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="중간목표 재생성에 실패했습니다.")
+
 @app.get("/career/{session_id}/download-pdf")
 async def download_dream_logic_pdf(session_id: str):
     """드림로직 PDF 다운로드"""
@@ -538,6 +606,7 @@ async def download_dream_logic_pdf(session_id: str):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "dream_logic_pdf")
         
         if not session.dream_logic:
             raise HTTPException(status_code=400, detail="드림로직이 생성되지 않았습니다.")
@@ -559,6 +628,122 @@ async def download_dream_logic_pdf(session_id: str):
         logger.error(f"PDF 다운로드 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="PDF 다운로드에 실패했습니다.")
 
+def _session_report_args(session) -> Dict:
+    """세션에 저장된 내용으로 PDF 보고서 생성 인자 구성 (캐시 키와 ETag도 이 인자로 계산)"""
+    encouragement = ""
+    if session.dream_logic:
+        encouragement = ensure_dream_logic_tree(session.dream_logic, session.dream_logic_tree).encouragement
+    return {
+        "student_name": session.student_info.name if session.student_info else "학생",
+        "responses": {stage: response.dict() for stage, response in session.responses.items()},
+        "final_recommendation": session.final_career_goal or session.ai_career_recommendation or "",
+        "dream_logic_result": session.dream_logic,
+        "encouragement_message": encouragement
+    }
+
+@app.get("/career/{session_id}/report.pdf")
+async def download_session_report_pdf(session_id: str, request: Request):
+    """저장된 세션으로 진로 탐색 결과 PDF 생성 (클라이언트 재전송 불필요)"""
+    try:
+        # 세션 상태 확인
+        session = career_service.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "report_pdf")
+        
+        if not session.dream_logic:
+            raise HTTPException(status_code=400, detail="드림로직이 생성되지 않았습니다.")
+        
+        student_name = session.student_info.name if session.student_info else "학생"
+        report_args = _session_report_args(session)
+        
+        # 내용이 바뀌지 않았으면 렌더링 없이 304 응답
+        etag = f'"{pdf_generator.report_cache_key(**report_args)}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+        
+        pdf_content, _ = pdf_generator.generate_career_report_cached(
+            **report_args, dream_logic_tree=session.dream_logic_tree
+        )
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{student_name}_진로탐색결과_웹스타일_{timestamp}.pdf"
+        
+        from urllib.parse import quote
+        encoded_filename = quote(filename.encode('utf-8'))
+        
+        return Response(
+            content=pdf_content,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}",
+                **cache_headers
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"세션 PDF 생성 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="PDF 생성에 실패했습니다.")
+
+@app.post("/career/reports/export", dependencies=[Depends(get_current_user)])
+async def export_class_reports(request: BatchReportRequest):
+    """반 단위 진로 탐색 결과 PDF 일괄 내보내기 (ZIP 스트리밍, 교사 인증 필요)"""
+    try:
+        if request.session_ids:
+            sessions = [(session_id, career_service.get_session(session_id)) for session_id in request.session_ids]
+        elif request.class_tag:
+            sessions = [(session.session_id, session) for session in career_service.find_sessions_by_class_tag(request.class_tag)]
+        else:
+            raise HTTPException(status_code=400, detail="세션 ID 목록 또는 반 태그를 입력해주세요.")
+        
+        if len(sessions) > MAX_EXPORT_SESSIONS:
+            raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_EXPORT_SESSIONS}명까지 내보낼 수 있습니다.")
+        
+        jobs = []
+        skipped = []
+        for session_id, session in sessions:
+            if not session:
+                skipped.append((session_id, "세션을 찾을 수 없습니다."))
+                continue
+            if not session.dream_logic:
+                skipped.append((session_id, "드림로직이 생성되지 않았습니다."))
+                continue
+            
+            report_args = _session_report_args(session)
+            entry_name = f"{safe_entry_name(report_args['student_name'])}_{session_id[:8]}_진로탐색결과_웹스타일.pdf"
+            cached_pdf = pdf_generator.get_cached_report(pdf_generator.report_cache_key(**report_args))
+            jobs.append(ExportJob(
+                entry_name,
+                {**report_args, "dream_logic_tree": session.dream_logic_tree},
+                cached_pdf=cached_pdf
+            ))
+        
+        if not jobs:
+            raise HTTPException(status_code=404, detail="내보낼 수 있는 진로 탐색 결과가 없습니다.")
+        
+        logger.info(f"보고서 일괄 내보내기 시작: {len(jobs)}건 (제외 {len(skipped)}건)")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{safe_entry_name(request.class_tag or '선택학생')}_진로탐색결과_웹스타일_{timestamp}.zip"
+        
+        from urllib.parse import quote
+        encoded_filename = quote(filename.encode('utf-8'))
+        
+        return StreamingResponse(
+            stream_reports_zip(jobs, render_report_in_worker, skipped=skipped),
+            media_type="application/zip",
+            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"보고서 일괄 내보내기 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="보고서 일괄 내보내기에 실패했습니다.")
+
 @app.post("/career/{session_id}/modify-recommendation", response_model=ApiResponse)
 async def modify_career_recommendation(session_id: str, modification_request: str):
     """진로 추천 수정 요청 (5-1 루프)"""
@@ -570,6 +755,7 @@ async def modify_career_recommendation(session_id: str, modification_request: st
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "recommend_modify")
         
         if session.current_stage != CareerStage.STEP_5:
             raise HTTPException(status_code=400, detail="5단계 상태가 아닙니다.")
@@ -754,6 +940,7 @@ async def generate_step4_issues(session_id: str, request: Step4IssueRequest):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, "step_4_issues")
         
         # 1~3단계 완료 확인
         required_stages = [CareerStage.STEP_1, CareerStage.STEP_2, CareerStage.STEP_3]
@@ -769,6 +956,9 @@ async def generate_step4_issues(session_id: str, request: Step4IssueRequest):
         student_name = session.student_info.name if session.student_info else "친구"
         responses_dict = {stage: response.dict() for stage, response in session.responses.items() if stage in required_stages}
         
+        if request.progressive:
+            return _start_progressive_step4_issues(session_id, session, student_name, responses_dict, request.regenerate or False)
+        
         issues = ai_service.generate_step4_issues(
             student_name=student_name,
             responses=responses_dict,
@@ -803,6 +993,108 @@ async def generate_step4_issues(session_id: str, request: Step4IssueRequest):
         logger.error(f"Step 4 이슈 생성 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="이슈 생성에 실패했습니다.")
 
+def _start_progressive_step4_issues(session_id: str, session, student_name: str, responses_dict: Dict, regenerate: bool) -> ApiResponse:
+    """
+    Step 4 점진적 응답: 지금 보여줄 이슈(기존 이슈 또는 기본 이슈)를 바로 반환하고 AI 생성은 백그라운드로 진행
+    생성된 이슈는 폴링/SSE로 전달될 때 세션에 반영됨
+    """
+    shown = getattr(session, 'step4_ai_issues', None)
+    if not shown:
+        shown = ai_service._get_fallback_step4_issues(student_name)
+        session.step4_ai_issues = shown
+        session.step4_regeneration_count = getattr(session, 'step4_regeneration_count', 0)
+        career_service.sessions[session_id] = session
+    elif not regenerate:
+        # 이미 생성된 이슈가 있으면 그대로 사용 (추가 생성 없음)
+        return ApiResponse(
+            success=True,
+            message="AI 기반 이슈를 불러왔습니다!",
+            data={
+                "issues": shown,
+                "regeneration_count": session.step4_regeneration_count,
+                "can_regenerate": session.step4_regeneration_count < 5
+            }
+        )
+    
+    session.step4_pending = {"shown": shown, "regenerate": regenerate}
+    token = progressive_jobs.start(
+        f"elementary:{session_id}:step4", ai_service.generate_step4_issues,
+        student_name=student_name, responses=responses_dict, regenerate=regenerate
+    )
+    return ApiResponse(
+        success=True,
+        message="기본 이슈를 먼저 보여드려요. AI 맞춤 이슈를 준비 중입니다.",
+        data={
+            "issues": shown,
+            "regeneration_count": session.step4_regeneration_count,
+            "can_regenerate": session.step4_regeneration_count < 5,
+            "pending_token": token
+        }
+    )
+
+def _pending_step4_job(session_id: str, token: str):
+    """세션에 속한 Step 4 대기 작업 조회"""
+    job = progressive_jobs.get(token)
+    if not job or job.key != f"elementary:{session_id}:step4":
+        raise HTTPException(status_code=404, detail="대기 중인 이슈 생성 작업을 찾을 수 없습니다.")
+    return job
+
+def _deliver_step4_issues(session_id: str, status: Dict) -> Dict:
+    """
+    생성이 끝난 Step 4 이슈를 세션에 반영하고 전달할 데이터 구성
+    학생이 보던 이슈로 이미 답했거나 다른 이슈로 바뀌었으면 반영하지 않음
+    """
+    if status["status"] != "ready":
+        return {"status": status["status"]}
+    issues = status["result"]
+    session = career_service.get_session(session_id)
+    pending = getattr(session, 'step4_pending', None) if session else None
+    if session and session.step4_ai_issues == issues:
+        pass  # 이미 전달됨 (폴링과 SSE 중복 수신 등)
+    elif (not pending or session.current_stage != CareerStage.STEP_4
+          or session.step4_ai_issues != pending["shown"] or not issues or len(issues) != 5):
+        return {"status": "stale"}
+    else:
+        session.step4_ai_issues = issues
+        if pending["regenerate"]:
+            session.step4_regeneration_count += 1
+        session.step4_pending = None
+        career_service.sessions[session_id] = session
+    return {
+        "status": "ready",
+        "issues": issues,
+        "regeneration_count": session.step4_regeneration_count,
+        "can_regenerate": session.step4_regeneration_count < 5
+    }
+
+@app.get("/career/{session_id}/step4-issues/{token}", response_model=ApiResponse)
+async def poll_step4_issues(session_id: str, token: str, wait: float = 0):
+    """Step 4 AI 이슈 폴링 (wait초까지 생성 완료를 기다림)"""
+    try:
+        _pending_step4_job(session_id, token)
+        status = await progressive_jobs.wait(token, min(max(wait, 0), 30))
+        data = _deliver_step4_issues(session_id, status)
+        return ApiResponse(
+            success=True,
+            message="AI 기반 이슈가 생성되었습니다!" if data["status"] == "ready" else "AI 이슈를 준비 중입니다.",
+            data=data
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Step 4 이슈 폴링 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="이슈 조회에 실패했습니다.")
+
+@app.get("/career/{session_id}/step4-issues/{token}/events")
+async def stream_step4_issues(session_id: str, token: str):
+    """Step 4 AI 이슈 SSE 수신 (생성이 끝나면 한 번 전송 후 종료)"""
+    _pending_step4_job(session_id, token)
+    return StreamingResponse(
+        progressive_jobs.events(token, lambda status: _deliver_step4_issues(session_id, status)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/career/{session_id}/step4-submit", response_model=ApiResponse)
 async def submit_step4_choice(session_id: str, request: NextStageRequest):
     """Step 4: AI 생성 이슈 중 선택 제출"""
@@ -811,6 +1103,7 @@ async def submit_step4_choice(session_id: str, request: NextStageRequest):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("elementary", session_id, getattr(session.current_stage, "value", "done"))
         
         if session.current_stage != CareerStage.STEP_4:
             raise HTTPException(status_code=400, detail="현재 Step 4 단계가 아닙니다.")
@@ -878,11 +1171,8 @@ async def download_career_pdf(request: PDFDownloadRequest):
     try:
         logger.info(f"PDF 다운로드 요청 (웹 스타일): {request.student_name}")
         
-        # PDF 생성기 초기화
-        pdf_generator = ElementaryCareerPDFGenerator()
-        
-        # PDF 생성
-        pdf_content = pdf_generator.generate_career_report(
+        # PDF 생성 (동일 내용은 캐시 재사용)
+        pdf_content, _ = pdf_generator.generate_career_report_cached(
             student_name=request.student_name,
             responses=request.responses,
             final_recommendation=request.final_recommendation,
@@ -934,6 +1224,14 @@ async def general_exception_handler(request, exc):
         content={"error": "Internal server error", "status_code": 500}
     )
 
+# 서버 예열 (마운트된 하위 앱이라 루트 앱 lifespan에서 호출)
+def warm_up() -> Dict:
+    """한글 폰트 등록, LLM API 연결 예열"""
+    steps = {"fonts": lambda: pdf_generator.font_name}
+    if ai_service and LLM_WARMUP_ENABLED:
+        steps["llm_connection"] = lambda: warm_up_connection(ai_service.client, LLM_WARMUP_TIMEOUT)
+    return run_steps(steps)
+
 # 서버 실행 함수
 import os
 
@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 from enum import Enum
 
+from common.dream_logic import DreamLogicTree
+
 # 단계별 상수 정의
 class CareerStage(str, Enum):
     """진로 탐색 단계"""
@@ -111,6 +113,7 @@ class StudentInfo(BaseModel):
     name: str = Field(..., description="학생 이름")
     grade: int = Field(..., ge=5, le=6, description="학년 (5학년, 6학년)")
     school: str = Field(default="초등학교", description="학교명")
+    class_tag: Optional[str] = Field(None, description="반 태그 (예: 5-2, 교사가 반 단위로 보고서를 내보낼 때 사용)")
 
 class StepResponse(BaseModel):
     """각 단계별 응답"""
@@ -162,12 +165,14 @@ class CareerExplorationSession(BaseModel):
     # 4단계 AI 이슈 관련 필드 (새로운 기능)
     step4_ai_issues: Optional[List[str]] = None
     step4_regeneration_count: int = 0
+    step4_pending: Optional[Dict] = None  # 점진적 응답: 생성 중인 이슈가 대체할 화면의 이슈 목록
     # 5단계 관련 필드
     ai_career_recommendation: Optional[str] = None
     career_confirmed: bool = False
     final_career_goal: Optional[str] = None
     # 6단계 관련 필드
     dream_logic: Optional[str] = None
+    dream_logic_tree: Optional[DreamLogicTree] = None  # dream_logic 파싱 결과 (저장 시 한 번만 파싱)
     created_at: str
     updated_at: str
 
@@ -189,6 +194,11 @@ class NextStageRequest(BaseModel):
     # 5단계 관련
     career_response: Optional[CareerRecommendationResponse] = None
 
+class BatchReportRequest(BaseModel):
+    """반 단위 보고서 일괄 내보내기 요청 (세션 ID 목록 또는 반 태그)"""
+    session_ids: Optional[List[str]] = Field(None, description="내보낼 세션 ID 목록")
+    class_tag: Optional[str] = Field(None, description="내보낼 반 태그")
+
 class ApiResponse(BaseModel):
     """API 응답 기본 형태"""
     success: bool
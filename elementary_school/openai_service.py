@@ -8,6 +8,8 @@ from openai import OpenAI
 from dotenv import load_dotenv
 import logging
 from .models import CareerStage, STAGE_QUESTIONS
+from common.dream_logic import extract_regenerated_section, get_goal_section
+from common.llm_gateway import llm_gateway, record_fallback
 
 # 환경 변수 로드
 load_dotenv()
@@ -23,7 +25,7 @@ class CareerRecommendationService:
             raise ValueError("OPENAI_API_KEY가 환경변수에 설정되지 않았습니다.")
         
         self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-4o-mini"  # 비용 효율적인 모델 사용
+        # 호출 위치별 모델은 common.llm_gateway 라우팅 표에서 관리
         
     def generate_career_recommendation(self, student_name: str, responses: Dict[CareerStage, Dict], regenerate: bool = False) -> str:
         """학생의 응답을 바탕으로 진로 추천 생성 (5단계 형식)"""
@@ -39,27 +41,16 @@ class CareerRecommendationService:
         if regenerate:
             user_prompt += "\n\n중요: 이전과는 다른 새로운 관점에서 진로를 추천해주세요. 다양한 분야와 접근 방식을 고려해주세요."
         
-        # 콘솔에 GPT 프롬프트 출력
-        print(f"\n🤖 GPT-4에게 보내는 프롬프트 (5단계 - {'재생성' if regenerate else '첫 생성'}):")
-        print("=" * 80)
-        print("� 응답 데이터 구조 확인:")
-        print(f"responses 타입: {type(responses)}")
-        print(f"responses 내용: {responses}")
-        print("\n�📋 System Prompt:")
-        print(system_prompt)
-        print("\n👤 User Prompt:")
-        print(user_prompt)
-        print("=" * 80)
-        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = llm_gateway.chat(
+                self.client, "elementary.recommendation",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.9 if regenerate else 0.7,  # 새로운 추천 시 더 창의적으로
-                max_tokens=500
+                max_tokens=500,
+                redact=[student_name]
             )
             
             content = response.choices[0].message.content
@@ -67,6 +58,7 @@ class CareerRecommendationService:
             
         except Exception as e:
             logger.error(f"OpenAI API 호출 오류: {str(e)}")
+            record_fallback("elementary.recommendation", e)
             return self._get_fallback_recommendation(student_name)
     
     def modify_career_recommendation(self, original_recommendation: str, modification_request: str, student_name: str) -> str:
@@ -93,14 +85,15 @@ class CareerRecommendationService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = llm_gateway.chat(
+                self.client, "elementary.modify_recommendation",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.6,
-                max_tokens=300
+                max_tokens=300,
+                redact=[student_name]
             )
             
             content = response.choices[0].message.content
@@ -108,6 +101,7 @@ class CareerRecommendationService:
             
         except Exception as e:
             logger.error(f"진로 추천 수정 오류: {str(e)}")
+            record_fallback("elementary.modify_recommendation", e)
             return original_recommendation
     
     def generate_dream_logic(self, student_name: str, responses: Dict[CareerStage, Dict], career_goal: str) -> str:
@@ -118,24 +112,16 @@ class CareerRecommendationService:
         system_prompt = self._get_dream_logic_system_prompt()
         user_prompt = self._get_dream_logic_user_prompt(student_name, response_text, career_goal)
         
-        # 콘솔에 GPT 프롬프트 출력
-        print(f"\n🌈 GPT-4에게 보내는 프롬프트 (6단계 - 드림로직):")
-        print("=" * 80)
-        print("📋 System Prompt:")
-        print(system_prompt)
-        print("\n👤 User Prompt:")
-        print(user_prompt)
-        print("=" * 80)
-        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = llm_gateway.chat(
+                self.client, "elementary.dream_logic",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.6,
-                max_tokens=1500
+                max_tokens=1500,
+                redact=[student_name]
             )
             
             content = response.choices[0].message.content
@@ -143,8 +129,49 @@ class CareerRecommendationService:
             
         except Exception as e:
             logger.error(f"드림로직 생성 오류: {str(e)}")
+            record_fallback("elementary.dream_logic", e)
             return self._get_fallback_dream_logic(student_name, career_goal)
     
+    def regenerate_dream_logic_section(self, student_name: str, career_goal: str, dream_logic: str, goal_number: int) -> Optional[str]:
+        """드림로직 중 중간목표 하나만 다시 생성 (나머지 계획은 고정된 맥락으로 전달)"""
+        
+        current_section = get_goal_section(dream_logic, goal_number) or ""
+        system_prompt = self._get_dream_logic_system_prompt() + f"""
+
+부분 재생성 규칙:
+- 전체 드림로직 중 [중간목표{goal_number}] 섹션 하나만 같은 형식으로 다시 작성
+- 제목, 최종꿈, 다른 중간목표, 응원 메모는 출력하지 않음"""
+        user_prompt = f"""최종 꿈: {career_goal}
+
+{student_name} 학생의 현재 드림로직 (다른 중간목표는 그대로 유지됩니다):
+{dream_logic}
+
+지금의 [중간목표{goal_number}] 내용:
+{current_section}
+
+[중간목표{goal_number}]을(를) 기존과 다른 새로운 역량이나 활동으로 다시 작성해주세요.
+다른 중간목표와 겹치지 않게 하고, "[중간목표{goal_number}]" 줄부터 시작해주세요."""
+        
+        try:
+            response = llm_gateway.chat(
+                self.client, "elementary.dream_logic_section",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.8,
+                max_tokens=500,
+                redact=[student_name]
+            )
+            
+            content = response.choices[0].message.content
+            return extract_regenerated_section(content, goal_number)
+            
+        except Exception as e:
+            logger.error(f"드림로직 부분 재생성 오류: {str(e)}")
+            record_fallback("elementary.dream_logic_section", e)
+            return None
+    
     def generate_encouragement_message(self, student_name: str, current_stage: CareerStage) -> str:
         """단계별 맞춤 응원 메시지 생성"""
         
@@ -157,8 +184,8 @@ class CareerRecommendationService:
         }
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = llm_gateway.chat(
+                self.client, "elementary.encouragement",
                 messages=[
                     {
                         "role": "system", 
@@ -170,7 +197,8 @@ class CareerRecommendationService:
                     }
                 ],
                 temperature=0.8,
-                max_tokens=100
+                max_tokens=100,
+                redact=[student_name]
             )
             
             content = response.choices[0].message.content
@@ -178,6 +206,7 @@ class CareerRecommendationService:
             
         except Exception as e:
             logger.error(f"응원 메시지 생성 오류: {str(e)}")
+            record_fallback("elementary.encouragement", e)
             return f"{student_name}님! 정말 잘하고 있어요! 💪✨"
     
     def _format_responses_for_ai(self, student_name: str, responses: Dict[CareerStage, Dict]) -> str:
@@ -406,23 +435,16 @@ AI와 함께하는 나만의 캐릭터 및 스토리 창작 (A.I. Co-Creation)
         if regenerate:
             user_prompt += "\n\n중요: 이전과는 완전히 다른 새로운 이슈들을 제시해주세요. 중복되지 않는 다양한 분야와 관점으로 접근해주세요."
 
-        print(f"\n🤖 GPT-4에게 보내는 프롬프트 (Step 4 이슈 생성 - {'재생성' if regenerate else '첫 생성'}):")
-        print("=" * 80)
-        print("📋 System Prompt:")
-        print(system_prompt)
-        print("\n👤 User Prompt:")
-        print(user_prompt)
-        print("=" * 80)
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = llm_gateway.chat(
+                self.client, "elementary.step4_issues",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.9 if regenerate else 0.7,
-                max_tokens=600
+                max_tokens=600,
+                redact=[student_name]
             )
             
             content = response.choices[0].message.content
@@ -462,6 +484,7 @@ AI와 함께하는 나만의 캐릭터 및 스토리 창작 (A.I. Co-Creation)
             
         except Exception as e:
             logger.error(f"OpenAI API 호출 오류 (Step 4 이슈): {str(e)}")
+            record_fallback("elementary.step4_issues", e)
             return self._get_fallback_step4_issues(student_name)
     
     def _extract_choices_text(self, response_data: Dict) -> str:
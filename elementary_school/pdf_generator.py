@@ -4,7 +4,11 @@
 
 import tempfile
 import os
-from typing import Dict
+import json
+import hashlib
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 
 from reportlab.lib.pagesizes import A4
@@ -15,16 +19,32 @@ from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from common.dream_logic import ensure_dream_logic_tree
+from common.memory_report import register_structure
+from common.metrics import PDF_RENDER_SECONDS, PDF_SIZE_BYTES, record_cache, timed
+from common.server_timing import span
+
 from .models import CareerStage
 
 
+# 렌더링 결과 캐시 최대 보관 개수
+REPORT_CACHE_SIZE = 64
+
+
 class ElementaryCareerPDFGenerator:
     """초등학생 진로 탐색 PDF 생성기"""
     
     def __init__(self):
         """PDF 생성기 초기화"""
-        self.font_name = self._register_korean_font()
-        print(f"🔤 최종 사용 폰트: {self.font_name}")
+        # 입력 내용 해시 → PDF 바이트 (LRU)
+        self._report_cache: "OrderedDict[str, bytes]" = OrderedDict()
+    
+    @cached_property
+    def font_name(self) -> str:
+        """한글 폰트 이름 (처음 PDF를 만들 때 등록해 서버 시작 시간을 줄임)"""
+        font_name = self._register_korean_font()
+        print(f"🔤 최종 사용 폰트: {font_name}")
+        return font_name
     
     def _register_korean_font(self) -> str:
         """한글 폰트 등록"""
@@ -182,7 +202,7 @@ class ElementaryCareerPDFGenerator:
     
     def generate_career_report(self, student_name: str, responses: Dict[CareerStage, Dict], 
                              final_recommendation: str, dream_logic_result: str = "", 
-                             encouragement_message: str = "") -> bytes:
+                             encouragement_message: str = "", dream_logic_tree=None) -> bytes:
         """진로 탐색 PDF 보고서 생성"""
         
         # 웹 스타일 초기화
@@ -220,7 +240,7 @@ class ElementaryCareerPDFGenerator:
                 #story.append(Paragraph("🌈 드림로직 - 꿈 실현 계획", self.styles['heading']))
                 story.append(Spacer(1, 8))
                 
-                dream_elements = self._format_dream_logic(dream_logic_result)
+                dream_elements = self._format_dream_logic(dream_logic_result, dream_logic_tree)
                 story.extend(dream_elements)
                 story.append(Spacer(1, 15))
             """
@@ -232,11 +252,13 @@ class ElementaryCareerPDFGenerator:
                 story.append(Spacer(1, 15))
             """
             # PDF 빌드
-            doc.build(story)
+            with timed(PDF_RENDER_SECONDS, school="elementary"), span("pdf_build"):
+                doc.build(story)
             
             # 생성된 PDF 파일 읽기
             with open(tmp_path, 'rb') as pdf_file:
                 pdf_content = pdf_file.read()
+            PDF_SIZE_BYTES.observe(len(pdf_content), school="elementary")
             
             return pdf_content
             
@@ -247,6 +269,55 @@ class ElementaryCareerPDFGenerator:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
     
+    def report_cache_key(self, student_name: str, responses: Dict, final_recommendation: str,
+                         dream_logic_result: str = "", encouragement_message: str = "") -> str:
+        """보고서 입력 내용으로 캐시 키(ETag로도 사용) 생성"""
+        payload = json.dumps(
+            [student_name, responses, final_recommendation, dream_logic_result, encouragement_message],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    
+    def get_cached_report(self, cache_key: str) -> Optional[bytes]:
+        """캐시에 렌더링된 보고서가 있으면 반환 (없으면 None)"""
+        return self._report_cache.get(cache_key)
+    
+    def generate_career_report_cached(self, student_name: str, responses: Dict[CareerStage, Dict],
+                                      final_recommendation: str, dream_logic_result: str = "",
+                                      encouragement_message: str = "",
+                                      dream_logic_tree=None) -> Tuple[bytes, str]:
+        """캐시를 거쳐 PDF 보고서 생성 (입력이 같으면 다시 렌더링하지 않음)
+        
+        dream_logic_tree는 dream_logic_result를 파싱한 결과이므로 캐시 키에는 포함하지 않는다.
+        
+        Returns:
+            Tuple[bytes, str]: PDF 내용과 캐시 키
+        """
+        cache_key = self.report_cache_key(
+            student_name, responses, final_recommendation, dream_logic_result, encouragement_message
+        )
+        
+        cached = self._report_cache.get(cache_key)
+        record_cache("elementary_report", cached is not None)
+        if cached is not None:
+            self._report_cache.move_to_end(cache_key)
+            return cached, cache_key
+        
+        pdf_content = self.generate_career_report(
+            student_name=student_name,
+            responses=responses,
+            final_recommendation=final_recommendation,
+            dream_logic_result=dream_logic_result,
+            encouragement_message=encouragement_message,
+            dream_logic_tree=dream_logic_tree
+        )
+        
+        self._report_cache[cache_key] = pdf_content
+        while len(self._report_cache) > REPORT_CACHE_SIZE:
+            self._report_cache.popitem(last=False)
+        
+        return pdf_content, cache_key
+    
     def _format_answer(self, response_data: Dict, stage: CareerStage) -> str:
         """응답 데이터를 텍스트로 포맷팅"""
         choice_numbers = response_data.get("choice_numbers", [])
@@ -266,32 +337,28 @@ class ElementaryCareerPDFGenerator:
         
         return "답변 없음"
     
-    def _format_dream_logic(self, dream_logic_text: str) -> list:
-        """드림로직 텍스트를 구조화된 PDF 요소로 변환"""
+    def _format_dream_logic(self, dream_logic_text: str, dream_logic_tree=None) -> list:
+        """드림로직 트리를 구조화된 PDF 요소로 변환 (세션에 저장된 트리가 있으면 재파싱하지 않음)"""
         story_elements = []
         
-        if not dream_logic_text:
+        if not dream_logic_text and not dream_logic_tree:
             return story_elements
-            
-        lines = dream_logic_text.split('\n')
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # 제목이나 헤더 (대괄호로 둘러싸인 부분)
-            if line.startswith('[') and line.endswith(']'):
+        tree = ensure_dream_logic_tree(dream_logic_text, dream_logic_tree)
+        
+        for kind, line in tree.iter_lines():
+            # 제목 (대괄호로 둘러싸인 부분)
+            if kind in ('title', 'section'):
                 story_elements.append(Paragraph(line, self.styles['dream_title']))
                 story_elements.append(Spacer(1, 6))
             
-            # 최종꿈 (꿈: 또는 최종꿈: 으로 시작)
-            elif line.startswith(('최종꿈:', '꿈:')):
+            # 최종꿈
+            elif kind == 'final_dream':
                 story_elements.append(Paragraph(line, self.styles['dream_goal']))
                 story_elements.append(Spacer(1, 8))
             
             # 중간목표
-            elif '중간목표' in line or '[중간목표' in line:
+            elif kind == 'goal':
                 story_elements.append(Paragraph(line, self.styles['dream_section']))
                 story_elements.append(Spacer(1, 6))
             
@@ -300,14 +367,18 @@ class ElementaryCareerPDFGenerator:
                 story_elements.append(Paragraph(line, self.styles['dream_activity']))
                 story_elements.append(Spacer(1, 3))
             
-            # 세부 항목 (들여쓰기된 것들)
-            elif line.startswith(('  ', '\t')):
-                story_elements.append(Paragraph(line, self.styles['dream_item']))
-                story_elements.append(Spacer(1, 2))
-            
             # 일반 텍스트
             else:
                 story_elements.append(Paragraph(line, self.styles['dream_activity']))
                 story_elements.append(Spacer(1, 4))
         
-        return story_elements
\ No newline at end of file
+        return story_elements
+
+# 전역 PDF 생성기 인스턴스
+pdf_generator = ElementaryCareerPDFGenerator()
+register_structure("elementary.report_cache", lambda: pdf_generator._report_cache)
+
+
+def render_report_in_worker(report_args: Dict) -> bytes:
+    """프로세스 풀 워커에서 보고서 렌더링 (일괄 내보내기용, 피클 가능한 모듈 함수)"""
+    return pdf_generator.generate_career_report(**report_args)
@@ -0,0 +1,111 @@
+"""
+PDF 다운로드 파일명용 직업명 영문 변환
+LLM 호출 없이 로컬에서 한글을 로마자로 바꾸고, 번역 결과는 파일 캐시에 보관
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Optional
+
+# 국어의 로마자 표기법 (음운 변화는 적용하지 않는 단순 전사)
+_INITIALS = [
+    'g', 'kk', 'n', 'd', 'tt', 'r', 'm', 'b', 'pp', 's',
+    'ss', '', 'j', 'jj', 'ch', 'k', 't', 'p', 'h'
+]
+_MEDIALS = [
+    'a', 'ae', 'ya', 'yae', 'eo', 'e', 'yeo', 'ye', 'o', 'wa', 'wae',
+    'oe', 'yo', 'u', 'wo', 'we', 'wi', 'yu', 'eu', 'ui', 'i'
+]
+_FINALS = [
+    '', 'k', 'k', 'k', 'n', 'n', 'n', 't', 'l', 'k', 'm', 'l', 'l', 'l',
+    'p', 'l', 'm', 'p', 'p', 't', 't', 'ng', 't', 't', 'k', 't', 'p', 't'
+]
+
+_HANGUL_START = 0xAC00
+_HANGUL_END = 0xD7A3
+
+# 번역 캐시 파일 경로 (환경변수로 변경 가능)
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), "career_translations.json")
+
+
+def has_hangul(text: str) -> bool:
+    """한글 음절 포함 여부"""
+    return any(_HANGUL_START <= ord(char) <= _HANGUL_END for char in text)
+
+
+def romanize_hangul(text: str) -> str:
+    """한글 음절을 로마자로 변환 (한글이 아닌 문자는 그대로 유지)"""
+    result = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_START <= code <= _HANGUL_END:
+            offset = code - _HANGUL_START
+            result.append(
+                _INITIALS[offset // 588]
+                + _MEDIALS[(offset % 588) // 28]
+                + _FINALS[offset % 28]
+            )
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def slugify_career(text: str) -> str:
+    """파일명에 쓸 수 있도록 소문자 ASCII + 언더스코어 형태로 정리"""
+    text = ''.join(c for c in text if (c.isascii() and c.isalnum()) or c.isspace() or c in '_-')
+    text = re.sub(r'[\s\-_]+', '_', text.strip()).strip('_')
+    return text.lower()
+
+
+class CareerNameCache:
+    """직업명 → 영문 파일명 조각을 보관하는 파일 기반 캐시"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("CAREER_TRANSLATION_CACHE", DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, str] = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        """캐시 파일 읽기 (없거나 손상되면 빈 캐시)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, career: str) -> Optional[str]:
+        """캐시된 영문 직업명 조회"""
+        return self._entries.get(career.strip())
+
+    def set(self, career: str, english: str) -> None:
+        """영문 직업명 저장 후 파일에 기록 (임시 파일 교체 방식)"""
+        with self._lock:
+            self._entries[career.strip()] = english
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ 직업명 번역 캐시 저장 실패: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def career_to_filename_part(career: str, cache: Optional["CareerNameCache"] = None) -> str:
+    """직업명을 파일명 조각으로 변환 (캐시된 번역 우선, 없으면 로마자 표기)"""
+    if cache is not None:
+        cached = cache.get(career)
+        if cached:
+            return cached
+    return slugify_career(romanize_hangul(career)) or "unknown_job"
+
+
+# 전역 캐시 인스턴스
+career_name_cache = CareerNameCache()
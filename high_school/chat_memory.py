@@ -0,0 +1,182 @@
+"""
+고등학교 채팅 앱의 대화 기억 관리
+최근 대화는 토큰 예산 안에서만 그대로 보내고, 예산을 넘은 오래된 대화는 요약문 하나로 합쳐 보낸다.
+대화가 길어져도 매 턴 프롬프트 크기가 일정하게 유지되며, 세션 수도 상한과 유휴 시간으로 제한한다.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+# 요약을 제외한 최근 대화에 쓸 토큰 예산
+CHAT_WINDOW_TOKENS = int(os.getenv("CHAT_WINDOW_TOKENS", "2000"))
+# 누적 요약문의 최대 토큰 수 (요약 요청의 응답 길이 제한)
+CHAT_SUMMARY_TOKENS = int(os.getenv("CHAT_SUMMARY_TOKENS", "300"))
+# 요약 대기열의 최대 토큰 수 (요약이 계속 실패해도 넘으면 가장 오래된 턴부터 잘라 요약문에 짧게 붙임)
+CHAT_PENDING_TOKENS = int(os.getenv("CHAT_PENDING_TOKENS", "1500"))
+# 잘라낸 턴을 요약문에 붙일 때 메시지 하나당 남기는 글자 수
+FOLDED_MESSAGE_CHARS = 60
+# 메모리에 보관하는 최대 대화 세션 수
+CHAT_MAX_SESSIONS = int(os.getenv("CHAT_MAX_SESSIONS", "1000"))
+# 마지막 사용 후 대화 세션을 보관하는 시간 (초)
+CHAT_SESSION_IDLE_TTL = int(os.getenv("CHAT_SESSION_IDLE_TTL", str(30 * 60)))
+
+SUMMARY_SYSTEM_PROMPT = (
+    "너는 대화 기록을 요약하는 어시스턴트야. 기존 요약과 새로 밀려난 대화를 합쳐 "
+    "이후 대화에 필요한 사실, 사용자의 관심사와 요청, 이미 답한 내용을 한국어로 간결하게 정리해줘."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (한글 등 비ASCII 문자는 1자당 1토큰, ASCII는 4자당 1토큰)"""
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii) // 4 + 4  # 메시지 구분 오버헤드
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """토큰 상한을 넘으면 앞부분을 잘라 최근 내용만 남김"""
+    while text and estimate_tokens(text) > max_tokens:
+        text = text[max(1, len(text) // 10):]
+    return text
+
+
+def fold_messages(summary: str, messages: List[Dict[str, str]], max_tokens: int = CHAT_SUMMARY_TOKENS) -> str:
+    """요약하지 못하고 잘라낸 대화를 짧게 줄여 요약문 뒤에 붙임 (요약문 토큰 상한 유지)"""
+    excerpt = ' / '.join(f"{message['role']}: {message['content'][:FOLDED_MESSAGE_CHARS]}" for message in messages)
+    folded = f"{summary}\n(요약 전 잘린 대화) {excerpt}" if summary else f"(요약 전 잘린 대화) {excerpt}"
+    return truncate_tokens(folded, max_tokens)
+
+
+class ConversationMemory:
+    """세션 하나의 대화 기억 (누적 요약 + 토큰 예산 안의 최근 대화)"""
+
+    def __init__(self, system_prompt: str, window_tokens: int = CHAT_WINDOW_TOKENS,
+                 pending_tokens: int = CHAT_PENDING_TOKENS):
+        self.system_prompt = system_prompt
+        self.window_tokens = window_tokens
+        self.pending_tokens = pending_tokens
+        self.summary = ""
+        self.window: List[Dict[str, str]] = []
+        # 창에서 밀려났지만 아직 요약에 반영되지 않은 대화
+        self.pending: List[Dict[str, str]] = []
+        self.summarizing = False
+        # 요약 중 대기열에서 잘라낸 메시지 수와, 요약 대상이 아니었던 잘린 대화를 줄인 문장
+        self._dropped = 0
+        self._summarizing_count = 0
+        self._unsummarized_note = ""
+        self.last_access = time.time()
+
+    def build_messages(self, user_input: str) -> List[Dict[str, str]]:
+        """이번 턴에 모델로 보낼 메시지 목록"""
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if self.summary:
+            messages.append({"role": "system", "content": f"이전 대화 요약: {self.summary}"})
+        messages.extend(self.pending)
+        messages.extend(self.window)
+        messages.append({"role": "user", "content": user_input})
+        return messages
+
+    def add_turn(self, user_input: str, reply: str) -> None:
+        """대화 한 턴 저장 후 예산을 넘는 오래된 턴은 요약 대기열로 이동"""
+        self.window.append({"role": "user", "content": user_input})
+        self.window.append({"role": "assistant", "content": reply})
+        # 사용자/어시스턴트 메시지를 한 쌍씩 밀어내되 마지막 턴은 항상 유지
+        while len(self.window) > 2 and _size(self.window) > self.window_tokens:
+            self.pending.extend(self.window[:2])
+            del self.window[:2]
+        self._trim_pending()
+
+    def needs_summary(self) -> bool:
+        return bool(self.pending) and not self.summarizing
+
+    def take_pending(self) -> List[Dict[str, str]]:
+        """요약할 대화를 꺼내고 요약 중 상태로 표시"""
+        self.summarizing = True
+        self._summarizing_count = len(self.pending)
+        return list(self.pending)
+
+    def apply_summary(self, summary: str, summarized: List[Dict[str, str]]) -> None:
+        """요약 결과 반영 (요약하는 동안 새로 밀려난 대화는 대기열에 남김)"""
+        self.summary = summary.strip()
+        if self._unsummarized_note:
+            # 요약 대상 이후에 밀려났다가 상한 때문에 잘린 대화는 새 요약문에도 붙여 둠
+            self.summary = truncate_tokens(f"{self.summary}\n{self._unsummarized_note}".strip(), CHAT_SUMMARY_TOKENS)
+        self.pending = self.pending[max(len(summarized) - self._dropped, 0):]
+        self._end_summary()
+
+    def cancel_summary(self) -> None:
+        # 잘라낸 대화는 이미 요약문에 붙어 있으므로 대기열만 그대로 둠
+        self._end_summary()
+
+    def _end_summary(self) -> None:
+        self.summarizing = False
+        self._dropped = 0
+        self._summarizing_count = 0
+        self._unsummarized_note = ""
+
+    def _trim_pending(self) -> None:
+        """요약이 계속 실패해도 대기열이 한없이 커지지 않도록 상한을 넘는 가장 오래된 턴을 잘라 요약문에 붙임"""
+        while self.pending and _size(self.pending) > self.pending_tokens:
+            dropped = self.pending[:2]
+            del self.pending[:2]
+            self.summary = fold_messages(self.summary, dropped)
+            if self.summarizing:
+                if self._dropped >= self._summarizing_count:
+                    self._unsummarized_note = fold_messages(self._unsummarized_note, dropped)
+                self._dropped += 2
+
+
+def _size(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(message["content"]) for message in messages)
+
+
+def build_summary_messages(summary: str, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """누적 요약 갱신 요청 메시지"""
+    transcript = '\n'.join(f"{message['role']}: {message['content']}" for message in messages)
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": f"기존 요약:\n{summary or '(없음)'}\n\n새로 밀려난 대화:\n{transcript}"},
+    ]
+
+
+class ConversationStore:
+    """대화 세션 메모리 저장소 (유휴 시간 만료 + 최대 세션 수 제한, 오래 안 쓴 세션부터 제거)"""
+
+    def __init__(self, system_prompt: str, max_sessions: int = CHAT_MAX_SESSIONS,
+                 idle_ttl: int = CHAT_SESSION_IDLE_TTL):
+        self.system_prompt = system_prompt
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions: "OrderedDict[str, ConversationMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> ConversationMemory:
+        """세션 대화 기억 조회 (없거나 만료되었으면 새로 생성)"""
+        now = time.time()
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is not None and now - memory.last_access > self.idle_ttl:
+                memory = None
+            if memory is None:
+                memory = ConversationMemory(self.system_prompt)
+            memory.last_access = now
+            self._sessions[session_id] = memory
+            self._sessions.move_to_end(session_id)
+            self._evict(now)
+            return memory
+
+    def _evict(self, now: float) -> None:
+        # 가장 오래 사용하지 않은 세션이 앞쪽에 있음
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if len(self._sessions) > self.max_sessions or now - oldest.last_access > self.idle_ttl:
+                del self._sessions[oldest_id]
+            else:
+                break
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -1,12 +1,18 @@
 from fastapi import FastAPI, Request
 from pydantic import BaseModel
-from openai import OpenAI
-from typing import Dict, List
+from openai import AsyncOpenAI, OpenAI
+from typing import Optional, Set
+import asyncio
 # python-dotenv를 사용하여 환경변수 로드
 from dotenv import load_dotenv
 import os
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
+# 토큰 예산 기반 대화 기억
+try:
+    from .chat_memory import ConversationStore, build_summary_messages, CHAT_SUMMARY_TOKENS
+except ImportError:
+    from chat_memory import ConversationStore, build_summary_messages, CHAT_SUMMARY_TOKENS
 from fastapi.staticfiles import StaticFiles
 
 
@@ -18,39 +24,101 @@ if not _key:
     raise ValueError("OPENAI_API_KEY 환경 변수가 설정되어 있지 않습니다.")
 else:
     client = OpenAI(api_key=_key) # Or it will pick from environment variable
+    # 스트리밍 응답용 비동기 클라이언트
+    async_client = AsyncOpenAI(api_key=_key)
 
-# 세션별 대화 저장용 (메모리 기반 예시)
-from openai.types.chat import ChatCompletionMessageParam
+CHAT_MODEL = "gpt-4.1"
+# 오래된 대화 요약용 모델 (응답 지연에 영향을 주지 않도록 응답 후 백그라운드에서 실행)
+SUMMARY_MODEL = "gpt-4.1-mini"
 
-session_store: Dict[str, List[ChatCompletionMessageParam]] = {}
+# 세션별 대화 기억 (최근 대화는 토큰 예산 안에서만 유지, 나머지는 요약)
+session_store = ConversationStore(system_prompt="You are a helpful assistant.")
+# 루트 앱과 같은 프로세스에서 실행될 때만 메모리 진단에 등록 (단독 실행 시에는 common 패키지가 없음)
+try:
+    from common.memory_report import register_structure
+    register_structure("high.chat_sessions", lambda: session_store._sessions)
+except ImportError:
+    pass
+# 실행 중인 요약 작업 (가비지 컬렉션으로 취소되지 않도록 참조 유지)
+_summary_tasks: Set[asyncio.Task] = set()
 
 class ChatRequest(BaseModel):
     session_id: str
     user_input: str
+    stream: Optional[bool] = True  # False면 기존처럼 {"reply": ...} JSON으로 응답
+
+
+async def summarize_old_turns(memory):
+    """창에서 밀려난 대화를 누적 요약에 반영"""
+    summarized = memory.take_pending()
+    try:
+        response = await async_client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=build_summary_messages(memory.summary, summarized),  # type: ignore
+            max_completion_tokens=CHAT_SUMMARY_TOKENS,
+            temperature=0.2
+        )
+        memory.apply_summary(response.choices[0].message.content or memory.summary, summarized)
+    except Exception as e:
+        # 요약 실패 시 대기열을 유지해 다음 턴에 다시 시도
+        print(f"⚠️ 대화 요약 실패: {e}")
+        memory.cancel_summary()
+
+
+def remember_turn(memory, user_input: str, reply: str):
+    """대화 한 턴 저장 후 필요하면 요약 작업 시작"""
+    memory.add_turn(user_input, reply)
+    if memory.needs_summary():
+        task = asyncio.create_task(summarize_old_turns(memory))
+        _summary_tasks.add(task)
+        task.add_done_callback(_summary_tasks.discard)
 
 @app.post("/chat")
 async def chat(req: ChatRequest):
     session_id = req.session_id
     user_input = req.user_input
 
-    if session_id not in session_store:
-        session_store[session_id] = [
-            {"role": "system", "content": "You are a helpful assistant."}  # type: ChatCompletionMessageParam
-        ]
+    memory = session_store.get(session_id)
+    # 시스템 프롬프트 + 이전 대화 요약 + 예산 안의 최근 대화 + 이번 입력
+    messages = memory.build_messages(user_input)
 
-    messages = session_store[session_id]
-    messages.append({"role": "user", "content": user_input})  # type: ChatCompletionMessageParam
+    if not req.stream:
+        response = await async_client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages  # type: ignore
+        )
+        assistant_reply = response.choices[0].message.content or ""
+        remember_turn(memory, user_input, assistant_reply)
+        return {"reply": assistant_reply}
 
-    # GPT 응답 생성
-    response = client.chat.completions.create(
-        model="gpt-4.1",
-        messages=messages
-    )
-
-    assistant_reply = response.choices[0].message.content
-    messages.append({"role": "assistant", "content": assistant_reply})  # type: ChatCompletionMessageParam
+    async def stream_reply():
+        # GPT 응답을 받는 대로 텍스트 조각으로 전달
+        parts = []
+        try:
+            stream = await async_client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,  # type: ignore
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            print(f"❌ 채팅 응답 오류: {e}")
+            if not parts:
+                yield "[에러] 응답을 생성하지 못했습니다."
+        finally:
+            # 중간에 연결이 끊겨도 받은 부분까지는 대화 기록에 남김
+            if parts:
+                remember_turn(memory, user_input, ''.join(parts))
 
-    return {"reply": assistant_reply}
+    return StreamingResponse(
+        stream_reply(),
+        media_type="text/plain; charset=utf-8",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 templates = Jinja2Templates(directory="templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
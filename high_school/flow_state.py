@@ -0,0 +1,206 @@
+"""
+고등학교 7단계 진로 탐색 흐름의 서버 측 상태 저장소
+쿠키의 흐름 ID로 상태를 찾아, 매 단계마다 이전 단계 데이터를 폼으로 다시 주고받지 않도록 한다.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from common.memory_report import register_structure
+from common.metrics import SESSIONS_EVICTED, SESSIONS_LIVE
+from common.server_timing import span
+
+# 흐름 ID를 담는 쿠키 이름
+FLOW_COOKIE_NAME = "hs_flow_id"
+# 마지막 사용 후 상태를 보관하는 시간 (초)
+FLOW_IDLE_TTL = int(os.getenv("HS_FLOW_IDLE_TTL", str(6 * 60 * 60)))
+# 메모리에 보관하는 최대 흐름 수
+FLOW_MAX_ENTRIES = int(os.getenv("HS_FLOW_MAX_ENTRIES", "5000"))
+
+# 단계 순서대로 나열한 상태 필드 (앞 단계가 바뀌면 뒤 단계 필드는 초기화)
+FLOW_FIELDS = [
+    "career", "reasons", "issues", "issues_selected", "topics", "topic",
+    "suggested_goal", "goal", "midgoals", "final_summary",
+]
+
+
+class GeneratedResult(BaseModel):
+    """LLM이 생성한 결과와 생성에 사용한 입력"""
+    inputs: str
+    value: Any
+
+
+def _inputs_key(inputs: Dict) -> str:
+    """생성 입력을 비교 가능한 문자열로 변환"""
+    return json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class HighSchoolFlowState(BaseModel):
+    """고등학교 진로 탐색 흐름 상태"""
+    flow_id: str
+    step: int = 1
+    career: Optional[str] = None
+    reasons: List[str] = []
+    issues: List[str] = []
+    issues_selected: List[str] = []
+    topics: List[str] = []
+    topic: Optional[str] = None
+    suggested_goal: Optional[str] = None
+    goal: Optional[str] = None
+    midgoals: List[str] = []
+    final_summary: Optional[str] = None
+    start_time: Optional[float] = None
+    last_access: float = 0.0
+    # 항목별 마지막 생성 결과 (issues, topics, suggested_goal, midgoals, final_summary)
+    generated: Dict[str, GeneratedResult] = {}
+
+    def reset_after(self, field: str) -> None:
+        """지정한 필드 이후 단계의 데이터 초기화"""
+        for name in FLOW_FIELDS[FLOW_FIELDS.index(field) + 1:]:
+            default = HighSchoolFlowState.model_fields[name].default
+            setattr(self, name, list(default) if isinstance(default, list) else default)
+
+    def update_from_context(self, context: Dict) -> None:
+        """렌더링 컨텍스트에 담긴 단계 데이터를 상태에 반영"""
+        career = context.get("career")
+        if career and career != self.career:
+            self.career = career
+            self.reset_after("career")
+        for name in FLOW_FIELDS[1:]:
+            value = context.get(name)
+            if value is not None:
+                setattr(self, name, list(value) if isinstance(value, (list, tuple)) else value)
+        if context.get("step"):
+            self.step = int(context["step"])
+
+    def remember(self, name: str, inputs: Dict, value: Any) -> None:
+        """생성 결과를 입력과 함께 기억 (항목별로 마지막 결과 하나만 유지)"""
+        self.generated[name] = GeneratedResult(inputs=_inputs_key(inputs), value=value)
+
+    def recall(self, name: str, inputs: Dict) -> Optional[Any]:
+        """같은 입력으로 생성한 결과가 있으면 반환"""
+        result = self.generated.get(name)
+        if result is None or result.inputs != _inputs_key(inputs):
+            return None
+        return result.value
+
+
+class FlowStateStore:
+    """흐름 상태 메모리 저장소 (유휴 시간 만료 + 최대 개수 제한)"""
+
+    def __init__(self, idle_ttl: int = FLOW_IDLE_TTL, max_entries: int = FLOW_MAX_ENTRIES):
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+        self._states: Dict[str, HighSchoolFlowState] = {}
+        self._lock = threading.Lock()
+
+    def create(self) -> HighSchoolFlowState:
+        """새 흐름 상태 생성"""
+        now = time.time()
+        state = HighSchoolFlowState(flow_id=uuid.uuid4().hex, start_time=now, last_access=now)
+        with span("session_io"), self._lock:
+            self._evict(now)
+            self._states[state.flow_id] = state
+        return state
+
+    def get(self, flow_id: Optional[str]) -> Optional[HighSchoolFlowState]:
+        """흐름 상태 조회 (만료된 상태는 None)"""
+        if not flow_id:
+            return None
+        now = time.time()
+        with span("session_io"), self._lock:
+            state = self._states.get(flow_id)
+            if state is None:
+                return None
+            if now - state.last_access > self.idle_ttl:
+                del self._states[flow_id]
+                SESSIONS_EVICTED.inc(school="high")
+                return None
+            state.last_access = now
+            return state
+
+    def get_or_create(self, flow_id: Optional[str]) -> HighSchoolFlowState:
+        """쿠키의 흐름 ID로 상태를 찾고, 없으면 새로 생성"""
+        return self.get(flow_id) or self.create()
+
+    def _evict(self, now: float) -> None:
+        """만료된 상태 제거 후, 여전히 많으면 오래된 순으로 제거"""
+        expired = [key for key, state in self._states.items() if now - state.last_access > self.idle_ttl]
+        for key in expired:
+            del self._states[key]
+        overflow = len(self._states) - self.max_entries + 1
+        if overflow > 0:
+            oldest = sorted(self._states.values(), key=lambda state: state.last_access)[:overflow]
+            for state in oldest:
+                del self._states[state.flow_id]
+        evicted = len(expired) + max(overflow, 0)
+        if evicted:
+            SESSIONS_EVICTED.inc(evicted, school="high")
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+class SpeculativeTasks:
+    """흐름별로 미리 시작해 둔 생성 작업 (같은 항목을 다른 입력으로 다시 시작하면 이전 작업 취소)"""
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[str, str], Tuple[str, asyncio.Task]] = {}
+
+    def start(self, flow_id: str, name: str, inputs: Dict,
+              factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """생성 작업을 백그라운드로 시작 (같은 입력의 작업이 이미 진행 중이면 그대로 사용)"""
+        key = (flow_id, name)
+        inputs_key = _inputs_key(inputs)
+        current = self._tasks.get(key)
+        if current and not current[1].done():
+            if current[0] == inputs_key:
+                return current[1]
+            current[1].cancel()
+
+        task = asyncio.get_running_loop().create_task(factory())
+        self._tasks[key] = (inputs_key, task)
+
+        def _discard(finished: asyncio.Task) -> None:
+            if self._tasks.get(key, (None, None))[1] is finished:
+                del self._tasks[key]
+            if not finished.cancelled() and finished.exception():
+                print(f"⚠️ 선행 생성 작업 실패 ({name}): {finished.exception()}")
+
+        task.add_done_callback(_discard)
+        return task
+
+    def take(self, flow_id: str, name: str, inputs: Dict) -> Optional[asyncio.Task]:
+        """같은 입력으로 진행 중인 작업 반환 (입력이 다르면 취소하고 None)"""
+        current = self._tasks.get((flow_id, name))
+        if current is None:
+            return None
+        if current[0] != _inputs_key(inputs):
+            self.cancel(flow_id, name)
+            return None
+        return current[1]
+
+    def cancel(self, flow_id: str, name: str) -> None:
+        """진행 중인 작업 취소"""
+        current = self._tasks.pop((flow_id, name), None)
+        if current and not current[1].done():
+            current[1].cancel()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+# 전역 흐름 상태 저장소 인스턴스
+flow_store = FlowStateStore()
+SESSIONS_LIVE.set_function(lambda: len(flow_store), school="high")
+register_structure("high.flow_states", lambda: flow_store._states)
+# 전역 선행 생성 작업 인스턴스
+speculative_tasks = SpeculativeTasks()
+register_structure("high.speculative_tasks", lambda: speculative_tasks._tasks)
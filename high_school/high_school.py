@@ -1,34 +1,44 @@
 # FastAPI 기본 형을 작성해 주세요. 가장 기본이 되는 app 와 '/' url 애 대한 사항만 적용함
-from fastapi import FastAPI, Request, Form
+from fastapi import FastAPI, Request, Form, BackgroundTasks
 from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
 from typing import List, Optional
-# openai 의 OpenAI API를 사용하기 위한 라이브러리 import
-from openai import OpenAI
 # python-dotenv를 사용하여 환경변수 로드
 from dotenv import load_dotenv
+import asyncio
 import os
+import re
 from datetime import datetime
 # PDF 생성을 위한 모듈
 from .pdf_generator import pdf_generator
+# 7단계 흐름의 서버 측 상태 저장소
+from .flow_state import FLOW_COOKIE_NAME, FLOW_IDLE_TTL, flow_store, speculative_tasks
+from common.dream_logic import HIGH_SCHOOL_EPILOGUE_MARKERS, replace_goal_section
+from common.llm_gateway import CircuitOpenError, llm_gateway, record_fallback
+from common.journey import mark_stage
+from common.metrics import LLM_RETRIES, record_cache
+from common.openai_client import LazyOpenAIClient, warm_up_connection
+from common.server_timing import TimedJSONResponse, span
+from common.static_assets import PrecompressedStaticFiles
+from common.warmup import LLM_WARMUP_ENABLED, LLM_WARMUP_TIMEOUT, run_steps
 
 
 # OpenAI API 키 설정
 load_dotenv()
 _key = os.getenv("OPENAI_API_KEY")
 #openai.api_key = _key
-client = OpenAI(api_key=_key) # Or it will pick from environment variable
+client = LazyOpenAIClient(api_key=_key) # 실제 클라이언트는 첫 LLM 호출 때 생성
 
-# 기본 GPT 모델 설정 (모델 선택 기능 제거)
-DEFAULT_GPT_MODEL = "gpt-4.1-mini"
-app = FastAPI()
+# GPT 모델은 호출 위치별로 common.llm_gateway 라우팅 표에서 관리
+# PDF 파일명용 직업명 LLM 번역을 다운로드 이후 백그라운드로 보강할지 여부
+CAREER_NAME_REFINEMENT = os.getenv("CAREER_NAME_REFINEMENT", "1") == "1"
+app = FastAPI(default_response_class=TimedJSONResponse)
 templates_dir = os.path.join(os.path.dirname(__file__), "templates")
 templates = Jinja2Templates(directory=templates_dir)
 # 정적 파일(static) 경로 등록
 import os
 static_dir = os.path.join(os.path.dirname(__file__), "static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+app.mount("/static", PrecompressedStaticFiles(static_dir), name="static")
 
 @app.get("/")
 async def index():
@@ -97,6 +107,25 @@ career_midgoal_prompt = (
     """
 )
 
+# 7단계 실천활동 제한 조건 (전체 요약과 중간목표별 요약이 함께 사용)
+career_summary_constraints = """
+        제한 조건 (결과에 표시하지 말고 내부적으로만 참고):
+        0. 학년별 교과 활동의 경우 아래 표시한'2022 교육개편중 고등학교 교육과정' 반영하여 활동 제시
+            제한 조건 (결과에 표시하지 말고 내부적으로만 참고):
+        1. 교과 활동은 반드시 2022 개정 교육과정의 정확한 교과목명만 사용:
+            아래 형식은 **영역**:과목명.. 으로 표시
+            **국어**: 공통국어, 화법과 언어, 독서와 작문, 문학, 주제 탐구 독서, 문학과 영상, 직무 의사소통, 독서 토론과 글쓰기, 매체 의사소통, 언어생활 탐구
+            **수학**: 공통수학, 대수, 미적분, 확률과 통계, 기하, 경제 수학, 인공지능 수학, 직무수학, 수학과 문화, 실용통계, 수학과제 탐구
+            **영어**: 공통영어, 영어 독해와 작문, 영미 문학 읽기, 영어 발표와 토론, 심화 영어, 직무 영어, 실생활 영어회화, 미디어 영어, 세계 문화와 영어
+            **사회**: 한국사, 통합사회, 세계시민과 지리, 세계사, 사회와 문화, 현대사회와 윤리, 한국지리 탐구, 도시의 미래 탐구, 동아시아 역사 기행, 정치, 법과 사회, 경제, 사회 문제 탐구, 윤리와 사상, 인문학과 윤리, 국제 관계의 이해, 여행지리, 역사를 탐구하는 현대 세계, 금융과 경제생활, 윤리문제 탐구, 기후변화와 지속가능한 세계
+            **과학**: 통합과학, 과학탐구실험, 물리학, 화학, 생명과학, 지구과학, 역학과 에너지, 전자기와 양자, 물질과 에너지, 화학반응의 세계, 세포와 물질대사, 생물의 유전, 지구 시스템과학, 행성우주과학, 과학의 역사와 문화, 기후변화와 환경생태, 융합과학 탐구
+            **기타**: 기술가정, 정보, 로봇과 공학세계, 생활과학 탐구, 인공지능 기초, 데이터 과학, 창의 공학 설계, 지식 재산 일반, 생애설계와 자립, 체육, 예술
+        2. 학교외에 대회나 공모전은 언급하지 않기. 학교에서 이루어질 수 있는 활동으로만 실천활동 제시하기
+        3. 자소서 등은 언급하지 않기
+        4. 고등학생 수준에서 이해 할 수 있는 탐구활동 주제 제시
+            "각 항목은 실제 입력값에 맞게 구체적으로 작성해 주세요."
+"""
+
 # 진로 가치 탐색 7단계 프롬프트 정의 (최종 통합 정리)
 career_final_summary_prompt = (
     """
@@ -141,35 +170,191 @@ career_final_summary_prompt = (
         🤝 [중간목표3] 공동체적 실천의식 함양
         🔬 실천활동1:
         
-        제한 조건 (결과에 표시하지 말고 내부적으로만 참고):
-        0. 학년별 교과 활동의 경우 아래 표시한'2022 교육개편중 고등학교 교육과정' 반영하여 활동 제시
-            제한 조건 (결과에 표시하지 말고 내부적으로만 참고):
-        1. 교과 활동은 반드시 2022 개정 교육과정의 정확한 교과목명만 사용:
-            아래 형식은 **영역**:과목명.. 으로 표시
-            **국어**: 공통국어, 화법과 언어, 독서와 작문, 문학, 주제 탐구 독서, 문학과 영상, 직무 의사소통, 독서 토론과 글쓰기, 매체 의사소통, 언어생활 탐구
-            **수학**: 공통수학, 대수, 미적분, 확률과 통계, 기하, 경제 수학, 인공지능 수학, 직무수학, 수학과 문화, 실용통계, 수학과제 탐구
-            **영어**: 공통영어, 영어 독해와 작문, 영미 문학 읽기, 영어 발표와 토론, 심화 영어, 직무 영어, 실생활 영어회화, 미디어 영어, 세계 문화와 영어
-            **사회**: 한국사, 통합사회, 세계시민과 지리, 세계사, 사회와 문화, 현대사회와 윤리, 한국지리 탐구, 도시의 미래 탐구, 동아시아 역사 기행, 정치, 법과 사회, 경제, 사회 문제 탐구, 윤리와 사상, 인문학과 윤리, 국제 관계의 이해, 여행지리, 역사를 탐구하는 현대 세계, 금융과 경제생활, 윤리문제 탐구, 기후변화와 지속가능한 세계
-            **과학**: 통합과학, 과학탐구실험, 물리학, 화학, 생명과학, 지구과학, 역학과 에너지, 전자기와 양자, 물질과 에너지, 화학반응의 세계, 세포와 물질대사, 생물의 유전, 지구 시스템과학, 행성우주과학, 과학의 역사와 문화, 기후변화와 환경생태, 융합과학 탐구
-            **기타**: 기술가정, 정보, 로봇과 공학세계, 생활과학 탐구, 인공지능 기초, 데이터 과학, 창의 공학 설계, 지식 재산 일반, 생애설계와 자립, 체육, 예술
-        2. 학교외에 대회나 공모전은 언급하지 않기. 학교에서 이루어질 수 있는 활동으로만 실천활동 제시하기
-        3. 자소서 등은 언급하지 않기
-        4. 고등학생 수준에서 이해 할 수 있는 탐구활동 주제 제시
-            "각 항목은 실제 입력값에 맞게 구체적으로 작성해 주세요."
+"""
+    + career_summary_constraints
+)
+
+# 7단계 중간목표별 실천 계획 (중간목표마다 독립 호출로 병렬 생성)
+# 공통 부분(형식 예시 + 제한 조건)은 시스템 메시지로 고정해 모든 호출이 같은 접두어를 공유
+career_summary_section_system = (
+    """너는 진로 탐색을 돕는 어시스턴트야. 고등학생의 진로 탐색 결과 중 중간목표 하나에 대한 실천활동 3개만 작성해줘.
+    중간목표와 실천활동에만 이모지를 사용하고, 최종 목표나 다른 중간목표는 쓰지 마.
+    제한조건은 결과에 표시하지 말고 내부적으로만 참고해서 작성해줘.
+    
+    # 형식 예시 (건축가를 희망하는 고등학생):
+        📚 [중간목표1] 친환경 건축 기술 역량
+        🔬 실천활동1:
+                    탐구보고서: "제로에너지 건축 기술의 실제 적용 사례 분석" 등
+                    교과 활동: 과학 - '에너지 전환' 단원 [심화]
+                    비교과: 에너지 창의 설계 캠프 참가 - [문제 해결력 성장과 관련]
+        🔬 실천활동2:
+                    탐구보고서:
+                    교과 활동:
+                    비교과:
+        🔬 실천활동3:
+                    탐구보고서:
+                    교과 활동:
+                    비교과:
+"""
+    + career_summary_constraints
+)
+
+career_summary_section_prompt = (
+    """
+    7단계 - 중간목표별 실천 계획.
+    지금까지 선택한 직업: '{career}', 이유: {reasons}, 이슈: '{issue}', 탐구 주제: '{topic}',
+    최종 목표: '{goal}', 전체 중간 목표: {midgoals}
+    
+    위 중간 목표 중 [중간목표{number}] '{midgoal}' 하나에 대해서만 실천활동 3개를 작성해 주세요.
+    다른 중간목표에서 다룰 활동과 겹치지 않도록 이 중간목표에 맞는 활동만 제시해 주세요.
+    첫 줄은 '{emoji} [중간목표{number}] {midgoal}' 형식으로 시작해 주세요.
     """
 )
 
+# 중간목표 번호별 이모지 (전체 요약 예시와 동일한 순서)
+SUMMARY_SECTION_EMOJIS = ['📚', '🎨', '🤝', '💼', '🚀']
+# 중간목표별 호출 한 번의 최대 토큰 수
+SUMMARY_SECTION_MAX_TOKENS = 1500
+# 중간목표 하나를 생성하지 못했을 때 그 자리에 들어가는 문구
+SUMMARY_SECTION_FALLBACK = "실천활동을 불러오지 못했습니다."
+# 최종 요약을 중간목표별 병렬 호출로 생성할지 여부 (기본은 기존처럼 한 번에 생성, 1이면 병렬 생성)
+SECTIONED_FINAL_SUMMARY = os.getenv("HS_SECTIONED_SUMMARY", "0") == "1"
+# 6단계 화면을 보여주는 동안 최종 요약을 미리 생성할지 여부
+SPECULATIVE_FINAL_SUMMARY = os.getenv("HS_SPECULATIVE_SUMMARY", "1") == "1"
+
+
+
+# 이 헤더가 "1"이면 전체 페이지 대신 현재 단계 조각만 렌더링
+FLOW_FRAGMENT_HEADER = "x-flow-fragment"
+
+
+def render_flow(context: dict, state) -> HTMLResponse:
+    """단계 화면 렌더링 후 흐름 상태 저장 (조각 요청이면 단계 영역만 렌더링)"""
+    # 검증 오류 화면의 값은 상태에 반영하지 않음
+    if not context.get("error"):
+        state.update_from_context(context)
+    
+    request = context["request"]
+    if request.headers.get(FLOW_FRAGMENT_HEADER) == "1":
+        template_name = "_career_flow_step.html"
+    else:
+        template_name = "career_flow_allinone.html"
+    
+    with span("template_render"):
+        response = templates.TemplateResponse(template_name, context)
+    response.set_cookie(FLOW_COOKIE_NAME, state.flow_id, max_age=FLOW_IDLE_TTL, httponly=True, samesite="lax")
+    return response
+
+
+def warm_up() -> dict:
+    """서버 예열: 한글 폰트 등록, 단계 화면 템플릿 컴파일, LLM API 연결 (루트 앱 lifespan에서 호출)"""
+    steps = {
+        "fonts": lambda: pdf_generator.font_name,
+        "templates": lambda: [templates.get_template(name) for name in ("career_flow_allinone.html", "_career_flow_step.html")],
+    }
+    if LLM_WARMUP_ENABLED:
+        steps["llm_connection"] = lambda: warm_up_connection(client, LLM_WARMUP_TIMEOUT)
+    return run_steps(steps)
+
+
+async def remembered_gpt_list(state, name: str, inputs: dict, refresh: bool = False, **gpt_kwargs):
+    """
+    같은 입력으로 생성한 결과가 흐름 상태에 있으면 재사용하고, 없을 때(또는 재생성 요청 시)만 GPT 호출
+    call_gpt_list는 재시도 대기와 헤지 대기가 있는 동기 함수이므로 스레드에서 실행 (이벤트 루프를 막지 않음)
+    """
+    value = None if refresh else state.recall(name, inputs)
+    if not refresh:
+        record_cache("hs_flow_results", value is not None)
+    if value is None:
+        gpt_kwargs.setdefault("call_site", f"high_school.{name}")
+        value = await asyncio.to_thread(call_gpt_list, **gpt_kwargs)
+        # 실패 시 기본값은 기억하지 않음 (다음 요청에서 다시 시도)
+        if value != gpt_kwargs.get("fallback"):
+            state.remember(name, inputs, value)
+    return value
+
+
+def final_summary_inputs(career, reasons, issues_selected, topic, goal, midgoals) -> dict:
+    """7단계 최종 요약을 생성하는 입력 (결과 재사용·선행 생성의 기준)"""
+    return {
+        "career": career, "reasons": reasons, "issue": issues_selected[0] if issues_selected else "",
+        "topic": topic, "goal": goal, "midgoals": midgoals
+    }
+
+
+def failed_summary_sections(lines) -> List[int]:
+    """최종 요약에서 생성에 실패한 중간목표 번호 목록 (중간목표만 다시 생성하도록 안내)"""
+    failed, number = [], None
+    for line in lines or []:
+        match = re.search(r'\[중간목표\s*(\d+)\]', line)
+        if match:
+            number = int(match.group(1))
+        elif line.strip() == SUMMARY_SECTION_FALLBACK and number is not None and number not in failed:
+            failed.append(number)
+    return failed
+
+
+def parse_section_number(value, midgoals) -> Optional[int]:
+    """부분 재생성할 중간목표 번호 (1 ~ 중간목표 수 범위의 정수가 아니면 None)"""
+    try:
+        number = int(str(value).strip())
+    except ValueError:
+        return None
+    return number if midgoals and 0 < number <= len(midgoals) else None
+
+
+def failed_sections_message(failed: List[int]) -> str:
+    numbers = ', '.join(f"중간목표{number}" for number in failed)
+    return f"{numbers}의 실천활동을 만들지 못했습니다. 아래 '중간목표만 다시 생성' 버튼으로 다시 시도해주세요."
+
+
+async def build_final_summary(state, summary_inputs: dict):
+    """
+    7단계 최종 요약 생성 후 흐름 상태에 기억 (중간목표별 병렬 생성 또는 한 번에 생성)
+    실패한 중간목표가 있는 요약은 기억하지 않음 (failed_summary_sections로 확인 후 해당 중간목표만 다시 생성)
+    """
+    fallback = ["최종 요약을 불러오지 못했습니다."]
+    if SECTIONED_FINAL_SUMMARY and summary_inputs["midgoals"]:
+        final_summary_text = await generate_final_summary_sections(**summary_inputs)
+    else:
+        final_summary_text = await asyncio.to_thread(
+            call_gpt_list,
+            prompt=career_final_summary_prompt.format(**summary_inputs),
+            system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자의 진로 탐색 결과를 종합하여 체계적으로 정리해줘. 최종목표, 중간목표, 실천활동에만 이모지를 사용하고, 제한조건은 결과에 표시하지 말고 내부적으로만 참고해서 작성해줘.",
+            max_completion_tokens=None,  # 무제한 토큰 사용
+            fallback=fallback,
+            strip_chars='',
+            call_site="high_school.final_summary"
+        )
+    if final_summary_text != fallback and not failed_summary_sections(final_summary_text):
+        state.remember("final_summary", summary_inputs, final_summary_text)
+    return final_summary_text
+
+
+def start_speculative_summary(state, summary_inputs: dict) -> None:
+    """6단계 중간목표를 보여주는 동안 7단계 최종 요약을 미리 생성 (중간목표가 바뀌면 이전 작업 취소)"""
+    if not SPECULATIVE_FINAL_SUMMARY or not summary_inputs["midgoals"]:
+        return
+    if state.recall("final_summary", summary_inputs) is not None:
+        return
+    speculative_tasks.start(
+        state.flow_id, "final_summary", summary_inputs,
+        lambda: build_final_summary(state, summary_inputs)
+    )
 
 
 @app.get("/career/flow", response_class=HTMLResponse)
 async def career_flow_get(request: Request):
+    # 처음 화면에 들어오면 새 흐름 시작
+    state = flow_store.create()
+    mark_stage("high", state.flow_id, "start")
     now = datetime.now().timestamp()
-    return templates.TemplateResponse("career_flow_allinone.html", {
+    return render_flow({
         "request": request, 
         "step": 1, 
         "start_time": now, 
         "step_start_time": now
-    })
+    }, state)
 
 @app.post("/career/flow", response_class=HTMLResponse)
 async def career_flow_post(
@@ -189,6 +374,21 @@ async def career_flow_post(
     now = datetime.now().timestamp()
     context = {"request": request, "step": step}
     
+    # 쿠키의 흐름 ID로 서버 측 상태 조회 - 이전 단계 값은 폼 대신 상태에서 가져옴
+    state = flow_store.get_or_create(request.cookies.get(FLOW_COOKIE_NAME))
+    # 폼의 start_time/step_start_time 대신 서버 시각으로 단계 시간 기록
+    mark_stage("high", state.flow_id, f"step_{step}" if 1 <= step <= 7 else "step_other")
+    if step > 1:
+        career = career or state.career
+    if step > 2:
+        reasons = reasons or state.reasons or None
+    if step > 4:
+        topic = topic or state.topic
+    if step > 5:
+        goal = goal or state.goal
+        midgoals = midgoals or state.midgoals or None
+    start_time = start_time or state.start_time
+    
     # start_time 관리
     if not start_time:
         start_time = now
@@ -202,7 +402,7 @@ async def career_flow_post(
     if step == 1:
         if not career:
             context.update({"error": "직업을 입력하세요."})
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         choices = career_value_choices
         chatbot_message = f"'{career}'(을)를 선택하셨군요. 이 직업을 선택한 이유를 알려주세요!"
         context.update({
@@ -211,7 +411,7 @@ async def career_flow_post(
             "choices": choices, 
             "chatbot_message": chatbot_message
         })
-        return templates.TemplateResponse("career_flow_allinone.html", context)
+        return render_flow(context, state)
     # 2단계: 이유 복수 선택
     elif step == 2:
         if not (career and reasons):
@@ -221,10 +421,11 @@ async def career_flow_post(
                 "choices": career_value_choices, 
                 "error": "이유를 한 가지 이상 선택하세요."
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         chatbot_message = f"{', '.join(reasons)}(을)를 선택하셨군요. 이제 {career}와 관련된 최신 이슈를 골라볼까요?"
-        # 3단계로 이동 (OpenAI API로 이슈 생성)
-        issues = call_gpt_list(
+        # 3단계로 이동 (OpenAI API로 이슈 생성, 같은 선택으로 다시 온 경우 이전 결과 재사용)
+        issues = await remembered_gpt_list(
+            state, "issues", {"career": career, "reasons": reasons},
             prompt=career_issue_prompt.format(career=career, reasons=', '.join(reasons) if reasons else ''),
             system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자가 선택한 직업과 관련된 최신 이슈나 해결 과제 5가지를 한국어로 간결하게 제시해줘.",
             
@@ -240,7 +441,7 @@ async def career_flow_post(
             "chatbot_message": chatbot_message,
             
         })
-        return templates.TemplateResponse("career_flow_allinone.html", context)
+        return render_flow(context, state)
     # 3단계: 이슈 선택
     elif step == 3:
         form = await request.form()
@@ -250,7 +451,7 @@ async def career_flow_post(
         # '다시 생성' 버튼 처리
         if regenerate == "yes":
             # 기존 이슈들을 폼에서 받아옴 (현재 페이지에 표시된 이슈들)
-            current_issues = form.getlist("current_issues") or []
+            current_issues = form.getlist("current_issues") or state.issues
             existing_issues_text = "\\n".join([f"- {issue}" for issue in current_issues]) if current_issues else ""
             
             # 새로운 프롬프트로 기존 이슈와 다른 이슈 생성
@@ -263,7 +464,8 @@ async def career_flow_post(
             {existing_issues_text}
            """
             
-            issues = call_gpt_list(
+            issues = await remembered_gpt_list(
+                state, "issues", {"career": career, "reasons": reasons}, refresh=True,
                 prompt=regenerate_prompt,
                 system_message="너는 진로 탐색을 돕는 창의적인 어시스턴트야. 기존과는 완전히 다른 새로운 관점의 이슈 5가지를 한국어로 간결하게 제시해줘. 기존 이슈와 유사하거나 중복되는 내용은 절대 피해줘.",
                 max_completion_tokens=3000,
@@ -281,21 +483,22 @@ async def career_flow_post(
                 "issues_selected": [],
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         if not (career and reasons and issues_selected):
             context.update({
                 "step": 3, 
                 "career": career, 
                 "reasons": reasons, 
-                "issues": context.get("issues", []), 
+                "issues": state.recall("issues", {"career": career, "reasons": reasons}) or state.issues, 
                 "error": "이슈를 한 가지 이상 선택하세요.", 
                 "issues_selected": issues_selected,
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         chatbot_message = f"{', '.join(issues_selected)}(을)를 선택하셨군요. 이 이슈들에 대해 탐구하고 싶은 주제를 골라주세요!"
         # 4단계로 이동 (OpenAI API로 탐구 주제 생성, 첫 번째 이슈만 사용)
-        topics = call_gpt_list(
+        topics = await remembered_gpt_list(
+            state, "topics", {"career": career, "reasons": reasons, "issue": issues_selected[0]},
             prompt=career_topic_prompt.format(career=career, reasons=', '.join(reasons) if reasons else '', issue=issues_selected[0]),
             system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자가 선택한 이슈에 대해 구체적으로 탐구 가능한 주제 5가지를 한국어로 간결하게 제시해줘.",
             
@@ -312,19 +515,19 @@ async def career_flow_post(
             "chatbot_message": chatbot_message,
             
         })
-        return templates.TemplateResponse("career_flow_allinone.html", context)
+        return render_flow(context, state)
     # 4단계: 탐구 주제 선택
     elif step == 4:
         form = await request.form()
         regenerate = form.get("regenerate")
         topic = form.get("topic") # type: ignore
         # issues_selected를 hidden input에서 받아옴
-        issues_selected = form.getlist("issues_selected")
+        issues_selected = form.getlist("issues_selected") or state.issues_selected
         
         # '다시 생성' 버튼 처리
         if regenerate == "yes":
             # 기존 주제들을 폼에서 받아옴
-            current_topics = form.getlist("current_topics") or []
+            current_topics = form.getlist("current_topics") or state.topics
             existing_topics_text = "\\n".join([f"- {topic}" for topic in current_topics]) if current_topics else ""
             
             # 새로운 프롬프트로 기존 주제와 다른 주제 생성
@@ -337,7 +540,8 @@ async def career_flow_post(
             {existing_topics_text}
             """
             
-            topics = call_gpt_list(
+            topics = await remembered_gpt_list(
+                state, "topics", {"career": career, "reasons": reasons, "issue": issues_selected[0]}, refresh=True,
                 prompt=regenerate_prompt,
                 system_message="너는 진로 탐색을 돕는 창의적인 어시스턴트야. 기존과는 완전히 다른 새로운 방법론의 탐구 주제 5가지를 한국어로 간결하게 제시해줘. 기존 주제와 유사하거나 중복되는 내용은 절대 피해줘.",
                 max_completion_tokens=2500,
@@ -355,52 +559,36 @@ async def career_flow_post(
                 "chatbot_message": chatbot_message,
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         
-        # 주제 선택 검증 (재생성이 아닌 경우에만)
+        # 주제 선택 검증 (재생성이 아닌 경우에만) - 오류 화면은 마지막으로 생성한 주제 목록을 그대로 표시
+        topic_inputs = {"career": career, "reasons": reasons, "issue": issues_selected[0] if issues_selected else None}
         if not (career and reasons and issues_selected):
-            # 기본 topics 생성해서 에러 상황에서도 표시
-            topics = call_gpt_list(
-                prompt=career_topic_prompt.format(career=career, reasons=', '.join(reasons) if reasons else '', issue=issues_selected[0] if issues_selected else "일반적인 주제"),
-                system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자가 선택한 이슈에 대해 구체적으로 탐구 가능한 주제 5가지를 한국어로 간결하게 제시해줘.",
-                
-                max_completion_tokens=2500,
-                fallback=["주제를 불러오지 못했습니다."],
-                strip_chars='-•[]1234567890. '
-            )
             context.update({
                 "step": 4, 
                 "career": career, 
                 "reasons": reasons, 
                 "issues_selected": issues_selected, 
-                "topics": topics, 
+                "topics": state.topics, 
                 "error": "이전 단계 정보가 누락되었습니다.",
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         
         if not topic:
-            # 주제가 선택되지 않은 경우, 기본 topics 생성
-            topics = call_gpt_list(
-                prompt=career_topic_prompt.format(career=career, reasons=', '.join(reasons) if reasons else '', issue=issues_selected[0]),
-                system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자가 선택한 이슈에 대해 구체적으로 탐구 가능한 주제 5가지를 한국어로 간결하게 제시해줘.",
-                
-                max_completion_tokens=2500,
-                fallback=["주제를 불러오지 못했습니다."],
-                strip_chars='-•[]1234567890. '
-            )
             context.update({
                 "step": 4, 
                 "career": career, 
                 "reasons": reasons, 
                 "issues_selected": issues_selected, 
-                "topics": topics, 
+                "topics": state.recall("topics", topic_inputs) or state.topics, 
                 "error": "주제를 선택하세요.",
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         # 5단계: GPT가 제시하는 진로 목표
-        suggested_goal_list = call_gpt_list(
+        suggested_goal_list = await remembered_gpt_list(
+            state, "suggested_goal", dict(topic_inputs, topic=topic),
             prompt=career_goal_prompt.format(career=career, reasons=reasons, issue=issues_selected[0], topic=topic),
             system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자의 선택을 바탕으로 적절한 진로 목표를 한 문장으로 제시해줘.",
             
@@ -420,13 +608,13 @@ async def career_flow_post(
             "chatbot_message": chatbot_message,
             
         })
-        return templates.TemplateResponse("career_flow_allinone.html", context)
+        return render_flow(context, state)
     # 5단계: 진로 목표 확인 및 재생성
     elif step == 5:
         form = await request.form()
-        suggested_goal = form.get("suggested_goal")
+        suggested_goal = form.get("suggested_goal") or state.suggested_goal
         regenerate = form.get("regenerate")
-        issues_selected = form.getlist("issues_selected")
+        issues_selected = form.getlist("issues_selected") or state.issues_selected
         if regenerate == "yes":
             # 기존 목표를 폼에서 받아옴
             current_goal = form.get("current_goal") or suggested_goal or ""
@@ -443,7 +631,9 @@ async def career_flow_post(
             """
             
             # 목표 재생성
-            suggested_goal_list = call_gpt_list(
+            suggested_goal_list = await remembered_gpt_list(
+                state, "suggested_goal",
+                {"career": career, "reasons": reasons, "issue": issues_selected[0], "topic": topic}, refresh=True,
                 prompt=regenerate_prompt,
                 system_message="너는 진로 탐색을 돕는 창의적인 어시스턴트야. 기존과는 완전히 다른 새로운 관점의 진로 목표를 한 문장으로 제시해줘. 기존 목표와 유사하거나 중복되는 내용은 절대 피해줘.",
                 max_completion_tokens=1000,
@@ -463,12 +653,14 @@ async def career_flow_post(
                 "chatbot_message": chatbot_message,
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
         # 사용자가 목표를 수락
         goal = str(suggested_goal) if suggested_goal is not None else None
         chatbot_message = f"'{goal}'(을)를 목표로 하셨군요. 이제 중간 목표 5가지를 제시해드릴게요."
         # 6단계로 이동 (OpenAI API로 중간 목표 생성)
-        midgoals = call_gpt_list(
+        midgoals = await remembered_gpt_list(
+            state, "midgoals",
+            {"career": career, "reasons": reasons, "issue": issues_selected[0], "topic": topic, "goal": goal},
             prompt=career_midgoal_prompt.format(career=career, reasons=reasons, issue=issues_selected[0], topic=topic, goal=goal),
             system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자의 최종 목표를 실현하기 위한 중간 목표 5가지를 한국어로 간결하게 제시해줘.",
             
@@ -487,12 +679,14 @@ async def career_flow_post(
             "chatbot_message": chatbot_message,
             
         })
-        return templates.TemplateResponse("career_flow_allinone.html", context)
+        # 학생이 중간목표를 읽는 동안 7단계 최종 요약을 미리 생성
+        start_speculative_summary(state, final_summary_inputs(career, reasons, issues_selected, topic, goal, midgoals))
+        return render_flow(context, state)
     # 6단계: 중간 목표 제시 및 재생성 (선택 아님, 제시만)
     elif step == 6:
         form = await request.form()
         regenerate = form.get("regenerate")
-        issues_selected = form.getlist("issues_selected")
+        issues_selected = form.getlist("issues_selected") or state.issues_selected
         # 재생성 요청 시 midgoals 새로 생성
         if regenerate == "yes":
             # 기존 중간 목표들을 폼에서 받아옴
@@ -513,7 +707,9 @@ async def career_flow_post(
             {existing_midgoals_text}
             """
             
-            midgoals = call_gpt_list(
+            midgoals = await remembered_gpt_list(
+                state, "midgoals",
+                {"career": career, "reasons": reasons, "issue": issues_selected[0], "topic": topic, "goal": goal}, refresh=True,
                 prompt=regenerate_prompt,
                 system_message="너는 진로 탐색을 돕는 창의적인 어시스턴트야. 기존과는 완전히 다른 새로운 방법론의 중간 목표 3가지를 한국어로 간결하게 제시해줘. 기존 목표와 유사하거나 중복되는 내용은 절대 피해줘.",
                 max_completion_tokens=3000,
@@ -533,27 +729,36 @@ async def career_flow_post(
                 "chatbot_message": chatbot_message,
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            # 중간목표가 바뀌었으므로 이전 목표로 시작한 선행 생성은 취소하고 새로 시작
+            start_speculative_summary(state, final_summary_inputs(career, reasons, issues_selected, topic, goal, midgoals))
+            return render_flow(context, state)
         
         # "다음" 버튼을 누르면 7단계로 이동
         chatbot_message = "드림로직이 모두 완료되었습니다! 아래는 당신의 진로 탐색 결과입니다."
         # 최종 요약 생성
-        final_summary_text = call_gpt_list(
-            prompt=career_final_summary_prompt.format(
-                career=career, 
-                reasons=reasons, 
-                issue=issues_selected[0] if issues_selected else "", 
-                topic=topic, 
-                goal=goal, 
-                midgoals=midgoals
-            ),
-            system_message="너는 진로 탐색을 돕는 어시스턴트야. 사용자의 진로 탐색 결과를 종합하여 체계적으로 정리해줘. 최종목표, 중간목표, 실천활동에만 이모지를 사용하고, 제한조건은 결과에 표시하지 말고 내부적으로만 참고해서 작성해줘.",
-            
-            max_completion_tokens=None,  # 무제한 토큰 사용
-            fallback=["최종 요약을 불러오지 못했습니다."],
-            strip_chars=''
-        )
+        summary_inputs = final_summary_inputs(career, reasons, issues_selected, topic, goal, midgoals)
+        final_summary_text = state.recall("final_summary", summary_inputs)
+        if final_summary_text is None:
+            # 6단계 화면을 보는 동안 미리 시작해 둔 생성 작업이 있으면 그 결과를 기다림
+            task = speculative_tasks.take(state.flow_id, "final_summary", summary_inputs)
+            if task is not None:
+                try:
+                    final_summary_text = await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    if not task.cancelled():
+                        raise
+                    final_summary_text = None
+                except Exception as e:
+                    print(f"⚠️ 미리 생성한 최종 요약 사용 실패: {e}")
+                    final_summary_text = None
+                if final_summary_text == ["최종 요약을 불러오지 못했습니다."]:
+                    final_summary_text = None
+        if final_summary_text is None:
+            final_summary_text = await build_final_summary(state, summary_inputs)
         final_summary = '\n'.join(final_summary_text) if final_summary_text else "최종 요약을 불러오지 못했습니다."
+        failed_sections = failed_summary_sections(final_summary_text)
+        if failed_sections:
+            chatbot_message = failed_sections_message(failed_sections)
         
         context.update({
             "step": 7, 
@@ -567,18 +772,69 @@ async def career_flow_post(
             "chatbot_message": chatbot_message,
             
         })
-        return templates.TemplateResponse("career_flow_allinone.html", context)
+        return render_flow(context, state)
         
     # 7단계: 최종 통합 요약 재생성
     elif step == 7:
         form = await request.form()
         regenerate = form.get("regenerate")
-        issues_selected = form.getlist("issues_selected")
+        issues_selected = form.getlist("issues_selected") or state.issues_selected
+        
+        # 중간목표 하나만 다시 생성 (나머지 요약은 고정된 맥락으로 전달하고 결과만 끼워 넣음)
+        regenerate_section = form.get("regenerate_section")
+        if regenerate_section and state.final_summary:
+            number = parse_section_number(regenerate_section, midgoals)
+            final_summary = state.final_summary
+            error = None
+            status_code = 200
+            chatbot_message = f"중간목표{number}의 실천활동을 새롭게 제안합니다."
+            if number is None:
+                # 화면의 버튼으로는 만들 수 없는 값 (1 ~ 중간목표 수 범위의 정수만 허용)
+                error = "다시 생성할 중간목표를 찾을 수 없습니다. 화면의 버튼을 이용해주세요."
+                status_code = 400
+            else:
+                summary_inputs = final_summary_inputs(career, reasons, issues_selected, topic, goal, midgoals)
+                section_lines, failed = await generate_summary_section(
+                    number, midgoals[number - 1], career, reasons, summary_inputs["issue"], topic, goal, midgoals,
+                    current_plan=state.final_summary
+                )
+                if failed:
+                    error = f"중간목표{number}을(를) 다시 만들지 못했습니다. 잠시 후 다시 시도해주세요."
+                else:
+                    try:
+                        final_summary = replace_goal_section(state.final_summary, number, '\n'.join(section_lines),
+                                                             HIGH_SCHOOL_EPILOGUE_MARKERS)
+                        # 아직 실패한 다른 중간목표가 남아 있으면 기억하지 않고 안내
+                        failed_sections = failed_summary_sections(final_summary.split('\n'))
+                        if failed_sections:
+                            chatbot_message = failed_sections_message(failed_sections)
+                        else:
+                            state.remember("final_summary", summary_inputs, final_summary.split('\n'))
+                    except ValueError:
+                        error = f"중간목표{number}을(를) 찾을 수 없습니다. 전체 '다시 생성'을 이용해주세요."
+            
+            context.update({
+                "step": 7, 
+                "career": career, 
+                "reasons": reasons, 
+                "issues_selected": issues_selected, 
+                "topic": topic, 
+                "goal": goal, 
+                "midgoals": midgoals,
+                "final_summary": final_summary,
+                "chatbot_message": None if error else chatbot_message,
+                
+            })
+            if error:
+                context["error"] = error
+            response = render_flow(context, state)
+            response.status_code = status_code
+            return response
         
         # 재생성 요청 시에만 처리
         if regenerate == "yes":
             # 기존 최종 요약을 폼에서 받아옴
-            current_summary = form.get("current_summary") or ""
+            current_summary = form.get("current_summary") or state.final_summary or ""
             
             # 새로운 프롬프트로 기존 요약과 다른 요약 생성
             regenerate_prompt = f"""
@@ -645,7 +901,9 @@ async def career_flow_post(
             """
             
             # 최종 요약 재생성
-            final_summary_text = call_gpt_list(
+            summary_inputs = final_summary_inputs(career, reasons, issues_selected, topic, goal, midgoals)
+            final_summary_text = await remembered_gpt_list(
+                state, "final_summary", summary_inputs, refresh=True,
                 prompt=regenerate_prompt,
                 system_message="너는 진로 탐색을 돕는 창의적인 어시스턴트야. 기존과는 완전히 다른 새로운 관점의 실천활동들을 포함하여 사용자의 진로 탐색 결과를 종합하여 체계적으로 정리해줘. 최종목표, 중간목표, 실천활동에만 이모지를 사용하고, 제한조건은 결과에 표시하지 말고 내부적으로만 참고해서 작성해줘.",
                 max_completion_tokens=None,  # 무제한 토큰 사용
@@ -668,29 +926,59 @@ async def career_flow_post(
                 "chatbot_message": chatbot_message,
                 
             })
-            return templates.TemplateResponse("career_flow_allinone.html", context)
+            return render_flow(context, state)
+        
+        # 재생성이 아닌 요청(새로고침, 뒤로 가기 후 재전송)은 저장된 최종 요약을 그대로 표시
+        context.update({
+            "step": 7, 
+            "career": career, 
+            "reasons": reasons, 
+            "issues_selected": issues_selected, 
+            "topic": topic, 
+            "goal": goal, 
+            "midgoals": midgoals,
+            "final_summary": state.final_summary,
+            
+        })
+        return render_flow(context, state)
 
 
 @app.post("/career/download-pdf")
 async def download_pdf(
-    career: str = Form(...),
-    reasons: List[str] = Form(...),
-    issues_selected: List[str] = Form(...),
-    topic: str = Form(...),
-    goal: str = Form(...),
-    midgoals: List[str] = Form(...),
-    final_summary: str = Form(...)
+    request: Request,
+    background_tasks: BackgroundTasks,
+    career: Optional[str] = Form(None),
+    reasons: Optional[List[str]] = Form(None),
+    issues_selected: Optional[List[str]] = Form(None),
+    topic: Optional[str] = Form(None),
+    goal: Optional[str] = Form(None),
+    midgoals: Optional[List[str]] = Form(None),
+    final_summary: Optional[str] = Form(None)
 ):
-    """7단계 결과를 PDF로 다운로드"""
+    """7단계 결과를 PDF로 다운로드 (폼에 없는 값은 흐름 상태에서 가져옴)"""
     try:
+        state = flow_store.get(request.cookies.get(FLOW_COOKIE_NAME))
+        if state:
+            mark_stage("high", state.flow_id, "pdf")
+            career = career or state.career
+            reasons = reasons or state.reasons
+            issues_selected = issues_selected or state.issues_selected
+            topic = topic or state.topic
+            goal = goal or state.goal
+            midgoals = midgoals or state.midgoals
+            final_summary = final_summary or state.final_summary
+        
+        if not career or not final_summary:
+            return HTMLResponse("진로 탐색 결과를 찾을 수 없습니다. 7단계까지 완료한 뒤 다시 시도해 주세요.", status_code=400)
+        
         # 진로 데이터 구성
         career_data = {
             'career': career,
-            'reasons': reasons,
-            'issues_selected': issues_selected,
-            'topic': topic,
-            'goal': goal,
-            'midgoals': midgoals,
+            'reasons': reasons or [],
+            'issues_selected': issues_selected or [],
+            'topic': topic or "",
+            'goal': goal or "",
+            'midgoals': midgoals or [],
             'final_summary': final_summary
         }
         
@@ -701,6 +989,10 @@ async def download_pdf(
             # 다운로드 파일명 생성
             filename, encoded_korean_filename = pdf_generator.generate_download_filename(career)
             
+            # 번역 캐시에 없는 직업명은 응답 이후에 LLM 번역으로 보강 (다음 다운로드부터 사용)
+            if CAREER_NAME_REFINEMENT and pdf_generator.needs_translation_refinement(career):
+                background_tasks.add_task(pdf_generator.refine_career_translation, career)
+            
             # Content-Disposition 헤더 설정 (영어 파일명 + 한글 파일명 옵션)
             return FileResponse(
                 pdf_file,
@@ -718,37 +1010,26 @@ async def download_pdf(
         return HTMLResponse(f"PDF 다운로드 중 오류가 발생했습니다: {str(e)}", status_code=500)
 
 
-def call_gpt_list(prompt, system_message, max_completion_tokens=None, temperature=0.3, fallback=None, strip_chars='-•[]1234567890. '):
+def call_gpt_list(prompt, system_message, max_completion_tokens=None, temperature=0.3, fallback=None, strip_chars='-•[]1234567890. ', call_site="high_school.default"):
     """
     GPT 모델로 리스트 형태의 응답을 받아 파싱하는 헬퍼 함수
     웹 배포 환경에서의 안정성을 위해 재시도 로직과 향상된 에러 처리 추가
     max_completion_tokens=None으로 설정하면 무제한 토큰 사용
+    모델, 파라미터 형식, 타임아웃은 call_site에 해당하는 라우팅 표 설정을 따름
     """
     import time
     
     for attempt in range(3):  # 최대 3번 재시도
         try:
-            # GPT-5 모델일 때 토큰 수를 50%로 줄임
-            adjusted_tokens = max_completion_tokens
-            if max_completion_tokens is not None and DEFAULT_GPT_MODEL == "gpt-5":
-                adjusted_tokens = int(max_completion_tokens * 0.5)
-            
-            # API 호출 매개변수 준비
-            api_params = {
-                "model": DEFAULT_GPT_MODEL,
-                "messages": [
+            chat_completion = llm_gateway.chat(
+                client, call_site,
+                messages=[
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": prompt},
                 ],
-                "temperature": temperature,
-                "timeout": 30  # 30초 타임아웃 설정
-            }
-            
-            # max_completion_tokens가 None이 아닌 경우에만 추가
-            if adjusted_tokens is not None:
-                api_params["max_completion_tokens"] = adjusted_tokens
-            
-            chat_completion = client.chat.completions.create(**api_params)
+                max_tokens=max_completion_tokens,
+                temperature=temperature
+            )
             
             content = chat_completion.choices[0].message.content or ""
             lines = content.split('\n')
@@ -771,13 +1052,73 @@ def call_gpt_list(prompt, system_message, max_completion_tokens=None, temperatur
                 items = fallback
             return items
             
+        except CircuitOpenError as e:
+            # 장애 중에는 재시도·대기 없이 바로 폴백 반환
+            print(f"GPT API 호출 생략: {str(e)}")
+            record_fallback(call_site, e)
+            return fallback if fallback else [f"이슈를 불러오는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."]
         except Exception as e:
             print(f"GPT API 호출 시도 {attempt + 1}/3 실패: {str(e)}")
             if attempt < 2:  # 마지막 시도가 아니면 잠시 대기
+                LLM_RETRIES.inc(call_site=call_site)
                 time.sleep(2 ** attempt)  # 지수 백오프: 2초, 4초
             else:
                 # 모든 시도 실패 시 폴백 반환
-                error_message = f"API 호출 실패 (모델: {DEFAULT_GPT_MODEL}): {str(e)}"
+                error_message = f"API 호출 실패 ({call_site}): {str(e)}"
                 print(error_message)
+                record_fallback(call_site, e)
                 return fallback if fallback else [f"이슈를 불러오는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."]
 
+
+async def generate_summary_section(number, midgoal, career, reasons, issue, topic, goal, midgoals, current_plan=None):
+    """
+    7단계 최종 요약의 중간목표 하나를 생성
+    current_plan을 주면 나머지 계획을 고정된 맥락으로 보고 해당 중간목표만 새로 작성 (부분 재생성)
+    반환값은 (중간목표 제목으로 시작하는 줄 목록, 실패 여부)
+    """
+    emoji = SUMMARY_SECTION_EMOJIS[(number - 1) % len(SUMMARY_SECTION_EMOJIS)]
+    section_fallback = [SUMMARY_SECTION_FALLBACK]
+    prompt = career_summary_section_prompt.format(
+        career=career, reasons=reasons, issue=issue, topic=topic, goal=goal,
+        midgoals=midgoals, number=number, midgoal=midgoal, emoji=emoji
+    )
+    if current_plan:
+        prompt += f"""
+    현재 계획 (다른 중간목표는 그대로 유지됩니다):
+    {current_plan}
+    
+    **중요**: 지금의 [중간목표{number}] 실천활동과는 완전히 다른 새로운 활동을 제시하고, 다른 중간목표의 활동과도 겹치지 않게 해주세요.
+    """
+    items = await asyncio.to_thread(
+        call_gpt_list,
+        prompt=prompt,
+        system_message=career_summary_section_system,
+        max_completion_tokens=SUMMARY_SECTION_MAX_TOKENS,
+        temperature=0.5 if current_plan else 0.3,
+        fallback=section_fallback,
+        strip_chars='',
+        call_site="high_school.summary_section"
+    )
+    # 모델이 다른 목표 제목을 덧붙이는 경우 제거하고, 중간목표 제목 줄은 항상 앞에 둠
+    heading = f"{emoji} [중간목표{number}] {midgoal}"
+    body = [line for line in items if '[최종 목표' not in line and '[중간목표' not in line]
+    return [heading] + body, items == section_fallback
+
+
+async def generate_final_summary_sections(career, reasons, issue, topic, goal, midgoals):
+    """
+    7단계 최종 요약을 중간목표별 독립 호출로 동시에 생성한 뒤 기존 요약 형식으로 이어 붙임
+    전체 소요 시간이 중간목표 하나를 생성하는 시간에 가까워짐
+    반환값은 call_gpt_list와 같은 줄 목록 (모든 호출이 실패하면 fallback)
+    """
+    results = await asyncio.gather(*(
+        generate_summary_section(i, midgoal, career, reasons, issue, topic, goal, midgoals)
+        for i, midgoal in enumerate(midgoals, 1)
+    ))
+    if not results or all(failed for _, failed in results):
+        return ["최종 요약을 불러오지 못했습니다."]
+    
+    lines = [f"🎯 [최종 목표(꿈)] {goal}"]
+    for section_lines, _ in results:
+        lines.extend(section_lines)
+    return lines
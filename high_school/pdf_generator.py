@@ -7,6 +7,7 @@ import tempfile
 import os
 import re
 import urllib.parse
+from functools import cached_property
 from typing import Dict, List, Optional
 from datetime import datetime, timezone, timedelta
 
@@ -19,29 +20,36 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.rl_config import defaultEncoding
 
-from openai import OpenAI
 from dotenv import load_dotenv
 
-# OpenAI 클라이언트 설정
+from common.dream_logic import HIGH_SCHOOL_EPILOGUE_MARKERS, ensure_dream_logic_tree
+from common.llm_gateway import llm_gateway
+from common.memory_report import register_structure, register_temp_files
+from common.metrics import PDF_RENDER_SECONDS, PDF_SIZE_BYTES, record_cache, timed
+from common.openai_client import LazyOpenAIClient
+from common.server_timing import span
+
+from .career_names import career_name_cache, career_to_filename_part, has_hangul
+
+# OpenAI 클라이언트 설정 (실제 클라이언트는 첫 번역 때 생성)
 load_dotenv()
 _key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=_key)
+client = LazyOpenAIClient(api_key=_key)
 
 # ReportLab 기본 인코딩을 UTF-8로 설정
 import reportlab.rl_config
 reportlab.rl_config.warnOnMissingFontGlyphs = 0
 
-# 기본 GPT 모델 설정
-DEFAULT_GPT_MODEL = "gpt-4.1-mini"
+# 번역 모델은 common.llm_gateway 라우팅 표("high_school.translation")에서 관리
 
 
 class HighSchoolCareerPDFGenerator:
     """고등학생 진로 탐색 PDF 생성기"""
     
-    def __init__(self):
-        """PDF 생성기 초기화"""
-        self.font_name = self._register_korean_font()
-        print(f"🔤 최종 사용 폰트: {self.font_name}")
+    @cached_property
+    def font_name(self) -> str:
+        """한글 폰트 이름 (처음 PDF를 만들 때 등록해 서버 시작 시간을 줄임)"""
+        return self._register_korean_font()
     
     def _register_korean_font(self) -> str:
         """한글 폰트 등록 (웹 호환성 우선)"""
@@ -237,13 +245,13 @@ class HighSchoolCareerPDFGenerator:
                 return result
             
             # 한글이 있는 경우 OpenAI로 번역
-            chat_completion = client.chat.completions.create(
-                model=DEFAULT_GPT_MODEL,
+            chat_completion = llm_gateway.chat(
+                client, "high_school.translation",
                 messages=[
                     {"role": "system", "content": "당신은 한국어 직업명을 영어로 번역하는 전문가입니다. 직업명만 간단하게 영어로 번역해주세요. 부가 설명은 하지 말고 직업명만 답변하세요."},
                     {"role": "user", "content": f"다음 한국어 직업명을 영어로 번역해주세요: {career_korean}"},
                 ],
-                max_completion_tokens=200
+                max_tokens=200
             )
             
             english_career = chat_completion.choices[0].message.content
@@ -375,7 +383,9 @@ class HighSchoolCareerPDFGenerator:
             
             print("🔨 PDF 빌드 중...")
             # PDF 빌드
-            doc.build(story)
+            with timed(PDF_RENDER_SECONDS, school="high"), span("pdf_build"):
+                doc.build(story)
+            PDF_SIZE_BYTES.observe(os.path.getsize(output_path), school="high")
             
             print(f"✅ PDF 생성 완료: {output_path}")
             return output_path
@@ -448,25 +458,17 @@ class HighSchoolCareerPDFGenerator:
         story.append(self._safe_paragraph("🎯 나만의 드림로직", styles['section_header']))
         story.append(Spacer(1, 10))
         
-        # 최종 요약을 줄바꿈으로 분리하여 처리
-        summary_lines = str(final_summary).split('\n')
+        # 최종 요약 트리 (마지막 설명 문단 "이 계획은 고등학생 ..." 이후는 epilogue로 분리되어 생략)
+        tree = ensure_dream_logic_tree(final_summary, career_data.get('final_summary_tree'), HIGH_SCHOOL_EPILOGUE_MARKERS)
         
-        for line in summary_lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # 마지막 설명 문단 제거 - "이 계획은 고등학생" 으로 시작하는 부분부터는 스킵
-            if line.startswith("이 계획은 고등학생") or "다각도로" in line or "창의적이고 실천적인" in line:
-                break
-            
+        for kind, line in tree.iter_lines(include_epilogue=False):
             clean_line = self._clean_text_for_pdf(line)
             
-            # [최종 목표(꿈)] 패턴 확인
-            if "[최종 목표(꿈)]" in line or "🎯 [최종 목표(꿈)]" in line:
+            # [최종 목표(꿈)] 라인
+            if kind == 'final_dream':
                 story.append(self._safe_paragraph(clean_line, styles['final_goal']))
-            # [중간목표] 패턴 확인
-            elif ("[중간목표" in line and "]" in line) or ("📚 [중간목표" in line) or ("🎨 [중간목표" in line) or ("🤝 [중간목표" in line):
+            # [중간목표] 라인
+            elif kind == 'goal':
                 story.append(self._safe_paragraph(clean_line, styles['mid_goal']))
             else:
                 story.append(self._safe_paragraph(clean_line, styles['normal']))
@@ -481,18 +483,16 @@ class HighSchoolCareerPDFGenerator:
         story.append(self._safe_paragraph("이 진로 계획서를 바탕으로 체계적으로 준비해나가세요.", styles['info_text']))
     
     def generate_download_filename(self, career: str) -> tuple:
-        """다운로드용 파일명 생성 (영문, 한글)"""
-        # 한글 직업명을 영어로 번역
-        english_career = self.translate_career_to_english(career)
+        """다운로드용 파일명 생성 (영문, 한글)
+        
+        LLM 호출 없이 캐시된 번역 또는 로컬 로마자 표기로 영문 파일명을 만든다.
+        """
+        record_cache("career_name", career_name_cache.get(career) is not None)
+        english_career = career_to_filename_part(career, career_name_cache)
         
         # 파일명을 영문으로 생성 (날짜만 포함, 시간 제외)
         timestamp = datetime.now().strftime('%Y%m%d')
-        
-        # 번역된 직업명이 있으면 추가, 없으면 기본 파일명
-        if english_career and english_career.strip():
-            filename = f"dreamlogic_career_report_{timestamp}_{english_career}.pdf"
-        else:
-            filename = f"dreamlogic_career_report_{timestamp}_unknown_job.pdf"
+        filename = f"dreamlogic_career_report_{timestamp}_{english_career}.pdf"
         
         # 한글 파일명도 생성 (UTF-8 인코딩)
         safe_career = re.sub(r'[^\w\s가-힣]', '', career)
@@ -501,7 +501,24 @@ class HighSchoolCareerPDFGenerator:
         encoded_korean_filename = urllib.parse.quote(korean_filename)
         
         return filename, encoded_korean_filename
+    
+    def needs_translation_refinement(self, career: str) -> bool:
+        """번역 캐시에 없는 한글 직업명인지 확인"""
+        return bool(career) and has_hangul(career) and career_name_cache.get(career) is None
+    
+    def refine_career_translation(self, career: str) -> None:
+        """LLM 번역으로 직업명 캐시 보강 (다운로드 응답 이후 백그라운드에서 실행)"""
+        if not self.needs_translation_refinement(career):
+            return
+        
+        english_career = self.translate_career_to_english(career)
+        # 번역 실패 시의 대체값은 캐시하지 않음
+        if english_career and english_career != "unknown_job" and not english_career.startswith("korean_job_"):
+            career_name_cache.set(career, english_career)
 
 
 # 전역 PDF 생성기 인스턴스
-pdf_generator = HighSchoolCareerPDFGenerator()
\ No newline at end of file
+pdf_generator = HighSchoolCareerPDFGenerator()
+register_structure("high.career_name_cache", lambda: career_name_cache._entries)
+# 다운로드 후 남은 임시 PDF 확인용
+register_temp_files("high.temp_pdfs", os.path.join(tempfile.gettempdir(), "high_school_career_*.pdf"))
\ No newline at end of file
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+PDF 파일명용 직업명 로마자 변환 / 번역 캐시 테스트 (서버 없이 실행)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from high_school.career_names import (
+    CareerNameCache, career_to_filename_part, romanize_hangul, slugify_career
+)
+
+
+def test_romanization():
+    """한글 직업명 로마자 변환 테스트"""
+    print("🧪 로마자 변환 테스트 시작")
+
+    cases = {
+        "건축가": "geonchukga",
+        "소프트웨어 개발자": "sopeuteuweeo_gaebalja",
+        "AI 연구원": "ai_yeonguwon",
+        "Data Scientist": "data_scientist",
+    }
+    for korean, expected in cases.items():
+        result = slugify_career(romanize_hangul(korean))
+        print(f"  {korean} → {result}")
+        assert result == expected
+
+    assert career_to_filename_part("!!!") == "unknown_job"
+    print("✅ 로마자 변환 테스트 통과")
+
+
+def test_persistent_cache():
+    """번역 캐시 파일 저장/재로딩 테스트"""
+    print("🧪 번역 캐시 테스트 시작")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "career_translations.json")
+        cache = CareerNameCache(cache_path)
+        assert career_to_filename_part("건축가", cache) == "geonchukga"
+
+        cache.set("건축가", "architect")
+        assert career_to_filename_part("건축가", cache) == "architect"
+
+        # 새 인스턴스에서도 유지되는지 확인
+        reloaded = CareerNameCache(cache_path)
+        assert reloaded.get("건축가") == "architect"
+        assert len(reloaded) == 1
+
+    print("✅ 번역 캐시 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_romanization()
+    test_persistent_cache()
@@ -1,25 +1,196 @@
-from fastapi import FastAPI
-from starlette.staticfiles import StaticFiles
-from starlette.responses import FileResponse
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Request
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse
 from pathlib import Path
-from elementary_school.elementary_school import app as elementary_school_app
-from middle_school.middle_school import app as middle_school_app
-from high_school.high_school import app as high_school_app
-from app1.app1 import app as app1_app
-from app2.app2 import app as app2_app
-
-app = FastAPI(title="에듀빌 드림로직")
+from common.admin import is_admin, require_admin
+from common.journey import begin_request, journey_telemetry
+from common.lazy_app import LazyApp
+from common.llm_audit import llm_audit
+from common.loop_watchdog import LOOP_WATCHDOG_ENABLED, loop_watchdog
+from common.memory_report import memory_report, register_structure, snapshot_store
+from common.metrics import HTTP_REQUEST_SECONDS, metrics
+from common.profiler import PROFILE_HEADER, request_profiler
+from common.static_assets import PrecompressedStaticFiles
+from common.server_timing import SERVER_TIMING_ENABLED, start_request
+from common.warmup import WarmUp
 
 base_dir = Path(__file__).parent
 static_dir = base_dir / "static"
 
-app.mount("/static", StaticFiles(directory=static_dir), name="main-static")
-app.mount("/elementary_school", elementary_school_app)
-app.mount("/middle_school", middle_school_app)
-app.mount("/high_school", high_school_app)
-app.mount("/app1", app1_app)
-app.mount("/app2", app2_app)
+# 지표 라벨로 쓰는 하위 앱 경로 (그 외 경로는 root로 묶어 라벨 수를 제한)
+SUB_APPS = ("elementary_school", "middle_school", "high_school", "app1", "app2", "static")
+
+# 하위 앱 (서버 시작 시가 아니라 해당 경로로 첫 요청이 올 때 import)
+sub_apps = {
+    "elementary_school": LazyApp("elementary_school.elementary_school:app"),
+    "middle_school": LazyApp("middle_school.middle_school:app"),
+    "high_school": LazyApp("high_school.high_school:app"),
+    "app1": LazyApp("app1.app1:app"),
+    "app2": LazyApp("app2.app2:app"),
+}
+
+# 전역 하위 앱 예열 인스턴스
+warmup = WarmUp(sub_apps)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작: 이벤트 루프 감시 시작, 하위 앱 예열(백그라운드) / 종료: 감시 중지, 남은 감사 로그 기록"""
+    if LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    # 예열이 끝나기 전에도 요청은 받음 (준비 상태는 /ready로 확인)
+    app.state.warmup_task = asyncio.create_task(warmup.run())
+    yield
+    loop_watchdog.stop()
+    await asyncio.to_thread(llm_audit.flush)
+
+
+app = FastAPI(title="에듀빌 드림로직", lifespan=lifespan)
+
+# 빌드된 정적 파일 (미리 압축 + 캐시 헤더, 빌드 전에는 원본 폴더)
+static_files = PrecompressedStaticFiles(static_dir)
+app.mount("/static", static_files, name="main-static")
+for name, sub_app in sub_apps.items():
+    app.mount(f"/{name}", sub_app)
+
+
+def _reportlab_fonts():
+    """하위 앱들이 등록한 PDF 폰트 (프로세스 공용, ReportLab을 아직 불러오지 않았으면 빈 목록)"""
+    pdfmetrics = sys.modules.get("reportlab.pdfbase.pdfmetrics")
+    return pdfmetrics._fonts if pdfmetrics is not None else {}
+
+
+register_structure("reportlab.fonts", _reportlab_fonts)
+
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """하위 앱별 요청 처리 시간 기록, 단계별 시간(Server-Timing) 헤더·로그 추가, 학생 진행 단계 시간 기록"""
+    started = time.perf_counter()
+    arrived_at = time.time()
+    journey = begin_request()
+    segment = request.url.path.strip("/").split("/", 1)[0]
+    app_label = segment if segment in SUB_APPS else "root"
+    timings = start_request() if SERVER_TIMING_ENABLED else None
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        if timings is not None:
+            response.headers["Server-Timing"] = timings.header_value()
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, app=app_label, method=request.method, status=str(status)
+        )
+        # 정적 파일 요청은 로그에서 제외 (헤더는 그대로 추가)
+        if timings is not None and app_label != "static":
+            timings.log(request.method, request.url.path, status)
+        if journey and status < 400:
+            journey_telemetry.record(
+                journey["school"], journey["session_id"], journey["stage"], arrived_at,
+                time.perf_counter() - started, timings.phase_seconds("llm") if timings is not None else 0.0,
+            )
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """운영자가 요청했거나 무작위로 선택된 요청을 샘플링 프로파일 (결과 ID는 X-Profile-Id 헤더)"""
+    requested = request.headers.get(PROFILE_HEADER) == "1" or request.query_params.get("profile") == "1"
+    reason = request_profiler.reason(request.url.path, requested, is_admin(request) if requested else False)
+    sampler = request_profiler.start() if reason else None
+    if sampler is None:
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        profile_id = await asyncio.to_thread(
+            request_profiler.finish, sampler, reason, request.method, request.url.path
+        )
+    response.headers["X-Profile-Id"] = profile_id
+    return response
+
 
 @app.get("/")
-async def root():
-    return FileResponse(static_dir / "index.html")
+async def root(request: Request):
+    return static_files.page(request)
+
+
+@app.get("/ready")
+async def readiness():
+    """준비 상태 (하위 앱 예열이 끝나기 전에는 503, 로드밸런서 헬스 체크용)"""
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready else 503)
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """모든 하위 앱의 운영 지표 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """저장된 요청 프로파일 목록 (운영자 전용)"""
+    return {"profiles": request_profiler.list()}
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str):
+    """요청 프로파일 다운로드 (folded 형식 - speedscope, flamegraph.pl 등에서 열 수 있음)"""
+    path = request_profiler.path_for(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=path.name)
+
+
+@app.get("/admin/memory", dependencies=[Depends(require_admin)])
+async def get_memory_report():
+    """프로세스 RSS, 메모리 구조별 항목 수·크기, 임시 파일, tracemalloc 상태 (운영자 전용)"""
+    return await asyncio.to_thread(memory_report)
+
+
+@app.post("/admin/memory/tracemalloc/{action}", dependencies=[Depends(require_admin)])
+async def control_tracemalloc(action: str, frames: int = 1):
+    """tracemalloc 시작(start) 또는 중지(stop) - 추적 중에는 메모리 할당이 느려짐 (운영자 전용)"""
+    if action == "start":
+        return snapshot_store.start(max(1, min(frames, 25)))
+    if action == "stop":
+        return snapshot_store.stop()
+    raise HTTPException(status_code=404, detail="start 또는 stop만 사용할 수 있습니다.")
+
+
+@app.post("/admin/memory/snapshots", dependencies=[Depends(require_admin)])
+async def take_memory_snapshot(limit: int = 20):
+    """tracemalloc 스냅샷을 찍고 상위 할당 위치 반환 (운영자 전용)"""
+    try:
+        return await asyncio.to_thread(snapshot_store.take, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/admin/memory/snapshots/{base_id}/diff/{target_id}", dependencies=[Depends(require_admin)])
+async def diff_memory_snapshots(base_id: str, target_id: str, limit: int = 20):
+    """두 스냅샷 사이 증가가 큰 할당 위치 (운영자 전용)"""
+    diff = await asyncio.to_thread(snapshot_store.diff, base_id, target_id, limit)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="스냅샷을 찾을 수 없습니다.")
+    return diff
+
+
+@app.get("/admin/journey", dependencies=[Depends(require_admin)])
+async def get_journey_stats():
+    """학교·단계별 학생 생각 시간, 서버 처리 시간, LLM 대기 시간 분위수 (운영자 전용)"""
+    return {"sessions": len(journey_telemetry), "stages": journey_telemetry.stats()}
+
+
+@app.get("/admin/journey/{school}/{session_id}", dependencies=[Depends(require_admin)])
+async def get_session_journey(school: str, session_id: str):
+    """세션 하나의 단계별 시간 기록 (운영자 전용)"""
+    journey = journey_telemetry.session(school, session_id)
+    if journey is None:
+        raise HTTPException(status_code=404, detail="세션 기록을 찾을 수 없습니다.")
+    return journey
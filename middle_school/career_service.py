@@ -7,6 +7,12 @@ import uuid
 import random
 from datetime import datetime
 from typing import Dict, Optional, Tuple, List
+
+from common.dream_logic import parse_dream_logic
+from common.memory_report import register_structure
+from common.metrics import SESSIONS_LIVE
+from common.server_timing import span
+
 from .models import (
     CareerStage, CareerExplorationSession, StudentInfo, StepResponse,
     StageQuestionResponse, STAGE_QUESTIONS, ENCOURAGEMENT_MESSAGES,
@@ -35,12 +41,14 @@ class MiddleSchoolCareerService:
             updated_at=now
         )
         
-        self.sessions[session_id] = session
+        with span("session_io"):
+            self.sessions[session_id] = session
         return session_id
     
     def get_session(self, session_id: str) -> Optional[CareerExplorationSession]:
         """세션 조회"""
-        return self.sessions.get(session_id)
+        with span("session_io"):
+            return self.sessions.get(session_id)
     
     def get_current_question(self, session_id: str) -> Optional[StageQuestionResponse]:
         """현재 단계의 질문 조회"""
@@ -373,6 +381,15 @@ class MiddleSchoolCareerService:
             return False
         return session.career_confirmed
     
+    def find_sessions_by_class_tag(self, class_tag: str) -> List[CareerExplorationSession]:
+        """반 태그로 세션 목록 조회 (생성 순)"""
+        class_tag = class_tag.strip()
+        sessions = [
+            session for session in self.sessions.values()
+            if session.student_info and (session.student_info.class_tag or '').strip() == class_tag
+        ]
+        return sorted(sessions, key=lambda session: session.created_at)
+    
     def set_dream_logic(self, session_id: str, dream_logic: str) -> bool:
         """드림로직 저장"""
         session = self.get_session(session_id)
@@ -380,6 +397,7 @@ class MiddleSchoolCareerService:
             return False
         
         session.dream_logic = dream_logic
+        session.dream_logic_tree = parse_dream_logic(dream_logic)
         session.updated_at = datetime.now().isoformat()
         self.sessions[session_id] = session
         return True
@@ -482,6 +500,59 @@ class MiddleSchoolCareerService:
         self.sessions[session_id] = session
         
         return True, f"새로운 선택지가 생성되었습니다. (재생성 {session.step4_regenerate_count}/5회)", new_choices
+    
+    def get_step4_placeholder_question(self, session_id: str) -> Optional[StageQuestionResponse]:
+        """
+        4단계 점진적 응답용 질문 (AI 선택지가 아직 없을 때 기본 선택지로 바로 응답)
+        4단계가 아니거나 이미 동적 선택지가 있거나 AI를 쓸 수 없으면 None
+        """
+        session = self.get_session(session_id)
+        if not session or session.current_stage != CareerStage.STEP_4 or session.step4_dynamic_choices:
+            return None
+        if not ai_service or not ai_service.is_available():
+            return None
+        
+        stage_data = STAGE_QUESTIONS[CareerStage.STEP_4]
+        return StageQuestionResponse(
+            stage=CareerStage.STEP_4,
+            question=stage_data["question"],
+            choices=stage_data.get("choices", []),
+            encouragement=self._generate_encouragement(session),
+            student_name=session.student_info.name if session.student_info else None
+        )
+    
+    def generate_initial_step4_choices(self, session_id: str) -> Optional[List[str]]:
+        """4단계 첫 동적 선택지 생성 (세션은 변경하지 않음 - 전달 시 adopt_step4_choices로 반영)"""
+        session = self.get_session(session_id)
+        if not session:
+            return None
+        student_name = session.student_info.name if session.student_info else "학생"
+        responses_dict = {stage: response.dict() for stage, response in session.responses.items()}
+        return ai_service.generate_step4_future_issues(
+            student_name=student_name,
+            responses=responses_dict,
+            regenerate_count=0,
+            previous_issues=None
+        )
+    
+    def adopt_step4_choices(self, session_id: str, choices: Optional[List[str]]) -> bool:
+        """
+        생성이 끝난 4단계 선택지를 세션에 반영
+        학생이 이미 기본 선택지로 답했거나 다른 선택지가 반영되었으면 반영하지 않음
+        """
+        session = self.get_session(session_id)
+        if not session or not choices or session.current_stage != CareerStage.STEP_4:
+            return False
+        if session.step4_dynamic_choices:
+            return session.step4_dynamic_choices == choices
+        session.step4_dynamic_choices = choices
+        session.step4_regenerate_count = 0
+        session.step4_previous_issues = []
+        session.updated_at = datetime.now().isoformat()
+        self.sessions[session_id] = session
+        return True
 
 # 전역 서비스 인스턴스
-career_service = MiddleSchoolCareerService()
\ No newline at end of file
+career_service = MiddleSchoolCareerService()
+SESSIONS_LIVE.set_function(lambda: len(career_service.sessions), school="middle")
+register_structure("middle.sessions", lambda: career_service.sessions)
\ No newline at end of file
@@ -4,11 +4,10 @@ FastAPI 백엔드 - 중학교 진로탐색 서비스
 "현실적인 진로 목표 + 실행 가능한 실천 계획"을 도출
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse, FileResponse, Response
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 import uvicorn
@@ -21,11 +20,19 @@ from pathlib import Path
 # 중학교 진로 탐색 관련 imports
 from .models import (
     StudentInfo, StepResponse, NextStageRequest, ApiResponse,
-    CareerStage, StageQuestionResponse, CareerRecommendationResponse
+    CareerStage, StageQuestionResponse, CareerRecommendationResponse, BatchReportRequest
 )
 from .career_service import career_service
 from .openai_service import ai_service
-from .pdf_generator_elementary_style import pdf_generator
+from .pdf_generator_elementary_style import pdf_generator, render_report_in_worker
+from common.dream_logic import ensure_dream_logic_tree, get_goal_section, replace_goal_section
+from common.report_export import ExportJob, MAX_EXPORT_SESSIONS, safe_entry_name, stream_reports_zip
+from common.journey import mark_stage
+from common.progressive import progressive_jobs
+from common.openai_client import warm_up_connection
+from common.server_timing import TimedJSONResponse
+from common.static_assets import PrecompressedStaticFiles
+from common.warmup import LLM_WARMUP_ENABLED, LLM_WARMUP_TIMEOUT, run_steps
 
 # 추가 요청 모델
 class RecommendationRequest(BaseModel):
@@ -54,7 +61,8 @@ app = FastAPI(
     description="중학교 진로탐색 서비스를 위한 백엔드 API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=TimedJSONResponse
 )
 
 # CORS 설정
@@ -70,8 +78,10 @@ app.add_middleware(
 current_dir = Path(__file__).parent
 static_dir = current_dir / "static"
 
+# 빌드된 정적 파일 (미리 압축 + 캐시 헤더, 빌드 전에는 원본 폴더)
+static_files = PrecompressedStaticFiles(static_dir, check_dir=False)
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    app.mount("/static", static_files, name="static")
     logger.info(f"Static files mounted from: {static_dir}")
 else:
     logger.warning(f"Static directory not found: {static_dir}")
@@ -97,9 +107,9 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 # 기본 라우터들
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """메인 페이지"""
-    return FileResponse(static_dir / "index.html")
+    return static_files.page(request)
 
 @app.get("/api", response_model=dict)
 async def api_root():
@@ -124,6 +134,7 @@ async def start_career_exploration():
     """진로 탐색 세션 시작"""
     try:
         session_id = career_service.create_session()
+        mark_stage("middle", session_id, "start")
         
         return ApiResponse(
             success=True,
@@ -138,9 +149,20 @@ async def start_career_exploration():
         raise HTTPException(status_code=500, detail="세션 생성에 실패했습니다.")
 
 @app.get("/career/{session_id}/question")
-async def get_current_question(session_id: str):
-    """현재 단계의 질문 조회"""
+async def get_current_question(session_id: str, progressive: bool = False):
+    """
+    현재 단계의 질문 조회
+    progressive=true이면 4단계 AI 선택지를 기다리지 않고 기본 선택지와 대기 토큰을 바로 반환
+    """
     try:
+        placeholder = _progressive_step4_question(session_id) if progressive else None
+        if placeholder:
+            return ApiResponse(
+                success=True,
+                message="기본 선택지를 먼저 보여드려요. AI 맞춤 선택지를 준비 중입니다.",
+                data=placeholder.dict()
+            )
+        
         question_data = career_service.get_current_question(session_id)
         
         if not question_data:
@@ -157,9 +179,67 @@ async def get_current_question(session_id: str):
         logger.error(f"질문 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="질문 조회에 실패했습니다.")
 
+def _progressive_step4_question(session_id: str) -> Optional[StageQuestionResponse]:
+    """4단계 기본 선택지 질문을 만들고 AI 선택지 생성을 백그라운드로 시작 (해당 없으면 None)"""
+    placeholder = career_service.get_step4_placeholder_question(session_id)
+    if placeholder:
+        placeholder.pending_token = progressive_jobs.start(
+            f"middle:{session_id}:step4", career_service.generate_initial_step4_choices, session_id
+        )
+    return placeholder
+
+def _pending_step4_job(session_id: str, token: str):
+    """세션에 속한 4단계 대기 작업 조회"""
+    job = progressive_jobs.get(token)
+    if not job or job.key != f"middle:{session_id}:step4":
+        raise HTTPException(status_code=404, detail="대기 중인 선택지 생성 작업을 찾을 수 없습니다.")
+    return job
+
+def _deliver_step4_choices(session_id: str, status: Dict) -> Dict:
+    """생성이 끝난 4단계 선택지를 세션에 반영하고 전달할 데이터 구성"""
+    if status["status"] != "ready":
+        return {"status": status["status"]}
+    if not career_service.adopt_step4_choices(session_id, status["result"]):
+        # 학생이 이미 기본 선택지로 답한 경우 등
+        return {"status": "stale"}
+    return {
+        "status": "ready",
+        "dynamic_choices": status["result"],
+        "regenerate_count": 0,
+        "max_regenerate": 5
+    }
+
+@app.get("/career/{session_id}/step4-choices/{token}", response_model=ApiResponse)
+async def poll_step4_choices(session_id: str, token: str, wait: float = 0):
+    """4단계 AI 선택지 폴링 (wait초까지 생성 완료를 기다림)"""
+    try:
+        _pending_step4_job(session_id, token)
+        status = await progressive_jobs.wait(token, min(max(wait, 0), 30))
+        data = _deliver_step4_choices(session_id, status)
+        return ApiResponse(
+            success=True,
+            message="AI 선택지가 준비되었습니다." if data["status"] == "ready" else "AI 선택지를 준비 중입니다.",
+            data=data
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"4단계 선택지 폴링 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="선택지 조회에 실패했습니다.")
+
+@app.get("/career/{session_id}/step4-choices/{token}/events")
+async def stream_step4_choices(session_id: str, token: str):
+    """4단계 AI 선택지 SSE 수신 (생성이 끝나면 한 번 전송 후 종료)"""
+    _pending_step4_job(session_id, token)
+    return StreamingResponse(
+        progressive_jobs.events(token, lambda status: _deliver_step4_choices(session_id, status)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/career/{session_id}/submit", response_model=ApiResponse)
-async def submit_response(session_id: str, request: NextStageRequest):
-    """응답 제출 및 다음 단계로 진행"""
+async def submit_response(session_id: str, request: NextStageRequest, progressive: bool = False):
+    """응답 제출 및 다음 단계로 진행 (progressive=true이면 4단계 질문은 기본 선택지로 먼저 반환)"""
     try:
         # 요청 검증
         if request.session_id != session_id:
@@ -169,6 +249,7 @@ async def submit_response(session_id: str, request: NextStageRequest):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("middle", session_id, getattr(session.current_stage, "value", "done"))
         
         # 응답 제출
         success, message, next_stage = career_service.submit_response(
@@ -189,7 +270,8 @@ async def submit_response(session_id: str, request: NextStageRequest):
         
         # 다음 단계가 있으면 다음 질문도 함께 반환
         if next_stage:
-            next_question = career_service.get_current_question(session_id)
+            next_question = _progressive_step4_question(session_id) if progressive else None
+            next_question = next_question or career_service.get_current_question(session_id)
             if next_question:
                 response_data["next_question"] = next_question.dict()
         
@@ -214,6 +296,7 @@ async def submit_response(session_id: str, request: NextStageRequest):
 async def regenerate_step4_choices(session_id: str):
     """4단계 선택지 재생성"""
     try:
+        mark_stage("middle", session_id, "step_4_regenerate")
         success, message, new_choices = career_service.regenerate_step4_choices(session_id)
         
         if not success:
@@ -250,6 +333,7 @@ async def get_career_recommendation(session_id: str, request: RecommendationRequ
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("middle", session_id, "recommend")
         
         # 4단계까지 완료 확인
         if not career_service.is_ready_for_step5(session_id):
@@ -290,6 +374,7 @@ async def confirm_or_modify_dream(session_id: str, request: DreamConfirmationReq
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("middle", session_id, "dream_confirm")
         
         if session.current_stage != CareerStage.STEP_5:
             raise HTTPException(status_code=400, detail="5단계 상태가 아닙니다.")
@@ -364,6 +449,7 @@ async def regenerate_recommendation_with_changes(session_id: str, request: dict)
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("middle", session_id, "recommend_modify")
         
         # 수정할 단계와 새로운 답변 가져오기
         step_to_modify = request.get("step_to_modify")  # "step1", "step2", "step3", "step4"
@@ -441,6 +527,7 @@ async def create_dream_logic(session_id: str):
         session = career_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("middle", session_id, "dream_logic")
         
         if not session.career_confirmed or not session.final_career_goal:
             raise HTTPException(status_code=400, detail="꿈이 확정되지 않았습니다.")
@@ -460,12 +547,14 @@ async def create_dream_logic(session_id: str):
         
         # 세션에 드림로직 저장
         career_service.set_dream_logic(session_id, dream_logic)
+        dream_logic_tree = career_service.get_session(session_id).dream_logic_tree
         
         return ApiResponse(
             success=True,
             message="드림로직이 성공적으로 생성되었습니다!",
             data={
                 "dream_logic": dream_logic,
+                "dream_logic_tree": dream_logic_tree.dict() if dream_logic_tree else None,
                 "student_name": student_name,
                 "final_dream": session.final_career_goal
             }
@@ -477,6 +566,53 @@ async def create_dream_logic(session_id: str):
         logger.error(f"드림로직 생성 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="드림로직 생성에 실패했습니다.")
 
+@app.post("/career/{session_id}/dream-logic/goals/{goal_number}/regenerate", response_model=ApiResponse)
+async def regenerate_dream_logic_goal(session_id: str, goal_number: int):
+    """드림로직 중간목표 하나만 다시 생성 (나머지 계획은 그대로 유지)"""
+    try:
+        if not ai_service:
+            raise HTTPException(status_code=503, detail="AI 서비스를 사용할 수 없습니다.")
+        
+        session = career_service.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("middle", session_id, "dream_logic_goal")
+        
+        if not session.dream_logic:
+            raise HTTPException(status_code=400, detail="드림로직이 아직 생성되지 않았습니다.")
+        
+        if get_goal_section(session.dream_logic, goal_number) is None:
+            raise HTTPException(status_code=404, detail=f"중간목표{goal_number}을(를) 찾을 수 없습니다.")
+        
+        student_name = session.student_info.name if session.student_info else "친구"
+        section = ai_service.regenerate_dream_logic_section(
+            student_name, session.final_career_goal or "", session.dream_logic, goal_number
+        )
+        if not section:
+            raise HTTPException(status_code=500, detail="중간목표 재생성에 실패했습니다.")
+        
+        # 새 섹션을 저장된 드림로직에 끼워 넣고 트리도 다시 파싱
+        dream_logic = replace_goal_section(session.dream_logic, goal_number, section)
+        career_service.set_dream_logic(session_id, dream_logic)
+        dream_logic_tree = career_service.get_session(session_id).dream_logic_tree
+        
+        return ApiResponse(
+            success=True,
+            message=f"중간목표{goal_number}을(를) 새로 만들었습니다!",
+            data={
+                "goal_number": goal_number,
+                "section": section,
+                "dream_logic": dream_logic,
+                "dream_logic_tree": dream_logic_tree.dict() if dream_logic_tree else None
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"드림로직 부분 재생성 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="중간목표 재생성에 실패했습니다.")
+
 @app.get("/career/{session_id}/summary")
 async def get_session_summary(session_id: str):
     """세션 요약 정보 조회"""
@@ -545,7 +681,8 @@ async def get_session_data(session_id: str):
                 "responses": session.responses,
                 "final_recommendation": session.ai_career_recommendation,
                 "final_dream": session.final_career_goal,
-                "dream_logic": session.dream_logic
+                "dream_logic": session.dream_logic,
+                "dream_logic_tree": session.dream_logic_tree.dict() if session.dream_logic_tree else None
             }
         )
     except HTTPException:
@@ -610,8 +747,8 @@ async def download_career_pdf(request: PDFDownloadRequest):
     try:
         logger.info(f"PDF 다운로드 요청: {request.student_name}")
         
-        # PDF 생성
-        pdf_content = pdf_generator.generate_career_report(
+        # PDF 생성 (동일 내용은 캐시 재사용)
+        pdf_content, _ = pdf_generator.generate_career_report_cached(
             student_name=request.student_name,
             responses=request.responses,
             final_recommendation=request.final_recommendation,
@@ -646,6 +783,122 @@ async def download_career_pdf(request: PDFDownloadRequest):
             detail=f"PDF 생성 중 오류가 발생했습니다: {str(e)}"
         )
 
+def _session_report_args(session) -> Dict:
+    """세션에 저장된 내용으로 PDF 보고서 생성 인자 구성 (캐시 키와 ETag도 이 인자로 계산)"""
+    encouragement = ""
+    if session.dream_logic:
+        encouragement = ensure_dream_logic_tree(session.dream_logic, session.dream_logic_tree).encouragement
+    return {
+        "student_name": session.student_info.name if session.student_info else "학생",
+        "responses": {stage: response.dict() for stage, response in session.responses.items()},
+        "final_recommendation": session.final_career_goal or session.ai_career_recommendation or "",
+        "dream_logic_result": session.dream_logic,
+        "encouragement_message": encouragement
+    }
+
+@app.get("/career/{session_id}/report.pdf")
+async def download_session_report_pdf(session_id: str, request: Request):
+    """저장된 세션으로 진로 탐색 결과 PDF 생성 (클라이언트 재전송 불필요)"""
+    try:
+        # 세션 상태 확인
+        session = career_service.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+        mark_stage("middle", session_id, "report_pdf")
+        
+        if not session.dream_logic:
+            raise HTTPException(status_code=400, detail="드림로직이 생성되지 않았습니다.")
+        
+        student_name = session.student_info.name if session.student_info else "학생"
+        report_args = _session_report_args(session)
+        
+        # 내용이 바뀌지 않았으면 렌더링 없이 304 응답
+        etag = f'"{pdf_generator.report_cache_key(**report_args)}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+        
+        pdf_content, _ = pdf_generator.generate_career_report_cached(
+            **report_args, dream_logic_tree=session.dream_logic_tree
+        )
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{student_name}_중학교진로탐색결과_{timestamp}.pdf"
+        
+        from urllib.parse import quote
+        encoded_filename = quote(filename.encode('utf-8'))
+        
+        return Response(
+            content=pdf_content,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}",
+                **cache_headers
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"세션 PDF 생성 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="PDF 생성에 실패했습니다.")
+
+@app.post("/career/reports/export", dependencies=[Depends(get_current_user)])
+async def export_class_reports(request: BatchReportRequest):
+    """반 단위 진로 탐색 결과 PDF 일괄 내보내기 (ZIP 스트리밍, 교사 인증 필요)"""
+    try:
+        if request.session_ids:
+            sessions = [(session_id, career_service.get_session(session_id)) for session_id in request.session_ids]
+        elif request.class_tag:
+            sessions = [(session.session_id, session) for session in career_service.find_sessions_by_class_tag(request.class_tag)]
+        else:
+            raise HTTPException(status_code=400, detail="세션 ID 목록 또는 반 태그를 입력해주세요.")
+        
+        if len(sessions) > MAX_EXPORT_SESSIONS:
+            raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_EXPORT_SESSIONS}명까지 내보낼 수 있습니다.")
+        
+        jobs = []
+        skipped = []
+        for session_id, session in sessions:
+            if not session:
+                skipped.append((session_id, "세션을 찾을 수 없습니다."))
+                continue
+            if not session.dream_logic:
+                skipped.append((session_id, "드림로직이 생성되지 않았습니다."))
+                continue
+            
+            report_args = _session_report_args(session)
+            entry_name = f"{safe_entry_name(report_args['student_name'])}_{session_id[:8]}_중학교진로탐색결과.pdf"
+            cached_pdf = pdf_generator.get_cached_report(pdf_generator.report_cache_key(**report_args))
+            jobs.append(ExportJob(
+                entry_name,
+                {**report_args, "dream_logic_tree": session.dream_logic_tree},
+                cached_pdf=cached_pdf
+            ))
+        
+        if not jobs:
+            raise HTTPException(status_code=404, detail="내보낼 수 있는 진로 탐색 결과가 없습니다.")
+        
+        logger.info(f"보고서 일괄 내보내기 시작: {len(jobs)}건 (제외 {len(skipped)}건)")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{safe_entry_name(request.class_tag or '선택학생')}_중학교진로탐색결과_{timestamp}.zip"
+        
+        from urllib.parse import quote
+        encoded_filename = quote(filename.encode('utf-8'))
+        
+        return StreamingResponse(
+            stream_reports_zip(jobs, render_report_in_worker, skipped=skipped),
+            media_type="application/zip",
+            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"보고서 일괄 내보내기 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="보고서 일괄 내보내기에 실패했습니다.")
+
 # 예외 처리
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -665,6 +918,14 @@ async def general_exception_handler(request, exc):
         content={"error": "Internal server error", "status_code": 500}
     )
 
+# 서버 예열 (마운트된 하위 앱이라 루트 앱 lifespan에서 호출)
+def warm_up() -> Dict:
+    """한글 폰트 등록, LLM API 연결 예열"""
+    steps = {"fonts": lambda: pdf_generator.font_name}
+    if ai_service and ai_service.is_available() and LLM_WARMUP_ENABLED:
+        steps["llm_connection"] = lambda: warm_up_connection(ai_service.client, LLM_WARMUP_TIMEOUT)
+    return run_steps(steps)
+
 # 서버 실행 함수
 def start_server():
     """서버 시작"""
@@ -7,6 +7,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 from enum import Enum
 
+from common.dream_logic import DreamLogicTree
+
 # 단계별 상수 정의
 class CareerStage(str, Enum):
     """진로 탐색 단계"""
@@ -121,6 +123,7 @@ class StudentInfo(BaseModel):
     name: str = Field(..., description="학생 이름")
     grade: int = Field(..., ge=1, le=3, description="학년 (1학년, 2학년, 3학년)")
     school: str = Field(default="중학교", description="학교명")
+    class_tag: Optional[str] = Field(None, description="반 태그 (예: 5-2, 교사가 반 단위로 보고서를 내보낼 때 사용)")
 
 class StepResponse(BaseModel):
     """각 단계별 응답"""
@@ -191,6 +194,7 @@ class CareerExplorationSession(BaseModel):
     final_career_goal: Optional[str] = None
     # 6단계 관련 필드
     dream_logic: Optional[str] = None
+    dream_logic_tree: Optional[DreamLogicTree] = None  # dream_logic 파싱 결과 (저장 시 한 번만 파싱)
     # 4단계 동적 선택지 관련 필드
     step4_dynamic_choices: Optional[List[str]] = None
     step4_regenerate_count: int = 0
@@ -211,6 +215,8 @@ class StageQuestionResponse(BaseModel):
     dynamic_choices: Optional[List[str]] = None
     regenerate_count: Optional[int] = None
     max_regenerate: Optional[int] = None
+    # 점진적 응답: AI 선택지 생성이 끝나면 이 토큰으로 폴링/SSE 수신
+    pending_token: Optional[str] = None
 
 class NextStageRequest(BaseModel):
     """다음 단계 요청"""
@@ -220,6 +226,11 @@ class NextStageRequest(BaseModel):
     # 5단계 관련
     career_response: Optional[CareerRecommendationResponse] = None
 
+class BatchReportRequest(BaseModel):
+    """반 단위 보고서 일괄 내보내기 요청 (세션 ID 목록 또는 반 태그)"""
+    session_ids: Optional[List[str]] = Field(None, description="내보낼 세션 ID 목록")
+    class_tag: Optional[str] = Field(None, description="내보낼 반 태그")
+
 class ApiResponse(BaseModel):
     """API 응답 기본 형태"""
     success: bool
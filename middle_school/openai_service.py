@@ -10,6 +10,9 @@ from typing import Dict, Optional, List
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from common.dream_logic import extract_regenerated_section, get_goal_section
+from common.llm_gateway import llm_gateway, record_fallback
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -20,7 +23,7 @@ class MiddleSchoolAIService:
         """OpenAI 클라이언트 초기화"""
         self.client = None
         self.api_key = os.getenv('OPENAI_API_KEY')
-        self.model = "gpt-4.1-2025-04-14"  # 비용 효율적인 모델 사용
+        # 호출 위치별 모델은 common.llm_gateway 라우팅 표에서 관리
         
         if self.api_key:
             try:
@@ -63,40 +66,21 @@ class MiddleSchoolAIService:
             system_prompt = self._get_step5_system_prompt()
             user_prompt = self._get_step5_user_prompt(student_name, response_text)
 
-            # 프롬프트 로깅 추가 (콘솔에 출력)
-            logger.info("[LLM 프롬프트 - 5단계]")
-            logger.info(f"System prompt: {system_prompt}")
-            logger.info(f"User prompt: {user_prompt}")
-            print("\n========== [LLM 프롬프트 - 5단계] ==========")
-            print(f"System prompt:\n{system_prompt}\n")
-            print(f"User prompt:\n{user_prompt}\n")
-            print("===========================================\n")
-            
             # 새로운 추천 요청 시 프롬프트 수정
             if regenerate:
                 user_prompt += "\n\n중요: 이전과는 다른 새로운 관점에서 진로를 추천해주세요. 다양한 분야와 접근 방식을 고려해주세요."
             
-            # 모델에 따라 max_tokens 파라미터명 분기 (명시적)
-            if "gpt-5" in self.model.lower():
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_completion_tokens=200
-                    # temperature 파라미터 생략 (기본값 1)
-                )
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=0.9 if regenerate else 0.7,
-                    max_tokens=200
-                )
+            # 모델별 파라미터 형식(max_tokens/max_completion_tokens, temperature)은 게이트웨이에서 처리
+            response = llm_gateway.chat(
+                self.client, "middle.recommendation",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.9 if regenerate else 0.7,
+                max_tokens=200,
+                redact=[student_name]
+            )
             
             recommendation = response.choices[0].message.content
             if recommendation:
@@ -106,6 +90,7 @@ class MiddleSchoolAIService:
             
         except Exception as e:
             logger.error(f"중학생 진로 추천 생성 오류: {str(e)}")
+            record_fallback("middle.recommendation", e)
             return self._get_fallback_recommendation(student_name)
     
     def generate_step4_future_issues(self, student_name: str, responses: Dict, regenerate_count: int = 0, previous_issues: Optional[List[str]] = None) -> Optional[List[str]]:
@@ -132,35 +117,18 @@ class MiddleSchoolAIService:
             system_prompt = self._get_step4_system_prompt()
             user_prompt = self._get_step4_user_prompt(student_name, response_text, regenerate_count, previous_issues)
             
-            # 프롬프트 로깅
-            logger.info("[LLM 프롬프트 - 4단계]")
-            logger.info(f"System prompt: {system_prompt}")
-            logger.info(f"User prompt: {user_prompt}")
-            print("\n========== [LLM 프롬프트 - 4단계] ==========")
-            print(f"System prompt:\n{system_prompt}\n")
-            print(f"User prompt:\n{user_prompt}\n")
-            print("===========================================\n")
             
             # OpenAI API 호출
-            if "gpt-5" in self.model.lower():
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_completion_tokens=800
-                )
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=0.8 if regenerate_count > 0 else 0.7,
-                    max_tokens=800
-                )
+            response = llm_gateway.chat(
+                self.client, "middle.step4_issues",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.8 if regenerate_count > 0 else 0.7,
+                max_tokens=800,
+                redact=[student_name]
+            )
             
             # 응답 파싱
             content = response.choices[0].message.content
@@ -174,6 +142,7 @@ class MiddleSchoolAIService:
             
         except Exception as e:
             logger.error(f"4단계 미래 이슈 생성 오류: {str(e)}")
+            record_fallback("middle.step4_issues", e)
             return self._get_fallback_step4_choices()
     
     def generate_middle_school_dream_logic(self, student_name: str, responses: Dict, final_dream: str) -> Optional[str]:
@@ -199,14 +168,15 @@ class MiddleSchoolAIService:
             system_prompt = self._get_dream_logic_system_prompt()
             user_prompt = self._get_dream_logic_user_prompt(student_name, response_text, final_dream)
             
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = llm_gateway.chat(
+                self.client, "middle.dream_logic",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.6,
-                max_tokens=1500
+                max_tokens=1500,
+                redact=[student_name]
             )
             
             dream_logic = response.choices[0].message.content
@@ -217,8 +187,63 @@ class MiddleSchoolAIService:
             
         except Exception as e:
             logger.error(f"중학생 드림로직 생성 오류: {str(e)}")
+            record_fallback("middle.dream_logic", e)
             return self._get_fallback_dream_logic(student_name, final_dream)
     
+    def regenerate_dream_logic_section(self, student_name: str, final_dream: str, dream_logic: str, goal_number: int) -> Optional[str]:
+        """중학생 드림로직 중 중간목표 하나만 다시 생성
+        
+        Args:
+            student_name (str): 학생 이름
+            final_dream (str): 최종 선택된 꿈
+            dream_logic (str): 현재 저장된 드림로직 전체 (나머지 부분은 고정된 맥락으로 사용)
+            goal_number (int): 다시 생성할 중간목표 번호
+            
+        Returns:
+            Optional[str]: 새로 작성된 중간목표 섹션 또는 None
+        """
+        if not self.is_available() or not self.client:
+            logger.warning("AI 서비스를 사용할 수 없습니다.")
+            return None
+        
+        try:
+            current_section = get_goal_section(dream_logic, goal_number) or ""
+            system_prompt = self._get_dream_logic_system_prompt() + f"""
+
+부분 재생성 규칙:
+- 전체 드림로직 중 [중간목표 {goal_number}] 섹션 하나만 위 형식 그대로 다시 작성
+- 제목, 최종꿈, 다른 중간목표, 응원 메모는 출력하지 않음"""
+            user_prompt = f"""최종 꿈: {final_dream}
+
+{student_name} 학생의 현재 드림로직 (다른 중간목표는 바뀌지 않습니다):
+{dream_logic}
+
+지금의 [중간목표 {goal_number}] 내용:
+{current_section}
+
+[중간목표 {goal_number}]을(를) 기존과 다른 새로운 역량이나 실천활동으로 다시 작성해주세요.
+다른 중간목표와 겹치지 않게 하고, "[중간목표 {goal_number}]" 줄부터 시작해주세요."""
+            
+            response = llm_gateway.chat(
+                self.client, "middle.dream_logic_section",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.8,
+                max_tokens=600,
+                redact=[student_name]
+            )
+            
+            section = extract_regenerated_section(response.choices[0].message.content, goal_number)
+            logger.info(f"중학생 드림로직 중간목표 {goal_number} 재생성 완료: {student_name}")
+            return section
+            
+        except Exception as e:
+            logger.error(f"중학생 드림로직 부분 재생성 오류: {str(e)}")
+            record_fallback("middle.dream_logic_section", e)
+            return None
+    
     def _format_responses_for_ai(self, student_name: str, responses: Dict) -> str:
         """AI가 이해할 수 있도록 응답 데이터 포맷팅
         
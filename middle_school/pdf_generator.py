@@ -17,6 +17,8 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.rl_config import defaultEncoding
 
+from common.dream_logic import ensure_dream_logic_tree
+
 from .models import CareerStage
 
 # ReportLab 기본 인코딩을 UTF-8로 설정
@@ -361,68 +363,46 @@ class MiddleSchoolCareerPDFGenerator:
             story.append(self._safe_paragraph(f"🌟 최종꿈: {final_dream}", styles['dream']))
             story.append(Spacer(1, 15))
         
-        # 드림로직 파싱 및 표시
-        self._parse_and_add_dream_logic(story, styles, dream_logic)
+        # 드림로직 트리 표시 (저장된 트리가 없을 때만 파싱)
+        self._parse_and_add_dream_logic(story, styles, dream_logic, session_data.get('dream_logic_tree'))
     
-    def _parse_and_add_dream_logic(self, story, styles, dream_logic_text):
-        """드림로직 텍스트를 파싱하여 PDF에 추가"""
-        lines = dream_logic_text.split('\n')
-        current_section = ''
+    def _parse_and_add_dream_logic(self, story, styles, dream_logic_text, dream_logic_tree=None):
+        """드림로직 트리를 PDF에 추가"""
+        tree = ensure_dream_logic_tree(dream_logic_text, dream_logic_tree)
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
+        activity_styles = {
+            'school': ("📚 실천활동(학교)", styles['school_activity']),
+            'daily': ("🏠 실천활동(일상)", styles['personal_activity']),
+        }
+        
+        for goal in tree.goals:
             # 중간목표
-            if line.startswith('[중간목표'):
-                story.append(self._safe_paragraph(line, styles['goal_header']))
-                current_section = 'goal'
+            story.append(self._safe_paragraph(goal.line, styles['goal_header']))
             
             # 설명
-            elif line.startswith('설명:'):
-                explanation = line.replace('설명:', '').strip()
+            for note in goal.notes:
+                explanation = note.replace('설명:', '', 1).strip() if note.startswith('설명:') else note
                 story.append(self._safe_paragraph(explanation, styles['explanation']))
             
-            # 실천활동(학교)
-            elif '실천활동(학교)' in line:
-                story.append(self._safe_paragraph("📚 실천활동(학교)", styles['activity_header']))
-                # 콜론 뒤 내용이 있으면 추가
-                content = line.split(':', 1)[-1].strip() if ':' in line else ''
-                if content:
-                    # 슬래시로 구분된 활동들 처리
-                    activities = [act.strip() for act in content.split('/') if act.strip()]
-                    for activity in activities:
-                        story.append(self._safe_paragraph(activity, styles['school_activity']))
-                current_section = 'school'
-            
-            # 실천활동(일상)
-            elif '실천활동(일상)' in line:
-                story.append(self._safe_paragraph("🏠 실천활동(일상)", styles['activity_header']))
-                # 콜론 뒤 내용이 있으면 추가
-                content = line.split(':', 1)[-1].strip() if ':' in line else ''
-                if content:
-                    # 슬래시로 구분된 활동들 처리
-                    activities = [act.strip() for act in content.split('/') if act.strip()]
-                    for activity in activities:
-                        story.append(self._safe_paragraph(activity, styles['personal_activity']))
-                current_section = 'personal'
-            
-            # 추천 활동
-            elif '추천 활동' in line:
-                story.append(self._safe_paragraph("🎯 추천 활동", styles['activity_header']))
-                content = line.split(':', 1)[-1].strip() if ':' in line else ''
-                if content:
-                    story.append(self._safe_paragraph(content, styles['recommendation']))
-            
-            # 응원메모 건너뛰기 (별도 처리)
-            elif '응원' in line and ('메모' in line or '메시지' in line):
-                continue
-            
-            # 기타 텍스트
-            elif line and not line.startswith('[') and not line.startswith('최종꿈:'):
-                if current_section == 'goal':
-                    story.append(self._safe_paragraph(line, styles['explanation']))
+            for activity in goal.activities:
+                # 추천 활동
+                if activity.kind == 'recommended':
+                    story.append(self._safe_paragraph("🎯 추천 활동", styles['activity_header']))
+                    if activity.content:
+                        story.append(self._safe_paragraph(activity.content, styles['recommendation']))
+                    continue
+                
+                # 실천활동(학교) / 실천활동(일상)
+                header, item_style = activity_styles.get(
+                    activity.kind, (f"📚 {activity.label}", styles['school_activity'])
+                )
+                story.append(self._safe_paragraph(header, styles['activity_header']))
+                # 슬래시로 구분된 활동들 처리
+                items = [act.strip() for act in activity.content.split('/') if act.strip()]
+                items += [item.lstrip('•-*・ ').strip() for item in activity.items]
+                for item in items:
+                    if item:
+                        story.append(self._safe_paragraph(item, item_style))
         
         story.append(Spacer(1, 20))
     
@@ -312,6 +312,50 @@ function getStageTitle(stageNumber) {
     return stageTitles[stageNumber] || "질문";
 }
 
+// 4단계 AI 선택지가 생성되면 기본 선택지를 교체 (SSE, 지원하지 않으면 폴링)
+function listenStep4Choices(token) {
+    const url = `${API_BASE_URL}/career/${sessionId}/step4-choices/${token}`;
+    const applyChoices = (result) => {
+        if (!result || result.status !== 'ready' || !currentQuestionData || currentQuestionData.pending_token !== token) {
+            return;
+        }
+        console.log('✨ AI 선택지 도착:', result.dynamic_choices);
+        showQuestionScreen({
+            ...currentQuestionData,
+            pending_token: null,
+            dynamic_choices: result.dynamic_choices,
+            regenerate_count: result.regenerate_count,
+            max_regenerate: result.max_regenerate
+        });
+    };
+    
+    if (window.EventSource) {
+        const source = new EventSource(`${url}/events`);
+        ['ready', 'stale', 'failed', 'timeout'].forEach(eventName => {
+            source.addEventListener(eventName, (event) => {
+                source.close();
+                applyChoices(JSON.parse(event.data));
+            });
+        });
+        source.onerror = () => source.close();
+        return;
+    }
+    
+    const poll = async (attempt) => {
+        try {
+            const response = await fetch(`${url}?wait=20`);
+            const data = await response.json();
+            if (data.success && data.data.status === 'pending' && attempt < 5) {
+                return poll(attempt + 1);
+            }
+            if (data.success) applyChoices(data.data);
+        } catch (error) {
+            console.warn('⚠️ AI 선택지 수신 실패, 기본 선택지 유지:', error);
+        }
+    };
+    poll(0);
+}
+
 // 질문 화면 표시 함수
 function showQuestionScreen(questionData) {
     console.log('📋 질문 화면 표시:', questionData);
@@ -319,6 +363,9 @@ function showQuestionScreen(questionData) {
     console.log('🔍 기본 선택지 확인:', questionData.choices);
     currentQuestionData = questionData;
     selectedChoices = [];
+    if (questionData.pending_token) {
+        listenStep4Choices(questionData.pending_token);
+    }
     
     // 질문 화면으로 전환
     showScreen('questionScreen');
@@ -620,6 +667,7 @@ async function regenerateStep4Choices() {
                 // 현재 질문 데이터에 새로운 동적 선택지 업데이트
                 currentQuestionData.dynamic_choices = data.data.choices;
                 currentQuestionData.regenerate_count = data.data.regenerate_count;
+                currentQuestionData.pending_token = null;
                 
                 // 화면 다시 렌더링
                 showQuestionScreen(currentQuestionData);
@@ -701,7 +749,8 @@ async function submitCurrentAnswer() {
             requestBody.response.custom_answer = customAnswer;
         }
         
-        const response = await fetch(`${API_BASE_URL}/career/${sessionId}/submit`, {
+        // progressive: 4단계는 기본 선택지를 먼저 받고 AI 선택지는 생성되면 교체
+        const response = await fetch(`${API_BASE_URL}/career/${sessionId}/submit?progressive=true`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1148,7 +1197,10 @@ async function generateDreamLogic() {
                 
                 const dreamSteps = document.getElementById('dreamSteps');
                 if (dreamSteps) {
-                    const formattedContent = formatDreamLogic(data.data.dream_logic);
+                    // 서버에서 파싱한 트리가 있으면 그대로 사용 (텍스트 재파싱 생략)
+                    const formattedContent = data.data.dream_logic_tree
+                        ? formatDreamLogicTree(data.data.dream_logic_tree)
+                        : formatDreamLogic(data.data.dream_logic);
                     dreamSteps.innerHTML = formattedContent;
                 }
                 
@@ -1169,6 +1221,58 @@ async function generateDreamLogic() {
     }
 }
 
+// 서버에서 파싱한 드림로직 트리를 HTML로 포맷팅
+function formatDreamLogicTree(tree) {
+    const activityHeaders = {
+        school: { title: '📚 실천활동(학교)', itemClass: 'school-activity' },
+        daily: { title: '🏠 실천활동(일상)', itemClass: 'personal-activity' }
+    };
+    
+    let formatted = '<div class="dream-logic-content">';
+    if (tree.title) {
+        formatted += `<h3>${tree.title}</h3>`;
+    }
+    if (tree.final_dream) {
+        formatted += `<div class="final-dream"><strong>🌟 최종꿈:</strong> ${tree.final_dream}</div>`;
+    }
+    
+    for (const goal of tree.goals || []) {
+        formatted += `<h4>${goal.line}</h4>`;
+        for (const note of goal.notes || []) {
+            const content = note.replace(/^설명\s*[:：]\s*/, '');
+            formatted += `<p style="margin-left: 15px; color: #666; font-style: italic;">${content}</p>`;
+        }
+        for (const activity of goal.activities || []) {
+            if (activity.kind === 'recommended') {
+                formatted += `<h5>🎯 추천 활동</h5>`;
+                if (activity.content) {
+                    formatted += `<p style="margin-left: 15px; color: #666;">${activity.content}</p>`;
+                }
+                continue;
+            }
+            const header = activityHeaders[activity.kind] || { title: activity.label, itemClass: 'school-activity' };
+            const items = activity.content.split('/').map(act => act.trim()).filter(act => act)
+                .concat((activity.items || []).map(item => item.replace(/^[•\-*]\s*/, '')));
+            formatted += `<h5>${header.title}</h5>`;
+            formatted += '<div class="activity-container"><ul>';
+            items.forEach(item => {
+                formatted += `<li class="${header.itemClass}">${item}</li>`;
+            });
+            formatted += '</ul></div>';
+        }
+    }
+    formatted += '</div>';
+    
+    if (tree.encouragement) {
+        encouragementMessage = tree.encouragement;
+        setTimeout(() => {
+            showEncouragementInDreamLogic();
+        }, 100);
+    }
+    
+    return formatted;
+}
+
 // 드림로직 텍스트를 HTML로 포맷팅
 function formatDreamLogic(dreamLogicText) {
     console.log('🎨 드림로직 포맷팅 시작:', dreamLogicText);
@@ -1434,35 +1538,8 @@ async function downloadDreamLogicPDF() {
     try {
         showLoading(true);
         
-        // 세션 데이터 조회
-        const sessionResponse = await fetch(`${API_BASE_URL}/career/${sessionId}/data`);
-        const sessionData = await sessionResponse.json();
-        
-        if (!sessionData.success) {
-            throw new Error('세션 데이터를 가져올 수 없습니다.');
-        }
-        
-        const responses = sessionData.data.responses;
-        const finalRecommendation = sessionData.data.final_dream || finalDream || '진로 추천 정보 없음';
-        
-        // 드림로직 결과 가져오기
-        const dreamLogicElement = document.getElementById('dreamSteps');
-        const dreamLogicResult = dreamLogicElement ? dreamLogicElement.innerText : '';
-        
-        // PDF 다운로드 요청
-        const pdfResponse = await fetch(`${API_BASE_URL}/career/download-pdf`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                student_name: studentInfo.name,
-                responses: responses,
-                final_recommendation: finalRecommendation,
-                dream_logic_result: dreamLogicResult,
-                encouragement_message: encouragementMessage || ''
-            })
-        });
+        // 서버에 저장된 세션으로 PDF 생성 (요청 1회)
+        const pdfResponse = await fetch(`${API_BASE_URL}/career/${sessionId}/report.pdf`);
         
         if (!pdfResponse.ok) {
             throw new Error('PDF 생성에 실패했습니다.');
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+고등학교 채팅 대화 기억(토큰 예산 창 + 누적 요약 + 세션 제한) 테스트 (서버 없이 실행)
+"""
+
+import sys
+sys.path.append('.')
+
+from high_school.chat_memory import CHAT_SUMMARY_TOKENS, ConversationMemory, ConversationStore, estimate_tokens
+
+
+def test_window_stays_within_budget():
+    """대화가 길어져도 모델로 보내는 메시지가 예산 안에 머무는지 테스트"""
+    print("🧪 대화 창 토큰 예산 테스트 시작")
+
+    memory = ConversationMemory("system", window_tokens=200)
+    for i in range(50):
+        memory.add_turn(f"질문 {i} " + "가" * 40, f"답변 {i} " + "나" * 40)
+        # 요약 작업이 끝났다고 가정
+        memory.apply_summary(f"{i}번째 대화까지 요약", memory.take_pending())
+
+    messages = memory.build_messages("새 질문")
+    window_tokens = sum(estimate_tokens(m["content"]) for m in messages[2:-1])
+    assert window_tokens <= 200
+    assert messages[1]["content"] == "이전 대화 요약: 49번째 대화까지 요약"
+    assert messages[-2]["content"].startswith("답변 49")
+
+    print("✅ 대화 창 토큰 예산 테스트 통과")
+
+
+def test_pending_kept_until_summary_applied():
+    """요약 중 새로 밀려난 대화는 대기열에 남는지 테스트"""
+    memory = ConversationMemory("system", window_tokens=60)
+    memory.add_turn("가" * 40, "나" * 40)
+    memory.add_turn("다" * 40, "라" * 40)
+    assert memory.needs_summary()
+
+    summarized = memory.take_pending()
+    assert not memory.needs_summary()
+    memory.add_turn("마" * 40, "바" * 40)
+    memory.apply_summary("요약", summarized)
+
+    assert [m["content"][0] for m in memory.pending] == ["다", "라"]
+    assert memory.needs_summary()
+
+
+def test_pending_capped_when_summary_keeps_failing():
+    """요약이 계속 실패해도 대기열은 상한 안에 머물고, 잘린 오래된 대화는 요약문에 짧게 남는지 테스트"""
+    print("🧪 요약 실패 시 대기열 상한 테스트 시작")
+
+    def failing_summarizer(memory):
+        memory.take_pending()
+        memory.cancel_summary()  # 요약 호출 실패
+
+    memory = ConversationMemory("system", window_tokens=100, pending_tokens=300)
+    for i in range(200):
+        memory.add_turn(f"질문 {i} " + "가" * 40, f"답변 {i} " + "나" * 40)
+        if memory.needs_summary():
+            failing_summarizer(memory)
+
+    pending_tokens = sum(estimate_tokens(m["content"]) for m in memory.pending)
+    assert 0 < pending_tokens <= 300
+    assert "(요약 전 잘린 대화)" in memory.summary
+    assert estimate_tokens(memory.summary) <= CHAT_SUMMARY_TOKENS
+    assert len(memory.build_messages("새 질문")) < 20
+
+    print("✅ 요약 실패 시 대기열 상한 테스트 통과")
+
+
+def test_pending_cap_while_summarizing():
+    """요약 중 상한 때문에 잘린 대화가 요약 결과 반영 후에도 대기열에 다시 남지 않는지 테스트"""
+    memory = ConversationMemory("system", window_tokens=50, pending_tokens=100)
+    memory.add_turn("가" * 40, "나" * 40)
+    memory.add_turn("다" * 40, "라" * 40)
+    summarized = memory.take_pending()
+    assert [m["content"][0] for m in summarized] == ["가", "나"]
+
+    # 요약 중 대화가 계속 밀려나 요약 대상("가/나")과 그 다음 턴("다/라")까지 잘림
+    memory.add_turn("마" * 40, "바" * 40)
+    memory.add_turn("사" * 40, "아" * 40)
+    assert [m["content"][0] for m in memory.pending] == ["마", "바"]
+
+    memory.apply_summary("가나 요약", summarized)
+    assert [m["content"][0] for m in memory.pending] == ["마", "바"]
+    assert memory.summary.startswith("가나 요약") and "다다다" in memory.summary
+    assert not memory.summarizing
+
+
+def test_store_evicts_sessions():
+    """최대 세션 수와 유휴 시간 제한 테스트"""
+    store = ConversationStore("system", max_sessions=2, idle_ttl=60)
+    first = store.get("a")
+    store.get("b")
+    store.get("c")
+    assert len(store) == 2
+    assert store.get("a") is not first
+
+    stale = store.get("d")
+    stale.last_access -= 120
+    assert store.get("d") is not stale
+
+
+if __name__ == "__main__":
+    test_window_stays_within_budget()
+    test_pending_kept_until_summary_applied()
+    test_pending_capped_when_summary_keeps_failing()
+    test_pending_cap_while_summarizing()
+    test_store_evicts_sessions()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+드림로직 파서 테스트 (서버 없이 실행)
+"""
+
+import sys
+sys.path.append('.')
+
+from common.dream_logic import (
+    HIGH_SCHOOL_EPILOGUE_MARKERS, DreamLogicTree, ensure_dream_logic_tree, extract_regenerated_section, get_goal_section,
+    parse_dream_logic, replace_goal_section
+)
+
+ELEMENTARY_TEXT = """[민수의 드림 로직]
+최종꿈: 로봇 엔지니어
+
+[중간목표1] 기초 실력 쌓기
+• 실천활동1: 학교생활
+1. 과학 시간에 간단한 기계 만들기
+• 실천활동2: 개인 성장
+1. 로봇 관련 책 읽기
+
+[중간목표2] 경험 넓히기
+• 실천활동1: 학교생활 - 동아리 참가하기
+• 실천활동2: 개인 성장 - 과학관 견학하기
+
+응원 메모: 민수님의 호기심은 큰 힘이에요!
+앞으로도 즐겁게 도전해요 😊"""
+
+MIDDLE_TEXT = """[지우의 드림 로직]
+최종꿈: 응급구조사
+
+[중간목표 1] 체력 (현장 대응에 필요)
+설명: 위급한 상황에서 버틸 수 있는 힘
+
+실천활동(학교): 체육 시간 달리기 기록 향상 / 보건 시간 응급처치 복습
+
+실천활동(일상): 매일 스트레칭
+
+추천 활동: 안전지킴이
+
+💬 응원 메모
+"지우의 책임감은 진짜 강점이에요.\""""
+
+HIGH_TEXT = """🎯 [최종 목표(꿈)] 친환경 건축가
+
+📚 [중간목표1] 친환경 건축 기술 역량
+🔬 실천활동1:
+    탐구보고서: "제로에너지 건축 사례 분석"
+    교과 활동: 통합과학 - '에너지 전환' 단원
+🎨 [중간목표2] 설계 능력 향상
+🔬 실천활동1:
+    교과 활동: 기술가정
+이 계획은 고등학생이 실천할 수 있도록 구성했습니다."""
+
+
+def test_elementary_format():
+    """초등학교 형식 파싱 테스트"""
+    print("🧪 초등학교 드림로직 파싱 테스트 시작")
+
+    tree = parse_dream_logic(ELEMENTARY_TEXT)
+    assert tree.title == "[민수의 드림 로직]"
+    assert tree.final_dream == "로봇 엔지니어"
+    assert [goal.number for goal in tree.goals] == [1, 2]
+    assert tree.goals[0].title == "기초 실력 쌓기"
+    assert [a.label for a in tree.goals[0].activities] == ["실천활동1", "실천활동2"]
+    assert tree.goals[0].activities[0].items == ["1. 과학 시간에 간단한 기계 만들기"]
+    assert tree.goals[1].activities[0].content == "학교생활 - 동아리 참가하기"
+    assert tree.encouragement == "민수님의 호기심은 큰 힘이에요! 앞으로도 즐겁게 도전해요 😊"
+
+    print("✅ 초등학교 드림로직 파싱 테스트 통과")
+
+
+def test_middle_format():
+    """중학교 형식 파싱 테스트"""
+    print("🧪 중학교 드림로직 파싱 테스트 시작")
+
+    tree = parse_dream_logic(MIDDLE_TEXT)
+    goal = tree.goals[0]
+    assert goal.number == 1
+    assert goal.notes == ["설명: 위급한 상황에서 버틸 수 있는 힘"]
+    assert [a.kind for a in goal.activities] == ["school", "daily", "recommended"]
+    assert goal.activities[0].content == "체육 시간 달리기 기록 향상 / 보건 시간 응급처치 복습"
+    assert tree.encouragement == "지우의 책임감은 진짜 강점이에요."
+
+    print("✅ 중학교 드림로직 파싱 테스트 통과")
+
+
+def test_high_school_format():
+    """고등학교 최종 요약 파싱 테스트 (마지막 설명 문단 분리)"""
+    print("🧪 고등학교 최종 요약 파싱 테스트 시작")
+
+    tree = parse_dream_logic(HIGH_TEXT, HIGH_SCHOOL_EPILOGUE_MARKERS)
+    assert tree.final_dream == "친환경 건축가"
+    assert len(tree.goals) == 2
+    assert len(tree.goals[0].activities[0].items) == 2
+    assert tree.epilogue == ["이 계획은 고등학생이 실천할 수 있도록 구성했습니다."]
+
+    kinds = [kind for kind, _ in tree.iter_lines(include_epilogue=False)]
+    assert kinds[0] == "final_dream"
+    assert "epilogue" not in kinds
+
+    print("✅ 고등학교 최종 요약 파싱 테스트 통과")
+
+
+def test_epilogue_markers_only_for_high_school():
+    """초등/중등 실천활동에 '다각도로' 같은 표현이 있어도 중간목표를 끝까지 파싱하는지 테스트"""
+    text = ELEMENTARY_TEXT.replace("1. 로봇 관련 책 읽기", "1. 여러 직업을 다각도로 살펴보기")
+    tree = parse_dream_logic(text)
+    assert [goal.title for goal in tree.goals] == ["기초 실력 쌓기", "경험 넓히기"]
+    assert tree.epilogue == []
+    assert tree.goals[0].activities[1].items == ["1. 여러 직업을 다각도로 살펴보기"]
+    assert get_goal_section(text, 1).endswith("다각도로 살펴보기")
+    assert get_goal_section(text, 2).startswith("[중간목표2]")
+
+    # 고등학교는 설명 문단 표시를 넘겨야만 분리
+    assert parse_dream_logic(HIGH_TEXT).epilogue == []
+
+
+def test_lines_after_encouragement_keep_order():
+    """응원 메모 뒤의 [...] 머리글과 이어지는 라인이 마지막 실천활동에 붙지 않고 문서 순서대로 남는지 테스트"""
+    text = "최종꿈: 의사\n[중간목표 1] 공부\n• 실천활동1: 책 읽기\n💬 응원 메모\n잘하고 있어요!\n[마무리]\n끝까지 화이팅"
+    tree = parse_dream_logic(text)
+    assert tree.goals[0].activities[0].items == []
+    assert tree.encouragement == "잘하고 있어요!"
+    assert tree.trailing == ["[마무리]", "끝까지 화이팅"]
+    assert [line for _, line in tree.iter_lines()] == text.split('\n')
+    assert list(tree.iter_lines())[-2:] == [("section", "[마무리]"), ("text", "끝까지 화이팅")]
+
+
+def test_regenerated_section_with_mismatched_number():
+    """LLM이 다른 번호를 붙여 답해도 요청한 번호로 교체되어 중간목표가 겹치거나 사라지지 않는지 테스트"""
+    reply = "[중간목표 1] 새 봉사\n• 실천활동1: 학교생활 - 봉사 동아리"
+    section = extract_regenerated_section(reply, 2)
+    assert section.startswith("[중간목표 2] 새 봉사")
+
+    replaced = replace_goal_section(ELEMENTARY_TEXT, 2, section)
+    tree = parse_dream_logic(replaced)
+    assert [(goal.number, goal.title) for goal in tree.goals] == [(1, "기초 실력 쌓기"), (2, "새 봉사")]
+    # 이후 다시 생성해도 각 번호의 섹션을 찾음
+    assert get_goal_section(replaced, 1).startswith("[중간목표1] 기초 실력 쌓기")
+    assert get_goal_section(replaced, 2).endswith("봉사 동아리")
+
+    # 고등학교 형식(이모지 + 번호 붙여 쓰기)도 번호만 교체
+    assert extract_regenerated_section("📚 [중간목표1] 새 목표\n🔬 실천활동1:", 3).startswith("📚 [중간목표3] 새 목표")
+    assert extract_regenerated_section("다시 작성할 수 없어요.", 2) is None
+
+
+def test_round_trip():
+    """세션 저장용 dict 변환 후 복원 테스트"""
+    print("🧪 드림로직 트리 저장/복원 테스트 시작")
+
+    tree = parse_dream_logic(MIDDLE_TEXT)
+    restored = ensure_dream_logic_tree(None, tree.model_dump())
+    assert isinstance(restored, DreamLogicTree)
+    assert list(restored.iter_lines()) == list(tree.iter_lines())
+
+    # 원본 라인 수가 보존되는지 확인
+    source_lines = [line.strip() for line in MIDDLE_TEXT.split('\n') if line.strip()]
+    assert len(list(tree.iter_lines())) == len(source_lines)
+
+    assert parse_dream_logic("").goals == []
+
+    print("✅ 드림로직 트리 저장/복원 테스트 통과")
+
+
+def test_replace_goal_section():
+    """중간목표 하나만 교체하고 나머지 내용은 그대로 유지되는지 테스트"""
+    print("🧪 중간목표 부분 교체 테스트 시작")
+
+    assert get_goal_section(ELEMENTARY_TEXT, 2).startswith("[중간목표2] 경험 넓히기")
+    assert "응원 메모" not in get_goal_section(ELEMENTARY_TEXT, 2)
+    assert get_goal_section(ELEMENTARY_TEXT, 3) is None
+
+    replaced = replace_goal_section(ELEMENTARY_TEXT, 1, "[중간목표1] 새 역량\n• 실천활동1: 학교생활 - 새 활동")
+    tree = parse_dream_logic(replaced)
+    assert [goal.title for goal in tree.goals] == ["새 역량", "경험 넓히기"]
+    assert tree.encouragement.startswith("민수님의 호기심")
+    assert replaced.split("[중간목표2]")[1] == ELEMENTARY_TEXT.split("[중간목표2]")[1]
+
+    # 고등학교 요약: 마지막 중간목표 뒤의 설명 문단 유지
+    replaced = replace_goal_section(HIGH_TEXT, 2, "🎨 [중간목표2] 새 목표\n🔬 실천활동1:", HIGH_SCHOOL_EPILOGUE_MARKERS)
+    assert replaced.endswith("이 계획은 고등학생이 실천할 수 있도록 구성했습니다.")
+    assert "기술가정" not in replaced
+
+    # LLM 응답에서 섹션만 추출 (번호가 다르거나 앞뒤 설명이 붙은 경우)
+    content = "다시 작성했어요.\n[중간목표 1] 새 목표\n• 실천활동1: 활동\n\n응원 메모: 화이팅"
+    assert extract_regenerated_section(content, 2) == "[중간목표 2] 새 목표\n• 실천활동1: 활동"
+
+    try:
+        replace_goal_section(MIDDLE_TEXT, 5, "[중간목표 5] 없음")
+        assert False, "없는 중간목표는 ValueError"
+    except ValueError:
+        pass
+
+    print("✅ 중간목표 부분 교체 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_elementary_format()
+    test_middle_format()
+    test_high_school_format()
+    test_epilogue_markers_only_for_high_school()
+    test_lines_after_encouragement_keep_order()
+    test_regenerated_section_with_mismatched_number()
+    test_round_trip()
+    test_replace_goal_section()
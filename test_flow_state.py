@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+고등학교 7단계 흐름 상태 저장소 테스트 (서버 없이 실행)
+"""
+
+import asyncio
+import os
+import sys
+import time
+sys.path.append('.')
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from high_school.flow_state import FlowStateStore, SpeculativeTasks
+
+
+def test_update_from_context():
+    """단계 컨텍스트 반영 및 직업 변경 시 뒤 단계 초기화 테스트"""
+    print("🧪 흐름 상태 반영 테스트 시작")
+
+    store = FlowStateStore()
+    state = store.create()
+    state.update_from_context({"step": 3, "career": "건축가", "reasons": ["창의성"], "issues": ["기후 위기", "도시 재생"]})
+    state.update_from_context({"step": 4, "career": "건축가", "issues_selected": ["기후 위기"], "topics": ["친환경 소재"]})
+    assert state.step == 4
+    assert state.issues == ["기후 위기", "도시 재생"]
+    assert state.topics == ["친환경 소재"]
+
+    # 직업이 바뀌면 이후 단계 데이터는 모두 초기화
+    state.update_from_context({"step": 2, "career": "의사"})
+    assert state.career == "의사"
+    assert state.reasons == [] and state.issues == [] and state.topics == []
+
+    print("✅ 흐름 상태 반영 테스트 통과")
+
+
+def test_remember_and_recall():
+    """같은 입력일 때만 기억한 생성 결과를 재사용하는지 테스트"""
+    state = FlowStateStore().create()
+    inputs = {"career": "건축가", "reasons": ["창의성", "안정성"]}
+    state.remember("issues", inputs, ["기후 위기", "도시 재생"])
+
+    assert state.recall("issues", dict(inputs)) == ["기후 위기", "도시 재생"]
+    assert state.recall("issues", {"career": "건축가", "reasons": ["창의성"]}) is None
+    assert state.recall("topics", inputs) is None
+
+    # 항목별로 마지막 결과만 유지
+    state.remember("issues", {"career": "의사", "reasons": []}, ["고령화"])
+    assert state.recall("issues", inputs) is None
+
+
+def test_store_expiry_and_eviction():
+    """유휴 시간 만료 및 최대 개수 제한 테스트"""
+    store = FlowStateStore(idle_ttl=60, max_entries=2)
+    first = store.create()
+    store.create()
+    store.create()
+    assert len(store) == 2
+    assert store.get(first.flow_id) is None
+
+    state = store.create()
+    state.last_access -= 120
+    assert store.get(state.flow_id) is None
+    assert store.get_or_create(state.flow_id).flow_id != state.flow_id
+
+
+def test_speculative_tasks():
+    """선행 생성 작업 재사용 및 입력 변경 시 취소 테스트"""
+    print("🧪 선행 생성 작업 테스트 시작")
+
+    async def scenario():
+        tasks = SpeculativeTasks()
+
+        async def generate(value):
+            await asyncio.sleep(0.05)
+            return value
+
+        first = tasks.start("flow", "final_summary", {"midgoals": ["A"]}, lambda: generate("A"))
+        # 같은 입력이면 진행 중인 작업을 그대로 사용
+        assert tasks.start("flow", "final_summary", {"midgoals": ["A"]}, lambda: generate("A2")) is first
+
+        # 입력이 바뀌면 이전 작업 취소
+        second = tasks.start("flow", "final_summary", {"midgoals": ["B"]}, lambda: generate("B"))
+        await asyncio.sleep(0)
+        assert first.cancelled()
+        assert tasks.take("flow", "final_summary", {"midgoals": ["A"]}) is None
+        await asyncio.sleep(0)
+        assert second.cancelled()
+
+        third = tasks.start("flow", "final_summary", {"midgoals": ["C"]}, lambda: generate("C"))
+        assert tasks.take("flow", "final_summary", {"midgoals": ["C"]}) is third
+        assert await third == "C"
+        await asyncio.sleep(0)
+        assert len(tasks) == 0
+
+    asyncio.run(scenario())
+    print("✅ 선행 생성 작업 테스트 통과")
+
+
+def test_remembered_gpt_list_does_not_block_event_loop():
+    """단계별 GPT 호출(동기 재시도·대기 포함)이 스레드에서 실행되어 다른 학생의 요청을 막지 않는지 테스트"""
+    import high_school.high_school as high_school
+    from high_school.flow_state import HighSchoolFlowState
+
+    calls = []
+
+    def slow_call_gpt_list(**kwargs):
+        calls.append(kwargs["prompt"])
+        time.sleep(0.2)
+        return [f"{kwargs['prompt']} 결과"]
+
+    async def scenario():
+        states = [HighSchoolFlowState(flow_id=f"flow{i}") for i in range(3)]
+        ticks = []
+
+        async def ticker():
+            for _ in range(10):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(ticker(), *(
+            high_school.remembered_gpt_list(state, "issues", {"career": "건축가"}, prompt=f"이슈{i}", system_message="")
+            for i, state in enumerate(states)
+        ))
+        elapsed = time.perf_counter() - started
+        assert results[1:] == [["이슈0 결과"], ["이슈1 결과"], ["이슈2 결과"]]
+        assert elapsed < 0.45, f"GPT 호출이 순서대로 실행됨: {elapsed:.2f}초"
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15, "이벤트 루프가 막힘"
+
+        # 같은 입력은 기억한 결과 재사용 (호출 없음)
+        assert await high_school.remembered_gpt_list(states[0], "issues", {"career": "건축가"}, prompt="다시") == ["이슈0 결과"]
+
+    original = high_school.call_gpt_list
+    high_school.call_gpt_list = slow_call_gpt_list
+    try:
+        asyncio.run(scenario())
+    finally:
+        high_school.call_gpt_list = original
+    assert len(calls) == 3
+
+
+if __name__ == "__main__":
+    test_update_from_context()
+    test_remember_and_recall()
+    test_store_expiry_and_eviction()
+    test_speculative_tasks()
+    test_remembered_gpt_list_does_not_block_event_loop()
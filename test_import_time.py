@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+서버 시작(import) 시간 및 하위 앱 지연 로딩 테스트 (서버 없이 실행)
+"""
+
+import os
+import sys
+sys.path.append('.')
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.import_time_bench import parse_importtime, run_benchmark
+from common.lazy_app import LazyApp
+
+# 루트 앱 import 시간 상한 (초, 느린 CI 환경에서는 환경변수로 조정)
+IMPORT_TIME_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", "1.0"))
+
+# 서버 시작 시 불러오면 안 되는 무거운 모듈 (하위 앱 첫 요청 때 불러옴)
+HEAVY_MODULES = ("openai", "reportlab", "jinja2", "elementary_school.elementary_school",
+                 "middle_school.middle_school", "high_school.high_school")
+
+
+def test_parse_importtime():
+    """-X importtime 출력에서 모듈별 자기/누적 시간과 깊이를 읽는지 테스트"""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   common.metrics\n"
+        "import time:       300 |        420 | main\n"
+    )
+    entries = parse_importtime(stderr)
+    assert entries == [
+        {"module": "common.metrics", "depth": 1, "self_s": 0.00012, "cumulative_s": 0.00012},
+        {"module": "main", "depth": 0, "self_s": 0.0003, "cumulative_s": 0.00042},
+    ]
+
+
+def test_main_import_is_fast_and_light():
+    """루트 앱 import가 상한 안에 끝나고 하위 앱과 무거운 모듈을 불러오지 않는지 테스트"""
+    print("🧪 루트 앱 import 시간 테스트 시작")
+
+    result = run_benchmark("main", repeat=3)
+    for entry in result["direct"][:10]:
+        print(f"   {entry['cumulative_s'] * 1000:>8.1f}ms  {entry['module']}")
+
+    loaded = sorted(module for module in HEAVY_MODULES if module in result["modules"])
+    assert not loaded, f"서버 시작 시 불러온 무거운 모듈: {loaded}"
+    assert result["min_s"] < IMPORT_TIME_BUDGET, f"main import {result['min_s'] * 1000:.0f}ms"
+
+    print(f"✅ 루트 앱 import 시간 테스트 통과 ({result['min_s'] * 1000:.0f}ms)")
+
+
+def test_lazy_app_loads_on_first_request():
+    """마운트한 하위 앱을 첫 요청 때 한 번만 불러오는지 테스트"""
+    sys.modules.pop("app1.app1", None)
+    lazy = LazyApp("app1.app1:app")
+    root = FastAPI()
+    root.mount("/app1", lazy)
+    assert not lazy.loaded and lazy.routes == []
+
+    client = TestClient(root)
+    assert client.get("/app1/").status_code == 200
+    loaded_app = lazy.app
+    assert lazy.loaded and lazy.status()["load_ms"] is not None
+    assert client.get("/app1/").status_code == 200
+    assert lazy.app is loaded_app and lazy.routes
+
+
+if __name__ == "__main__":
+    test_parse_importtime()
+    test_main_import_is_fast_and_light()
+    test_lazy_app_loads_on_first_request()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+학생 진행 단계별 시간 기록 테스트 (서버 없이 실행)
+"""
+
+import sys
+sys.path.append('.')
+
+from common.journey import JourneyTelemetry, begin_request, mark_stage
+
+
+def test_think_server_and_llm_time_per_stage():
+    """이전 응답 후 다음 요청까지의 생각 시간과 서버/LLM 시간을 단계별로 나누는지 테스트"""
+    print("🧪 단계별 시간 기록 테스트 시작")
+
+    telemetry = JourneyTelemetry(max_think_seconds=600)
+    assert telemetry.record("middle", "s1", "start", arrived_at=1000.0, server_seconds=0.5) is None
+    think = telemetry.record("middle", "s1", "step_1", arrived_at=1030.5, server_seconds=2.0, llm_seconds=1.5)
+    assert think == 30.0
+
+    # 너무 오래 비운 뒤 돌아오면 생각 시간에서 제외
+    assert telemetry.record("middle", "s1", "step_2", arrived_at=5000.0, server_seconds=0.1) is None
+
+    journey = telemetry.session("middle", "s1")
+    assert [stage["stage"] for stage in journey["stages"]] == ["start", "step_1", "step_2"]
+    assert journey["stages"][1] == {"stage": "step_1", "offset_s": 30, "think_ms": 30000, "server_ms": 2000, "llm_ms": 1500}
+    assert telemetry.session("high", "s1") is None
+
+    stats = telemetry.stats()["middle"]["step_1"]
+    assert stats["think"]["p50"] == 30.0 and stats["llm"]["p99"] == 1.5
+    assert "think" not in telemetry.stats()["middle"]["step_2"]
+
+    print("✅ 단계별 시간 기록 테스트 통과")
+
+
+def test_session_limit_and_mark_outside_request():
+    """세션 수 제한과 요청 밖 mark_stage 무시 테스트"""
+    telemetry = JourneyTelemetry(max_sessions=2)
+    for session_id in ("a", "b", "c"):
+        telemetry.record("high", session_id, "start", arrived_at=0.0, server_seconds=0.1)
+    assert len(telemetry) == 2 and telemetry.session("high", "a") is None
+
+    mark_stage("high", "x", "step_1")
+    holder = begin_request()
+    mark_stage("high", "x", "step_1")
+    assert holder == {"school": "high", "session_id": "x", "stage": "step_1"}
+
+
+if __name__ == "__main__":
+    test_think_server_and_llm_time_per_stage()
+    test_session_limit_and_mark_outside_request()
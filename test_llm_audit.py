@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+LLM 감사 로그 (표본 선택, 이름 가리기, 압축 JSONL 묶음 기록) 테스트 (OpenAI 호출 없이 실행)
+"""
+
+import gzip
+import json
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append('.')
+
+from common.llm_audit import AuditSink, redact
+
+
+def test_redact_student_names():
+    """알려진 이름과 '이름:' 항목 값을 가리는지 테스트"""
+    text = "학생 이름: 김민지\n민지 학생은 그림을 좋아합니다. 김민지 학생의 꿈"
+    assert redact(text, ["김민지", "민지"]) == "학생 이름: [이름]\n[이름] 학생은 그림을 좋아합니다. [이름] 학생의 꿈"
+    assert redact("이름:박서준, 2학년") == "이름:[이름], 2학년"
+    assert redact(None, ["김민지"]) is None
+
+
+def test_sampled_records_written_as_gzip_jsonl():
+    """표본만 큐에 넣고, 쓰기 스레드가 이름을 가려 압축 JSONL로 기록하는지 테스트"""
+    print("🧪 LLM 감사 로그 기록 테스트 시작")
+
+    with tempfile.TemporaryDirectory() as directory:
+        sink = AuditSink(directory, sample_rate=0.0, sample_rates={"middle.recommendation": 1.0},
+                         batch_size=2, flush_seconds=0.05)
+        messages = [{"role": "system", "content": "진로 상담가"}, {"role": "user", "content": "이름: 이서연\n이서연 학생 응답"}]
+
+        assert sink.submit("middle.dream_logic", "gpt-4.1", messages, "응답", 1.0) is False
+        for i in range(3):
+            assert sink.submit("middle.recommendation", "gpt-4.1-mini", messages, f"이서연 학생에게 추천 {i}", 0.5,
+                               {"prompt": 10, "completion": 5}, ["이서연"])
+        assert sink.flush(5)
+
+        files = list(Path(directory).glob("llm-audit-*.jsonl.gz"))
+        assert len(files) == 1
+        with gzip.open(files[0], "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+    assert len(records) == 3
+    assert all(record["call_site"] == "middle.recommendation" for record in records)
+    assert "이서연" not in json.dumps(records, ensure_ascii=False)
+    assert records[0]["messages"][1]["content"] == "이름: [이름]\n[이름] 학생 응답"
+    assert records[0]["response"] == "[이름] 학생에게 추천 0"
+    assert records[0]["usage"] == {"prompt": 10, "completion": 5}
+
+    print("✅ LLM 감사 로그 기록 테스트 통과")
+
+
+def test_gateway_submits_to_audit_sink():
+    """게이트웨이 호출 결과가 감사 로그로 전달되는지 테스트"""
+    import common.llm_gateway as gateway_module
+    from common.llm_gateway import LLMGateway, ModelRoute
+
+    class Recorder:
+        def __init__(self):
+            self.records = []
+
+        def submit(self, *args, **kwargs):
+            self.records.append((args, kwargs))
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **params: SimpleNamespace(
+        model=params["model"], usage=SimpleNamespace(prompt_tokens=3, completion_tokens=2),
+        choices=[SimpleNamespace(message=SimpleNamespace(content="추천"))]))))
+    recorder = Recorder()
+    original = gateway_module.llm_audit
+    gateway_module.llm_audit = recorder
+    try:
+        LLMGateway({"site": ModelRoute(primary="model-a")}, hedging=False).chat(
+            client, "site", [{"role": "user", "content": "질문"}], redact=["김민지"])
+    finally:
+        gateway_module.llm_audit = original
+
+    (call_site, model, _, text, _, usage, names), _ = recorder.records[0]
+    assert (call_site, model, text, usage, names) == ("site", "model-a", "추천", {"prompt": 3, "completion": 2}, ["김민지"])
+
+
+if __name__ == "__main__":
+    test_redact_student_names()
+    test_sampled_records_written_as_gzip_jsonl()
+    test_gateway_submits_to_audit_sink()
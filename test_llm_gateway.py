@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+LLM 게이트웨이 모델 라우팅 및 지연 목표 기반 전환 테스트 (OpenAI 호출 없이 실행)
+"""
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+sys.path.append('.')
+
+from common.llm_gateway import CircuitOpenError, LLMGateway, ModelRoute, build_params
+
+
+class FakeClient:
+    """호출 파라미터를 기록하는 테스트용 OpenAI 클라이언트 (모델별 지연 지정 가능)"""
+
+    def __init__(self, delays=None):
+        self.calls = []
+        self.delays = delays or {}
+        self.failing = set()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **params):
+        self.calls.append(params)
+        time.sleep(self.delays.get(params["model"], 0))
+        if params["model"] in self.failing:
+            raise TimeoutError("요청 시간 초과")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=params["model"]))])
+
+
+def test_build_params_dialects():
+    """모델별 토큰 제한 파라미터 이름과 temperature 처리 테스트"""
+    print("🧪 파라미터 형식 테스트 시작")
+
+    messages = [{"role": "user", "content": "안녕"}]
+    chat = build_params("gpt-4.1-mini", messages, max_tokens=200, temperature=0.7)
+    assert chat["max_tokens"] == 200 and chat["temperature"] == 0.7
+
+    reasoning = build_params("gpt-5", messages, max_tokens=200, temperature=0.7)
+    assert reasoning["max_completion_tokens"] == 200
+    assert "temperature" not in reasoning and "max_tokens" not in reasoning
+
+    # 토큰 제한이 없으면 파라미터를 넣지 않음
+    assert "max_tokens" not in build_params("gpt-4.1-mini", messages)
+
+    print("✅ 파라미터 형식 테스트 통과")
+
+
+def test_switches_to_fallback_when_p95_breaks_slo():
+    """기본 모델의 p95 지연이 목표를 넘으면 대체 모델로 전환하는지 테스트"""
+    print("🧪 지연 목표 기반 모델 전환 테스트 시작")
+
+    gateway = LLMGateway({"site": ModelRoute(primary="slow-model", fallbacks=["fast-model"], latency_slo=2)})
+    client = FakeClient()
+
+    gateway.chat(client, "site", [{"role": "user", "content": "질문"}], max_tokens=10)
+    assert client.calls[-1]["model"] == "slow-model"
+
+    for _ in range(10):
+        gateway.latency.record("site", "slow-model", 5.0)
+    assert gateway.select_model("site") == "fast-model"
+
+    gateway.chat(client, "site", [{"role": "user", "content": "질문"}], max_tokens=10)
+    assert client.calls[-1]["model"] == "fast-model"
+    assert gateway.stats()["site"]["models"]["fast-model"]["count"] == 1
+
+    print("✅ 지연 목표 기반 모델 전환 테스트 통과")
+
+
+def test_returns_to_primary_after_window():
+    """느린 기록이 구간 밖으로 밀려나면 기본 모델로 돌아오는지 테스트"""
+    gateway = LLMGateway({"site": ModelRoute(primary="slow-model", fallbacks=["fast-model"], latency_slo=2)})
+    for _ in range(10):
+        gateway.latency.record("site", "slow-model", 5.0)
+    assert gateway.select_model("site") == "fast-model"
+
+    gateway.latency.window_seconds = 0
+    assert gateway.select_model("site") == "slow-model"
+
+
+def test_hedged_request_takes_faster_answer():
+    """첫 요청이 늦으면 중복 요청을 보내 먼저 온 응답을 쓰는지 테스트"""
+    print("🧪 헤지 요청 테스트 시작")
+
+    route = ModelRoute(primary="slow-model", latency_slo=0.1, hedge_percentile=0.9, hedge_model="fast-model")
+    gateway = LLMGateway({"site": route}, hedging=True)
+    client = FakeClient({"slow-model": 1.0, "fast-model": 0.05})
+
+    started = time.perf_counter()
+    response = gateway.chat(client, "site", [{"role": "user", "content": "질문"}], max_tokens=10)
+    elapsed = time.perf_counter() - started
+
+    assert response.choices[0].message.content == "fast-model"
+    assert elapsed < 0.5, f"헤지 응답을 기다리지 않음: {elapsed:.2f}초"
+    assert gateway.hedge_counts["site"] == {"fired": 1, "won": 1}
+
+    print("✅ 헤지 요청 테스트 통과")
+
+
+def test_hedge_budget_limits_extra_requests():
+    """헤지 예산을 다 쓰면 중복 요청 없이 첫 요청을 기다리는지 테스트"""
+    route = ModelRoute(primary="slow-model", latency_slo=0.01, hedge_percentile=0.9, hedge_model="fast-model")
+    gateway = LLMGateway({"site": route}, hedging=True)
+    gateway.hedge_budget.burst = 1
+    gateway.hedge_budget.ratio = 0
+    gateway.hedge_budget._tokens = 1
+    client = FakeClient({"slow-model": 0.1})
+
+    for _ in range(3):
+        gateway.chat(client, "site", [{"role": "user", "content": "질문"}])
+    assert gateway.hedge_counts["site"]["fired"] == 1
+    assert len(client.calls) == 4
+
+
+def test_concurrent_hedged_calls_do_not_queue():
+    """헤지 대상 호출이 동시에 많이 들어와도 첫 요청이 스레드 풀에서 줄 서지 않는지 테스트 (한 반 30명 동시 요청)"""
+    route = ModelRoute(primary="slow-model", latency_slo=5, hedge_percentile=0.9, hedge_model="fast-model")
+    gateway = LLMGateway({"site": route}, hedging=True)
+    client = FakeClient({"slow-model": 0.3})
+
+    threads = [threading.Thread(target=gateway.chat, args=(client, "site", [{"role": "user", "content": f"질문{i}"}]))
+               for i in range(30)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5, f"첫 요청이 줄 서서 기다림: {elapsed:.2f}초"
+    assert len(client.calls) == 30 and "site" not in gateway.hedge_counts
+    assert max(gateway.latency.recent("site", "slow-model")) < 0.6
+
+
+def test_blocked_hedge_model_keeps_budget():
+    """헤지 모델 회로가 차단되어 있으면 헤지 예산을 쓰지 않는지 테스트"""
+    route = ModelRoute(primary="slow-model", latency_slo=0.01, hedge_percentile=0.9, hedge_model="fast-model")
+    gateway = LLMGateway({"site": route}, hedging=True)
+    gateway.hedge_budget.ratio = 0
+    gateway.hedge_budget._tokens = 1
+    hedge_breaker = gateway.breaker("site", "fast-model")
+    hedge_breaker.state, hedge_breaker.opened_at = "open", time.time()
+    client = FakeClient({"slow-model": 0.05})
+
+    gateway.chat(client, "site", [{"role": "user", "content": "질문"}])
+    assert [call["model"] for call in client.calls] == ["slow-model"]
+    assert gateway.hedge_budget._tokens == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """연속 실패 시 회로가 열려 바로 실패/캐시 응답을 주고, 시험 호출로 복구되는지 테스트"""
+    print("🧪 회로 차단기 테스트 시작")
+
+    gateway = LLMGateway({"site": ModelRoute(primary="model-a")}, hedging=False)
+    client = FakeClient()
+    messages = [{"role": "user", "content": "질문"}]
+    gateway.chat(client, "site", messages)
+
+    client.failing.add("model-a")
+    for _ in range(3):
+        try:
+            gateway.chat(client, "site", [{"role": "user", "content": "다른 질문"}])
+        except TimeoutError:
+            pass
+    assert gateway.breaker("site", "model-a").state == "open"
+
+    # 차단 중에는 모델을 호출하지 않고, 같은 요청은 최근 응답으로 대체
+    calls = len(client.calls)
+    assert gateway.chat(client, "site", messages).choices[0].message.content == "model-a"
+    try:
+        gateway.chat(client, "site", [{"role": "user", "content": "새 질문"}])
+        assert False, "CircuitOpenError가 발생해야 합니다"
+    except CircuitOpenError:
+        pass
+    assert len(client.calls) == calls
+
+    # 차단 시간이 지나면 시험 호출 후 복구
+    client.failing.clear()
+    gateway.breaker("site", "model-a").opened_at -= 3600
+    gateway.chat(client, "site", [{"role": "user", "content": "새 질문"}])
+    assert gateway.breaker("site", "model-a").state == "closed"
+
+    print("✅ 회로 차단기 테스트 통과")
+
+
+def test_open_circuit_moves_to_fallback_model():
+    """기본 모델 회로가 열리면 대체 모델로 호출하는지 테스트"""
+    gateway = LLMGateway({"site": ModelRoute(primary="model-a", fallbacks=["model-b"])}, hedging=False)
+    client = FakeClient()
+    client.failing.add("model-a")
+    for _ in range(3):
+        try:
+            gateway.chat(client, "site", [{"role": "user", "content": "질문"}])
+        except TimeoutError:
+            pass
+    response = gateway.chat(client, "site", [{"role": "user", "content": "질문"}])
+    assert response.choices[0].message.content == "model-b"
+
+
+def test_client_errors_do_not_open_circuit():
+    """잘못된 요청(4xx)은 회로 차단기 실패로 세지 않고, 5xx/429·연결 오류만 세는지 테스트"""
+    class BadRequestError(Exception):
+        status_code = 400
+
+    class RateLimitError(Exception):
+        status_code = 429
+
+    gateway = LLMGateway({"site": ModelRoute(primary="model-a")}, hedging=False)
+    errors = []
+
+    def create(**params):
+        raise errors[-1]
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    errors.append(BadRequestError("context length exceeded"))
+    for _ in range(5):
+        try:
+            gateway.chat(client, "site", [{"role": "user", "content": "너무 긴 질문"}])
+        except BadRequestError:
+            pass
+    breaker = gateway.breaker("site", "model-a")
+    assert breaker.state == "closed" and breaker.failures == 0
+
+    for error in (RateLimitError("rate limit"), ConnectionError("refused"), TimeoutError("timeout")):
+        errors.append(error)
+        try:
+            gateway.chat(client, "site", [{"role": "user", "content": "질문"}])
+        except type(error):
+            pass
+    assert breaker.state == "open"
+
+
+def test_call_gpt_list_skips_retries_when_circuit_open():
+    """고등학교 GPT 호출이 회로 차단 시 대기 없이 바로 기본값을 돌려주는지 테스트"""
+    import os
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    import high_school.high_school as high_school
+
+    original = high_school.llm_gateway.chat
+
+    def open_circuit(*args, **kwargs):
+        raise CircuitOpenError("차단")
+
+    high_school.llm_gateway.chat = open_circuit
+    try:
+        started = time.perf_counter()
+        items = high_school.call_gpt_list("프롬프트", "시스템", fallback=["기본값"], call_site="high_school.issues")
+        elapsed = time.perf_counter() - started
+    finally:
+        high_school.llm_gateway.chat = original
+    assert items == ["기본값"]
+    assert elapsed < 0.5
+
+
+def test_unknown_call_site():
+    """라우팅 표에 없는 호출 위치는 오류 처리"""
+    gateway = LLMGateway({})
+    try:
+        gateway.select_model("missing")
+        assert False, "KeyError가 발생해야 합니다"
+    except KeyError:
+        pass
+
+
+if __name__ == "__main__":
+    test_build_params_dialects()
+    test_switches_to_fallback_when_p95_breaks_slo()
+    test_returns_to_primary_after_window()
+    test_hedged_request_takes_faster_answer()
+    test_hedge_budget_limits_extra_requests()
+    test_concurrent_hedged_calls_do_not_queue()
+    test_blocked_hedge_model_keeps_budget()
+    test_circuit_breaker_opens_and_recovers()
+    test_open_circuit_moves_to_fallback_model()
+    test_client_errors_do_not_open_circuit()
+    test_call_gpt_list_skips_retries_when_circuit_open()
+    test_unknown_call_site()
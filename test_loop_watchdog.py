@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+이벤트 루프 차단 감시 테스트 (서버 없이 실행)
+"""
+
+import asyncio
+import sys
+import time
+sys.path.append('.')
+
+from common.loop_watchdog import LoopWatchdog
+
+
+def blocking_handler(scope):
+    """루프를 막는 요청 처리 함수 흉내"""
+    time.sleep(0.3)
+
+
+def test_blocking_call_reported_with_stack_and_path():
+    """루프를 막은 함수의 스택과 요청 경로를 한 번만 남기고 지연 분위수를 계산하는지 테스트"""
+    print("🧪 이벤트 루프 차단 감시 테스트 시작")
+
+    async def scenario():
+        watchdog = LoopWatchdog(interval=0.02, threshold=0.1, report_interval=60)
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.1)
+            for _ in range(2):
+                blocking_handler({"type": "http", "path": "/high_school/career/flow"})
+                await asyncio.sleep(0.1)
+        finally:
+            watchdog.stop()
+        return watchdog
+
+    watchdog = asyncio.run(scenario())
+
+    # 같은 위치의 두 번째 차단은 스택을 다시 남기지 않음
+    assert len(watchdog.recent_blocks) == 1
+    report = watchdog.recent_blocks[0]
+    assert "blocking_handler" in report["location"]
+    assert report["path"] == "/high_school/career/flow"
+    assert report["seconds"] >= 0.2
+    assert any("time.sleep(0.3)" in line for line in report["stack"])
+
+    stats = watchdog.stats()
+    assert stats["lag_seconds"]["p99"] >= 0.2
+    assert "stack" not in stats["recent_blocks"][0]
+
+    print("✅ 이벤트 루프 차단 감시 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_blocking_call_reported_with_stack_and_path()
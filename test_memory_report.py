@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+메모리 진단 보고 테스트 (서버 없이 실행)
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append('.')
+
+from common.memory_report import (SnapshotStore, deep_sizeof, register_structure, register_temp_files,
+                                  structures_report, temp_files_report)
+
+
+class Session:
+    def __init__(self, answer):
+        self.responses = {"step1": answer}
+
+
+def test_structures_report_counts_and_sizes():
+    """등록된 구조의 항목 수와 참조를 따라간 크기를 보고하는지 테스트"""
+    print("🧪 메모리 구조 보고 테스트 시작")
+
+    sessions = {f"s{i}": Session("가" * 1000 + str(i)) for i in range(10)}
+    register_structure("test.sessions", lambda: sessions)
+    report = {item["name"]: item for item in structures_report()}
+
+    assert report["test.sessions"]["entries"] == 10
+    assert report["test.sessions"]["bytes"] > 10 * 2000
+    assert report["test.sessions"]["truncated"] is False
+
+    # 같은 객체를 여러 번 참조해도 한 번만 셈
+    shared = "나" * 1000
+    assert deep_sizeof([shared] * 100)["bytes"] < deep_sizeof([shared + str(i) for i in range(100)])["bytes"]
+    assert deep_sizeof(sessions, max_objects=5)["truncated"] is True
+
+    print("✅ 메모리 구조 보고 테스트 통과")
+
+
+def test_temp_files_report():
+    """등록된 임시 파일 패턴의 개수와 크기 보고 테스트"""
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(3):
+            with open(os.path.join(directory, f"high_school_career_{i}.pdf"), "wb") as f:
+                f.write(b"%PDF" * 10)
+        register_temp_files("test.temp_pdfs", os.path.join(directory, "high_school_career_*.pdf"))
+        report = {item["name"]: item for item in temp_files_report()}
+        assert report["test.temp_pdfs"]["files"] == 3
+        assert report["test.temp_pdfs"]["bytes"] == 120
+
+
+def test_snapshot_diff_shows_growth():
+    """두 tracemalloc 스냅샷 사이 늘어난 할당 위치를 찾는지 테스트"""
+    store = SnapshotStore(max_snapshots=2)
+    try:
+        store.take()
+        assert False, "추적 전 스냅샷은 ValueError가 발생해야 합니다"
+    except ValueError:
+        pass
+
+    store.start()
+    try:
+        base = store.take()["snapshot_id"]
+        leaked = [bytearray(1024) for _ in range(500)]
+        target = store.take()["snapshot_id"]
+        diff = store.diff(base, target, limit=5)
+        assert diff["size_diff"] > 500 * 1024
+        assert "test_memory_report.py" in diff["top"][0]["location"]
+        assert store.diff(base, "missing") is None
+        assert len(leaked) == 500
+    finally:
+        store.stop()
+
+
+if __name__ == "__main__":
+    test_structures_report_counts_and_sizes()
+    test_temp_files_report()
+    test_snapshot_diff_shows_growth()
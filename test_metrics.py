@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+운영 지표 레지스트리 및 Prometheus 텍스트 출력 테스트 (서버 없이 실행)
+"""
+
+import sys
+sys.path.append('.')
+
+from common.metrics import MetricsRegistry, timed
+
+
+def test_counter_and_gauge_render():
+    """카운터 누적, 게이지 함수 값, 라벨 출력 테스트"""
+    print("🧪 카운터/게이지 출력 테스트 시작")
+
+    registry = MetricsRegistry()
+    counter = registry.counter("llm_retries_total", "재시도 수", ("call_site",))
+    counter.inc(call_site="high_school.issues")
+    counter.inc(2, call_site="high_school.issues")
+    assert registry.counter("llm_retries_total", "재시도 수", ("call_site",)) is counter
+
+    sessions = {"a": 1, "b": 2}
+    gauge = registry.gauge("sessions_live", "세션 수", ("school",))
+    gauge.set_function(lambda: len(sessions), school="middle")
+    sessions["c"] = 3
+
+    text = registry.render()
+    assert "# TYPE llm_retries_total counter" in text
+    assert 'llm_retries_total{call_site="high_school.issues"} 3' in text
+    assert 'sessions_live{school="middle"} 3' in text
+
+    try:
+        counter.inc(school="middle")
+        assert False, "잘못된 라벨은 ValueError가 발생해야 합니다"
+    except ValueError:
+        pass
+
+    print("✅ 카운터/게이지 출력 테스트 통과")
+
+
+def test_histogram_buckets_are_cumulative():
+    """히스토그램 구간이 누적 개수로 출력되는지 테스트"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("pdf_render_seconds", "PDF 렌더링 시간", ("school",), (0.1, 1))
+    for value in (0.05, 0.5, 3):
+        histogram.observe(value, school="high")
+    with timed(histogram, school="high"):
+        pass
+
+    text = registry.render()
+    assert 'pdf_render_seconds_bucket{school="high",le="0.1"} 2' in text
+    assert 'pdf_render_seconds_bucket{school="high",le="1"} 3' in text
+    assert 'pdf_render_seconds_bucket{school="high",le="+Inf"} 4' in text
+    assert 'pdf_render_seconds_count{school="high"} 4' in text
+    assert histogram.count(school="high") == 4
+
+
+if __name__ == "__main__":
+    test_counter_and_gauge_render()
+    test_histogram_buckets_are_cumulative()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+PDF 렌더링 벤치마크 스모크 테스트 (서버 없이 실행)
+"""
+
+import sys
+sys.path.append('.')
+
+from benchmarks.pdf_corpus import build_corpus
+from benchmarks.pdf_render_bench import compare_results, run_benchmarks
+
+
+def test_corpus_cases():
+    """코퍼스에 short / long / emoji 케이스가 모두 있는지 테스트"""
+    cases = [entry["case"] for entry in build_corpus()]
+    assert cases == ["short", "long", "emoji"]
+    for entry in build_corpus():
+        assert "[중간목표" in entry["dream_logic"]
+        assert "[최종 목표(꿈)]" in entry["final_summary"]
+
+
+def test_benchmark_smoke():
+    """생성기 하나로 웜 측정 및 기준 대비 비교 테스트"""
+    print("🧪 PDF 벤치마크 스모크 테스트 시작")
+
+    current = run_benchmarks(["elementary"], ["short"], repeat=1, cold=False)
+    result = current["results"]["elementary/short"]
+    assert "error" not in result
+    assert result["output_bytes"] > 0 and result["peak_memory_bytes"] > 0
+
+    baseline = {"results": {"elementary/short": dict(result, output_bytes=result["output_bytes"] * 2)}}
+    lines = compare_results(baseline, current)
+    assert lines[0] == "elementary/short"
+    assert any("-50.0%" in line for line in lines)
+
+    print("✅ PDF 벤치마크 스모크 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_corpus_cases()
+    test_benchmark_smoke()
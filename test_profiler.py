@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+요청 단위 샘플링 프로파일러 테스트 (서버 없이 실행)
+"""
+
+import sys
+import tempfile
+import threading
+import time
+sys.path.append('.')
+
+from common.profiler import RequestProfiler
+
+
+def busy_work(seconds):
+    """프로젝트 코드 안에서 CPU를 쓰는 작업"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def test_profile_written_in_folded_format():
+    """수집 중 실행된 프로젝트 함수가 folded 스택으로 저장되는지 테스트"""
+    print("🧪 요청 프로파일 저장 테스트 시작")
+
+    with tempfile.TemporaryDirectory() as directory:
+        profiler = RequestProfiler(directory, sample_rates={}, interval=0.002, max_files=2)
+        sampler = profiler.start()
+        assert profiler.start() is None, "동시에 두 요청을 프로파일하면 안 됩니다"
+
+        worker = threading.Thread(target=busy_work, args=(0.1,), name="worker")
+        worker.start()
+        worker.join()
+        profile_id = profiler.finish(sampler, "requested", "POST", "/high_school/career/flow")
+
+        assert profile_id.endswith("-requested-POST-high_school_career_flow")
+        lines = profiler.path_for(profile_id).read_text(encoding="utf-8").splitlines()
+        worker_lines = [line for line in lines if line.startswith("worker;")]
+        assert worker_lines and all(" (test_profiler.py:" in line for line in worker_lines)
+        assert any(";busy_work (test_profiler.py:" in line for line in worker_lines)
+        assert int(worker_lines[0].rsplit(" ", 1)[1]) > 0
+
+        # 보관 개수를 넘으면 오래된 것부터 삭제
+        for _ in range(2):
+            time.sleep(0.002)
+            profiler.finish(profiler.start(), "sampled", "GET", "/")
+        assert len(profiler.list()) == 2
+        assert profiler.path_for(profile_id) is None
+        assert profiler.path_for("../secret") is None
+
+    print("✅ 요청 프로파일 저장 테스트 통과")
+
+
+def test_reason_requires_admin_or_sample():
+    """운영자 요청 또는 경로별 무작위 비율로만 프로파일하는지 테스트"""
+    profiler = RequestProfiler(tempfile.gettempdir(), sample_rates={"/high_school": 0.0, "/high_school/career/flow": 1.0})
+    assert profiler.reason("/middle_school/career/start", requested=True, admin=True) == "requested"
+    assert profiler.reason("/middle_school/career/start", requested=True, admin=False) is None
+    assert profiler.reason("/high_school/career/flow", requested=False, admin=False) == "sampled"
+    assert profiler.reason("/high_school/", requested=False, admin=False) is None
+
+
+if __name__ == "__main__":
+    test_profile_written_in_folded_format()
+    test_reason_requires_admin_or_sample()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+점진적 응답 작업(기본 선택지 먼저 반환 → 폴링/SSE 전달) 테스트 (서버 없이 실행)
+"""
+
+import asyncio
+import sys
+import time
+sys.path.append('.')
+
+from common.progressive import ProgressiveJobs
+
+
+def _slow_choices(label):
+    time.sleep(0.1)
+    return [f"{label}{i}" for i in range(1, 6)]
+
+
+def test_start_reuses_running_job_and_waits():
+    """같은 키의 작업 재사용 및 대기 후 결과 반환 테스트"""
+    print("🧪 점진적 응답 작업 테스트 시작")
+
+    async def scenario():
+        jobs = ProgressiveJobs()
+        token = jobs.start("middle:s1:step4", _slow_choices, "AI")
+        assert jobs.start("middle:s1:step4", _slow_choices, "다른") == token
+        assert jobs.get(token).status() == {"status": "pending"}
+
+        status = await jobs.wait(token, 1)
+        assert status == {"status": "ready", "result": ["AI1", "AI2", "AI3", "AI4", "AI5"]}
+        assert await jobs.wait("missing", 0) is None
+
+    asyncio.run(scenario())
+    print("✅ 점진적 응답 작업 테스트 통과")
+
+
+def test_events_stream_keepalive_then_result():
+    """SSE 스트림이 기다리는 동안 연결 유지 주석을 보내고 결과를 한 번 전송하는지 테스트"""
+    async def scenario():
+        jobs = ProgressiveJobs()
+        token = jobs.start("elementary:s1:step4", _slow_choices, "AI")
+        chunks = [chunk async for chunk in jobs.events(token, lambda status: {"status": "ready", "n": len(status["result"])},
+                                                        heartbeat=0.02)]
+        assert chunks[0] == ": keep-alive\n\n"
+        assert chunks[-1] == 'event: ready\ndata: {"status": "ready", "n": 5}\n\n'
+
+    asyncio.run(scenario())
+
+
+def test_failed_job_reported():
+    """생성 함수가 실패하면 failed 상태로 전달되는지 테스트"""
+    def broken():
+        raise RuntimeError("생성 실패")
+
+    async def scenario():
+        jobs = ProgressiveJobs()
+        token = jobs.start("middle:s2:step4", broken)
+        assert await jobs.wait(token, 1) == {"status": "failed"}
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_start_reuses_running_job_and_waits()
+    test_events_stream_keepalive_then_result()
+    test_failed_job_reported()
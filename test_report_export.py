@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+반 단위 보고서 일괄 내보내기(ZIP 스트리밍) 테스트 (서버 없이 실행)
+"""
+
+import asyncio
+import io
+import sys
+import zipfile
+sys.path.append('.')
+
+from common.report_export import ExportJob, safe_entry_name, stream_reports_zip
+
+
+def fake_render(render_args):
+    """프로세스 풀 워커에서 실행되는 테스트용 렌더링 함수"""
+    if render_args.get("fail"):
+        raise ValueError("렌더링 실패")
+    return f"%PDF-{render_args['student_name']}".encode('utf-8')
+
+
+async def _collect(jobs, skipped=None):
+    chunks = []
+    async for chunk in stream_reports_zip(jobs, fake_render, skipped=skipped, max_in_flight=2):
+        chunks.append(chunk)
+    return chunks
+
+
+def test_stream_reports_zip():
+    """병렬 렌더링 결과가 하나의 ZIP으로 스트리밍되는지 테스트"""
+    print("🧪 ZIP 스트리밍 테스트 시작")
+
+    jobs = [ExportJob(f"학생{i}.pdf", {"student_name": f"학생{i}"}) for i in range(5)]
+    jobs.append(ExportJob("캐시.pdf", {}, cached_pdf=b"%PDF-cached"))
+    jobs.append(ExportJob("실패.pdf", {"student_name": "x", "fail": True}))
+
+    chunks = asyncio.run(_collect(jobs, skipped=[("abc", "세션을 찾을 수 없습니다.")]))
+    assert len(chunks) > 1
+
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+    names = archive.namelist()
+    assert sorted(names[:-1]) == sorted([f"학생{i}.pdf" for i in range(5)] + ["캐시.pdf"])
+    assert archive.read("학생3.pdf") == "%PDF-학생3".encode('utf-8')
+    assert archive.read("캐시.pdf") == b"%PDF-cached"
+
+    report = archive.read("내보내기_제외_목록.txt").decode('utf-8')
+    assert "abc" in report and "실패.pdf" in report
+
+    print("✅ ZIP 스트리밍 테스트 통과")
+
+
+def test_export_requires_authentication():
+    """인증 없이 반 단위 내보내기를 요청하면 401/403으로 거부되는지 테스트"""
+    from fastapi.testclient import TestClient
+    from elementary_school.elementary_school import app as elementary_app
+    from middle_school.middle_school import app as middle_app
+
+    for app in (elementary_app, middle_app):
+        client = TestClient(app)
+        body = {"class_tag": "5-2"}
+        assert client.post("/career/reports/export", json=body).status_code in (401, 403)
+        response = client.post("/career/reports/export", json=body, headers={"Authorization": "Bearer wrong-token"})
+        assert response.status_code == 401
+
+        # 인증된 요청은 내보내기 처리까지 진행 (해당 반 세션이 없으면 404)
+        response = client.post("/career/reports/export", json=body, headers={"Authorization": "Bearer valid-token"})
+        assert response.status_code == 404
+
+
+def test_session_report_args_include_encouragement():
+    """세션 보고서 인자에 드림로직 응원 메시지가 들어가고, 메시지가 바뀌면 ETag(캐시 키)도 바뀌는지 테스트"""
+    from types import SimpleNamespace
+    from elementary_school.elementary_school import _session_report_args, pdf_generator
+
+    dream_logic = "[중간목표1] 기초 실력 쌓기\n실천활동1: 책 읽기\n\n응원 메모: 민수님의 호기심은 큰 힘이에요!"
+    session = SimpleNamespace(student_info=SimpleNamespace(name="민수"), responses={}, final_career_goal="과학자",
+                              ai_career_recommendation=None, dream_logic=dream_logic, dream_logic_tree=None)
+    report_args = _session_report_args(session)
+    assert report_args["encouragement_message"] == "민수님의 호기심은 큰 힘이에요!"
+
+    changed = _session_report_args(SimpleNamespace(**{**vars(session), "dream_logic": dream_logic.replace("큰 힘", "보물")}))
+    assert pdf_generator.report_cache_key(**report_args) != pdf_generator.report_cache_key(**changed)
+
+
+def test_safe_entry_name():
+    """ZIP 항목 이름 정리 테스트"""
+    assert safe_entry_name("김 민수/5-2") == "김_민수_5-2"
+    assert safe_entry_name("  ") == "student"
+
+
+if __name__ == "__main__":
+    test_stream_reports_zip()
+    test_export_requires_authentication()
+    test_session_report_args_include_encouragement()
+    test_safe_entry_name()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+요청별 단계 시간(Server-Timing) 기록 테스트 (서버 없이 실행)
+"""
+
+import asyncio
+import sys
+import time
+sys.path.append('.')
+
+from common.server_timing import span, start_request
+
+
+def _build_pdf():
+    with span("pdf_build"):
+        time.sleep(0.01)
+
+
+def test_spans_add_up_per_request():
+    """요청 안의 단계 시간이 스레드 작업까지 합산되어 헤더로 나오는지 테스트"""
+    print("🧪 Server-Timing 단계 기록 테스트 시작")
+
+    async def scenario():
+        timings = start_request()
+        for _ in range(2):
+            with span("llm"):
+                await asyncio.sleep(0.01)
+        await asyncio.to_thread(_build_pdf)
+        return timings
+
+    timings = asyncio.run(scenario())
+    assert timings.phases["llm"]["count"] == 2 and timings.phases["llm"]["ms"] >= 20
+    assert timings.phases["pdf_build"]["count"] == 1
+
+    header = timings.header_value()
+    assert header.startswith('llm;desc="x2";dur=')
+    assert ', pdf_build;desc="x1";dur=' in header
+    assert ", total;dur=" in header
+
+    print("✅ Server-Timing 단계 기록 테스트 통과")
+
+
+def test_span_outside_request_is_noop():
+    """요청 밖(백그라운드 작업)에서는 기록하지 않는지 테스트"""
+    async def scenario():
+        with span("llm"):
+            pass
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_spans_add_up_per_request()
+    test_span_outside_request_is_noop()
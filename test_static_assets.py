@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+정적 파일 빌드(공백 제거, 해시 경로, 미리 압축) 및 서빙 테스트 (서버 없이 실행)
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append('.')
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from common.static_assets import PrecompressedStaticFiles, build_site, minify_css, minify_lines
+
+PAGE = """<!DOCTYPE html>
+<html>
+    <head>
+        <link rel="stylesheet" href="/school/static/style.css?v=2025092801">
+    </head>
+    <body>
+        <textarea>
+    들여쓰기 유지
+        </textarea>
+        <script src="/school/static/script.js"></script>
+""" + "        <p>진로 탐색 결과를 확인해 보세요.</p>\n" * 30 + """    </body>
+</html>
+"""
+
+SCRIPT = """function render(name) {
+    // 템플릿 문자열 안의 공백은 그대로 유지
+    return `
+        <div class="card">
+            ${name}
+        </div>`;
+}
+""" + "\n".join(f"    console.log('padding line {i}');" for i in range(40)) + "\n"
+
+
+def _make_site(directory: str) -> Path:
+    source = Path(directory) / "static"
+    source.mkdir()
+    (source / "index.html").write_text(PAGE, encoding="utf-8")
+    (source / "index_backup.html").write_text(PAGE, encoding="utf-8")
+    (source / "style.css").write_text("/* 기본 */\nbody {\n    color : #333 ;\n    margin: 0;\n}\n" * 40, encoding="utf-8")
+    (source / "script.js").write_text(SCRIPT, encoding="utf-8")
+    return source
+
+
+def test_minifiers_keep_meaningful_whitespace():
+    """CSS 공백·주석 제거, JS/HTML 들여쓰기 제거 시 템플릿 문자열과 textarea 내용 유지 테스트"""
+    assert minify_css("/* a */\n.a > .b ,\n.c {\n    color : red ;\n}\n") == ".a>.b,.c{color :red}"
+    minified = minify_lines(SCRIPT)
+    assert "`\n        <div class=\"card\">\n            ${name}\n        </div>`;" in minified
+    assert "\nconsole.log('padding line 0');" in minified
+    assert "    들여쓰기 유지\n        </textarea>" in minify_lines(PAGE)
+
+
+def test_build_fingerprints_and_precompresses():
+    """해시 경로 참조 변경, 백업 파일 제외, gzip 파일과 manifest 생성 테스트"""
+    print("🧪 정적 파일 빌드 테스트 시작")
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = _make_site(directory)
+        summary = build_site(source, "/school/static")
+        build = Path(directory) / "static_build"
+        manifest = json.loads((build / "manifest.json").read_text(encoding="utf-8"))
+
+        assert summary["files"] == 3 and not (build / "index_backup.html").exists()
+        assert summary["gzip_bytes"] < summary["minified_bytes"] < summary["source_bytes"]
+        style, script = manifest["assets"]["style.css"], manifest["assets"]["script.js"]
+        assert style.startswith("style.") and style.endswith(".css") and (build / style).exists()
+
+        page = (build / "index.html").read_text(encoding="utf-8")
+        assert f'href="/school/static/{style}"' in page and f'src="/school/static/{script}"' in page
+        assert "?v=" not in page
+        assert gzip.decompress((build / "index.html.gz").read_bytes()).decode("utf-8") == page
+        assert "gzip" in manifest["encodings"][script]
+
+        # 다시 빌드해도 같은 해시 (내용 기준)
+        build_site(source, "/school/static")
+        assert json.loads((build / "manifest.json").read_text(encoding="utf-8"))["assets"]["style.css"] == style
+
+    print("✅ 정적 파일 빌드 테스트 통과")
+
+
+def test_serving_encodings_and_cache_headers():
+    """Accept-Encoding에 맞춘 미리 압축 파일 전송, 해시 파일 immutable 캐시, 빌드가 오래되면 원본 서빙 테스트"""
+    with tempfile.TemporaryDirectory() as directory:
+        source = _make_site(directory)
+        build_site(source, "/school/static")
+        static_files = PrecompressedStaticFiles(source)
+        style = static_files.manifest["assets"]["style.css"]
+
+        app = FastAPI()
+        app.mount("/static", static_files)
+
+        @app.get("/")
+        async def index(request: Request):
+            return static_files.page(request)
+
+        client = TestClient(app)
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip" and response.headers["cache-control"] == "no-cache"
+        assert response.headers["content-type"].startswith("text/html") and style in response.text
+
+        response = client.get(f"/static/{style}", headers={"Accept-Encoding": "br;q=0, gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert client.get(f"/static/{style}", headers={"If-None-Match": response.headers["etag"],
+                                                      "Accept-Encoding": "gzip"}).status_code == 304
+
+        assert "content-encoding" not in client.get("/static/style.css", headers={"Accept-Encoding": "identity"}).headers
+        assert client.get("/static/index_backup.html").status_code == 404
+
+        # 원본이 빌드보다 새로우면 원본 폴더 서빙
+        later = time.time() + 10
+        os.utime(source / "style.css", (later, later))
+        stale = PrecompressedStaticFiles(source)
+        assert not stale.built and Path(stale.directory) == source
+
+
+if __name__ == "__main__":
+    test_minifiers_keep_meaningful_whitespace()
+    test_build_fingerprints_and_precompresses()
+    test_serving_encodings_and_cache_headers()
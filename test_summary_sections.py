@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+고등학교 7단계 최종 요약 중간목표별 병렬 생성 테스트 (OpenAI 호출 없이 실행)
+"""
+
+import asyncio
+import os
+import sys
+import time
+sys.path.append('.')
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import high_school.high_school as high_school
+from common.dream_logic import parse_dream_logic
+from high_school.flow_state import FLOW_COOKIE_NAME, HighSchoolFlowState, flow_store
+
+
+def _fake_call_gpt_list(prompt, system_message, **kwargs):
+    """중간목표 번호를 그대로 돌려주는 테스트용 GPT 호출 (0.2초 지연)"""
+    time.sleep(0.2)
+    number = prompt.split("[중간목표")[1][0]
+    if number == "2" and "실패" in prompt:
+        return kwargs["fallback"]
+    return [f"[중간목표{number}] 모델이 다시 쓴 제목", "🔬 실천활동1:", f"탐구보고서: 보고서{number}", "교과 활동: 통합과학"]
+
+
+def test_sections_generated_in_parallel():
+    """중간목표별 호출이 동시에 실행되고 기존 요약 형식으로 합쳐지는지 테스트"""
+    print("🧪 최종 요약 병렬 생성 테스트 시작")
+
+    original = high_school.call_gpt_list
+    high_school.call_gpt_list = _fake_call_gpt_list
+    try:
+        started = time.perf_counter()
+        lines = asyncio.run(high_school.generate_final_summary_sections(
+            "건축가", ["사회적 가치"], "기후 위기", "제로에너지 건축", "친환경 건축가", ["역량1", "역량2", "역량3"]
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        high_school.call_gpt_list = original
+
+    assert elapsed < 0.5, f"순차 실행으로 보임: {elapsed:.2f}초"
+    tree = parse_dream_logic('\n'.join(lines))
+    assert tree.final_dream == "친환경 건축가"
+    assert [goal.title for goal in tree.goals] == ["역량1", "역량2", "역량3"]
+    assert lines[1].startswith("📚 [중간목표1]")
+
+    print("✅ 최종 요약 병렬 생성 테스트 통과")
+
+
+def test_failed_section_keeps_other_sections():
+    """일부 중간목표 생성이 실패해도 나머지 내용은 유지되는지 테스트"""
+    original = high_school.call_gpt_list
+    high_school.call_gpt_list = _fake_call_gpt_list
+    try:
+        lines = asyncio.run(high_school.generate_final_summary_sections(
+            "건축가", [], "이슈", "주제", "목표", ["역량1", "실패"]
+        ))
+    finally:
+        high_school.call_gpt_list = original
+
+    text = '\n'.join(lines)
+    assert "보고서1" in text
+    assert "실천활동을 불러오지 못했습니다." in text
+    assert high_school.failed_summary_sections(lines) == [2]
+
+
+def test_summary_with_failed_section_not_remembered():
+    """실패한 중간목표가 있는 요약은 흐름 상태에 기억하지 않아 다음 요청에서 다시 생성되는지 테스트"""
+    original = high_school.call_gpt_list, high_school.SECTIONED_FINAL_SUMMARY
+    high_school.call_gpt_list = _fake_call_gpt_list
+    high_school.SECTIONED_FINAL_SUMMARY = True
+    try:
+        state = HighSchoolFlowState(flow_id="test")
+        failed_inputs = high_school.final_summary_inputs("건축가", [], ["이슈"], "주제", "목표", ["역량1", "실패"])
+        lines = asyncio.run(high_school.build_final_summary(state, failed_inputs))
+        assert high_school.failed_summary_sections(lines) == [2]
+        assert state.recall("final_summary", failed_inputs) is None
+
+        ok_inputs = high_school.final_summary_inputs("건축가", [], ["이슈"], "주제", "목표", ["역량1", "역량2"])
+        lines = asyncio.run(high_school.build_final_summary(state, ok_inputs))
+        assert state.recall("final_summary", ok_inputs) == lines
+    finally:
+        high_school.call_gpt_list, high_school.SECTIONED_FINAL_SUMMARY = original
+
+
+def test_regenerate_section_rejects_bad_input():
+    """7단계 부분 재생성 번호가 정수가 아니거나 범위를 벗어나면 500 대신 400과 기존 요약을 돌려주는지 테스트"""
+    from fastapi.testclient import TestClient
+
+    state = flow_store.create()
+    state.career, state.goal, state.midgoals = "건축가", "친환경 건축가", ["역량1", "역량2"]
+    state.final_summary = "🎯 [최종 목표(꿈)] 친환경 건축가\n📚 [중간목표1] 역량1\n🎨 [중간목표2] 역량2"
+
+    original = high_school.call_gpt_list
+    high_school.call_gpt_list = _fake_call_gpt_list
+    try:
+        client = TestClient(high_school.app)
+        client.cookies.set(FLOW_COOKIE_NAME, state.flow_id)
+        for value in ("abc", "0", "3", "-1", "1.5"):
+            response = client.post("/career/flow", data={"step": "7", "regenerate_section": value})
+            assert response.status_code == 400, value
+            assert "다시 생성할 중간목표를 찾을 수 없습니다." in response.text
+        assert state.final_summary.endswith("[중간목표2] 역량2")
+
+        response = client.post("/career/flow", data={"step": "7", "regenerate_section": "2"})
+        assert response.status_code == 200 and "보고서2" in state.final_summary
+    finally:
+        high_school.call_gpt_list = original
+
+
+if __name__ == "__main__":
+    test_sections_generated_in_parallel()
+    test_failed_section_keeps_other_sections()
+    test_summary_with_failed_section_not_remembered()
+    test_regenerate_section_rejects_bad_input()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+하위 앱 예열 및 준비 상태 테스트 (서버, OpenAI 호출 없이 실행)
+"""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+sys.path.append('.')
+
+from common.openai_client import LazyOpenAIClient, warm_up_connection
+from common.warmup import WarmUp, run_steps
+
+
+class FakeSubApp:
+    """warm_up()만 흉내 내는 하위 앱"""
+
+    def __init__(self, steps=None, error=None):
+        self.steps = steps or {}
+        self.error = error
+        self.load_seconds = 0.01
+        self.calls = 0
+
+    def warm_up(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return run_steps(self.steps)
+
+
+def test_ready_after_warm_up():
+    """예열 전에는 준비 안 됨, 예열 후에는 단계별 결과와 함께 준비 상태로 바뀌는지 테스트"""
+    print("🧪 하위 앱 예열 테스트 시작")
+
+    def broken_template():
+        raise FileNotFoundError("career_flow_allinone.html")
+
+    school = FakeSubApp({"fonts": lambda: None, "templates": broken_template})
+    warmup = WarmUp({"school": school, "broken": FakeSubApp(error=ImportError("missing"))})
+    assert not warmup.ready and warmup.status()["status"] == "warming"
+
+    asyncio.run(warmup.run())
+
+    status = warmup.status()
+    assert warmup.ready and status["status"] == "ready"
+    steps = status["sub_apps"]["school"]["steps"]
+    assert "error" not in steps["fonts"] and steps["templates"]["error"] == "FileNotFoundError"
+    assert status["sub_apps"]["broken"]["error"] == "ImportError"
+
+    print("✅ 하위 앱 예열 테스트 통과")
+
+
+def test_disabled_warm_up_is_ready_immediately():
+    """예열을 끄면 바로 준비 상태이고 하위 앱을 불러오지 않는지 테스트"""
+    school = FakeSubApp()
+    warmup = WarmUp({"school": school}, enabled=False)
+    assert warmup.ready
+    asyncio.run(warmup.run())
+    assert school.calls == 0
+
+
+def test_llm_connection_warm_up():
+    """HTTP 응답(인증 오류 포함)을 받으면 성공, 연결 자체가 실패하면 예외인지 테스트"""
+    class Unauthorized(Exception):
+        status_code = 401
+
+    def client_raising(error):
+        def models_list():
+            raise error
+        return SimpleNamespace(with_options=lambda **options: SimpleNamespace(models=SimpleNamespace(list=models_list)))
+
+    assert warm_up_connection(client_raising(Unauthorized()))
+    try:
+        warm_up_connection(client_raising(ConnectionError("refused")))
+        assert False, "ConnectionError가 발생해야 합니다"
+    except ConnectionError:
+        pass
+
+
+def test_lazy_openai_client_created_on_first_use():
+    """지연 클라이언트가 속성에 처음 접근할 때만 실제 클라이언트를 만드는지 테스트"""
+    client = LazyOpenAIClient(api_key="sk-test")
+    assert client._client is None
+    assert client.api_key == "sk-test"
+    assert client._client is not None
+
+
+if __name__ == "__main__":
+    test_ready_after_warm_up()
+    test_disabled_warm_up_is_ready_immediately()
+    test_llm_connection_warm_up()
+    test_lazy_openai_client_created_on_first_use()